@@ -1,140 +1,256 @@
-from flask import Flask, render_template
-import pandas as pd
+from flask import Flask, Response, g, render_template, request, jsonify
 import os
-import yfinance as yf
-import plotly.graph_objs as go
-from plotly.offline import plot
+import time
+import cProfile
+from datetime import datetime
 
 # Import functions from our analysis pipeline
-from src.data_processing.process_data import preprocess_data
-from src.technical_analysis.indicators import add_technical_indicators
+from src.data_processing.cache import ProcessedDataCache
+from src.data_ingestion.download_data import download_stock_data
+from src.data_ingestion.fetch_queue import FetchQueue
+from src.data_storage.store import get_store
+from src.dashboard.snapshot import SNAPSHOT_FILE, SnapshotManager, format_age
+from src.data_processing.pipeline import load_processed_data
+from src.dashboard.responses import ResponseCache, file_version, make_etag
+from src.screening.movers import MoversRanker, DEFAULT_TOP_N
+from src.screening.correlation import CorrelationService, DEFAULT_TOP_PAIRS, DEFAULT_WINDOW
+from src.technical_analysis.signals import SIGNAL_INDEX_FILE, SignalIndex
+from src.modeling.registry import ModelRegistry, store_watermark
+from src.data_storage.watermarks import WatermarkStore
+from src.universe import load_universe
+from src.monitoring import metrics
 
 app = Flask(__name__)
 
 DATA_DIR = 'data'
 
+# Start of the history downloaded for a ticker requested by the web app
+DEFAULT_START_DATE = '2020-01-01'
+store = get_store(DATA_DIR)
+
+# Shared cache of processed frames; size it with PROCESSED_CACHE_MAX_MB
+processed_cache = ProcessedDataCache(
+    max_bytes=int(os.environ.get('PROCESSED_CACHE_MAX_MB', 256)) * 1024 * 1024)
+
+# Index of crossover and threshold signals across each ticker's history
+signal_index = SignalIndex(os.path.join(DATA_DIR, SIGNAL_INDEX_FILE))
+
+# Missing tickers are downloaded in the background instead of inside the request
+fetch_queue = FetchQueue(lambda tickers, start_date, end_date:
+                             download_stock_data(tickers, start_date, end_date, store=store),
+                         is_available=store.exists,
+                         on_complete=lambda tickers: snapshots.refresh(get_processed_data))
+
+# Pre-built page payloads; rebuilt by update_data.py and, if
+# SNAPSHOT_REFRESH_SECONDS is set, by a background thread
+snapshots = SnapshotManager(os.path.join(DATA_DIR, SNAPSHOT_FILE), is_pending=fetch_queue.is_pending,
+                            signal_index=signal_index)
+
 # Helper function to load and process data for a given ticker
-def get_processed_data(ticker, start_date='2020-01-01', end_date=None):
-    file_path = os.path.join(DATA_DIR, f'{ticker}.csv')
-    if not os.path.exists(file_path):
-        # If data not found locally, download it
-        stock_data = yf.download(ticker, start=start_date, end=end_date)
-        if stock_data.empty:
-            return None
-        stock_data.reset_index(inplace=True)
-        if isinstance(stock_data.columns, pd.MultiIndex):
-            stock_data.columns = stock_data.columns.droplevel(1)
-        stock_data.to_csv(file_path, index=False)
-    
-    df = pd.read_csv(file_path)
-    df = preprocess_data(df)
-    df = add_technical_indicators(df)
-    return df
+@metrics.timed()
+def get_processed_data(ticker, start_date=DEFAULT_START_DATE, end_date=None):
+    if not store.exists(ticker):
+        # If data not found locally, queue a download and report the ticker as pending
+        fetch_queue.request(ticker, start_date, end_date)
+        return None
+
+    # Processed frames are shared through the cache and must not be mutated
+    return processed_cache.get((ticker, start_date, end_date), store.source_path(ticker),
+                               lambda: load_processed_data(store, ticker))
+
+# Movers over the configurable screening universe (UNIVERSE_FILE)
+movers_ranker = MoversRanker(store, load_universe())
+
+# Rolling return correlations over the same universe; window in trading days (CORRELATION_WINDOW)
+correlation_service = CorrelationService(store, movers_ranker.universe,
+                                         window=int(os.environ.get('CORRELATION_WINDOW', DEFAULT_WINDOW)))
+
+# Fitted next-close models, retrained only when a ticker's data watermark changes
+model_registry = ModelRegistry(get_processed_data, store_watermark(store, WatermarkStore(DATA_DIR)),
+                               root=os.environ.get('MODEL_DIR', 'models'))
+
+# With PROFILE_REQUESTS set, any request with ?profile=1 returns its cProfile report
+_profile_requests = os.environ.get('PROFILE_REQUESTS', '').lower() in ('1', 'true', 'yes')
+
+@app.before_request
+def start_request_timer():
+    if _profile_requests and request.args.get('profile'):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+    if metrics.ENABLED:
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        response = Response(metrics.profile_stats(profiler), mimetype='text/plain')
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched'
+        metrics.observe('http_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+        metrics.count('http_requests_total', endpoint=endpoint, status=str(response.status_code))
+    return response
+
+# Serialized JSON responses keyed by route and parameters; size with RESPONSE_CACHE_MAX_ENTRIES
+response_cache = ResponseCache(int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024)))
+
+def data_watermark(tickers):
+    # Last stored date and source file version per ticker: changes whenever the data does
+    return [(ticker, model_registry.get_watermark(ticker), file_version(store.source_path(ticker)))
+            for ticker in tickers]
+
+def conditional_json(watermark, build):
+    # Answers with 304 if the client's ETag is current, else the cached (or freshly
+    # built) JSON body; the ETag covers the route, its parameters and the data watermark
+    key = (request.path, tuple(sorted(request.args.items(multi=True))))
+    etag = make_etag(key, watermark)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(response_cache.get_or_build(key, etag, build), mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def snapshot_json(name):
+    # A dashboard page's payload as JSON, versioned by the snapshot it comes from
+    snapshot = snapshots.ensure(get_processed_data)
+    retry_missing(snapshot['pages'][name])
+    return conditional_json(snapshot['created_at'], lambda: {
+        **snapshot['pages'][name],
+        'snapshot_created_at': datetime.fromtimestamp(snapshot['created_at']).isoformat(timespec='seconds'),
+    })
+
+def retry_missing(payload):
+    # Re-requests the tickers a page lists without data: failed downloads (the fetch queue
+    # ignores them until their retry window has passed) and 'pending' tickers whose fetch
+    # is no longer queued, e.g. in a snapshot saved before a restart. The snapshot is
+    # rebuilt when a fetch finishes
+    for ticker in payload.get('pending', []) + payload.get('unavailable', []):
+        if not fetch_queue.is_pending(ticker) and not store.exists(ticker):
+            fetch_queue.request(ticker, DEFAULT_START_DATE)
+
+def render_page(name, template):
+    # Routes serve the current snapshot instead of recomputing it per request
+    payload, age = snapshots.page(name, get_processed_data)
+    retry_missing(payload)
+    return render_template(template, snapshot_age=format_age(age), **payload)
 
 @app.route('/')
 def index():
     # Market Trends
-    market_indices = {
-        '^GSPC': 'S&P 500',
-        '^IXIC': 'NASDAQ',
-        '^DJI': 'Dow Jones Industrial Average'
-    }
-    
-    market_data = {}
-    latest_date = None
-    for ticker, name in market_indices.items():
-        df = get_processed_data(ticker)
-        if df is not None and not df.empty:
-            if latest_date is None:
-                latest_date = df.index[-1].strftime('%B %d, %Y')
-            latest_close = df['close'].iloc[-1]
-            previous_close = df['close'].iloc[-2]
-            daily_change = (latest_close - previous_close) / previous_close * 100
-            
-            # Create a simple plot for the index
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df.index, y=df['close'], mode='lines', name=name))
-            fig.update_layout(title=f'{name} Performance', showlegend=False,
-                              margin=dict(l=20, r=20, t=40, b=20))
-            plot_div = plot(fig, output_type='div', include_plotlyjs=False)
-
-            market_data[ticker] = {
-                'name': name,
-                'latest_close': f'{latest_close:.2f}',
-                'daily_change': f'{daily_change:.2f}%',
-                'plot': plot_div
-            }
-    
-    return render_template('index.html', market_data=market_data, latest_date=latest_date)
+    return render_page('index', 'index.html')
 
 @app.route('/top_movers')
 def top_movers():
     # Top Movers (Gainers and Losers)
-    # For simplicity, let's use a predefined list of stocks
-    popular_stocks = ['AAPL', 'GOOG', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'JPM', 'V', 'PFE', 'DIS', 'INTC', 'BA', 'KO', 'PEP', 'MCD', 'NKE', 'WMT', 'HD', 'COST', 'AXP', 'IBM', 'CSCO', 'ORCL', 'ADBE', 'CRM', 'SAP', 'TM', 'SONY']
-    
-    movers_data = []
-    latest_date = None
-    for ticker in popular_stocks:
-        df = get_processed_data(ticker)
-        if df is not None and not df.empty:
-            if latest_date is None:
-                latest_date = df.index[-1].strftime('%B %d, %Y')
-            latest_close = df['close'].iloc[-1]
-            previous_close = df['close'].iloc[-2]
-            daily_change = (latest_close - previous_close) / previous_close * 100
-            movers_data.append({
-                'ticker': ticker,
-                'latest_close': f'{latest_close:.2f}',
-                'daily_change': f'{daily_change:.2f}%',
-                'change_value': daily_change # for sorting
-            })
-    
-    # Sort by daily change to get top gainers and losers
-    top_gainers = sorted(movers_data, key=lambda x: x['change_value'], reverse=True)[:10]
-    top_losers = sorted(movers_data, key=lambda x: x['change_value'])[:10]
-
-    return render_template('top_movers.html', top_gainers=top_gainers, top_losers=top_losers, latest_date=latest_date)
+    return render_page('top_movers', 'top_movers.html')
 
 @app.route('/recommendations')
 def recommendations():
     # Simple Recommendation System
-    # For simplicity, let's use a predefined list of stocks
-    recommendation_stocks = ['AAPL', 'GOOG', 'MSFT', 'AMZN', 'TSLA', 'NVDA']
-    
-    recommendations_list = []
-    latest_date = None
-    for ticker in recommendation_stocks:
-        df = get_processed_data(ticker)
-        if df is not None and not df.empty:
-            if latest_date is None:
-                latest_date = df.index[-1].strftime('%B %d, %Y')
-            # Simple Golden Cross / Death Cross strategy
-            # Buy signal: SMA_50 crosses above SMA_200
-            # Sell signal: SMA_50 crosses below SMA_200
-            
-            latest_sma_50 = df['SMA_50'].iloc[-1]
-            latest_sma_200 = df['SMA_200'].iloc[-1]
-            
-            previous_sma_50 = df['SMA_50'].iloc[-2]
-            previous_sma_200 = df['SMA_200'].iloc[-2]
-
-            signal = "HOLD"
-            if latest_sma_50 > latest_sma_200 and previous_sma_50 <= previous_sma_200:
-                signal = "BUY (Golden Cross)"
-            elif latest_sma_50 < latest_sma_200 and previous_sma_50 >= previous_sma_200:
-                signal = "SELL (Death Cross)"
-            
-            recommendations_list.append({
-                'ticker': ticker,
-                'signal': signal,
-                'latest_close': f"{df['close'].iloc[-1]:.2f}"
-            })
-
-    return render_template('recommendations.html', recommendations=recommendations_list, latest_date=latest_date)
+    return render_page('recommendations', 'recommendations.html')
+
+@app.route('/api/top_movers')
+def api_top_movers():
+    # Top gainers and losers over the screening universe, e.g.
+    # /api/top_movers?n=20&min_volume=1000000&sector=Technology
+    n = request.args.get('n', DEFAULT_TOP_N, type=int)
+    min_volume = request.args.get('min_volume', None, type=float)
+    sectors = request.args.getlist('sector') or None
+    return conditional_json(movers_ranker.version(),
+                            lambda: movers_ranker.rank(n=n, min_volume=min_volume, sectors=sectors))
+
+@app.route('/api/correlations/<ticker>')
+def api_correlations(ticker):
+    # Most and least correlated tickers over the rolling window, e.g. /api/correlations/AAPL?n=5
+    n = request.args.get('n', DEFAULT_TOP_PAIRS, type=int)
+    if ticker not in correlation_service.tickers:
+        return jsonify({'error': f'{ticker} is not in the screening universe.'}), 404
+    # The ETag is the version the window was just refreshed to, so the body is cached
+    # under the version it was built from
+    version = correlation_service.refresh()
+    return conditional_json(version, lambda: correlation_service.top_pairs(ticker, n, refresh=False))
+
+@app.route('/api/signals')
+def api_signals():
+    # Indexed signal events, e.g. /api/signals?days=30&ticker=AAPL&signal=golden_cross
+    days = request.args.get('days', None, type=int)
+    tickers = request.args.getlist('ticker') or None
+    signals = request.args.getlist('signal') or None
+
+    def build():
+        events = signal_index.query(days=days, tickers=tickers, signals=signals)
+        events['date'] = events['date'].dt.strftime('%Y-%m-%d')
+        return events.to_dict(orient='records')
+    return conditional_json(signal_index.version(), build)
+
+@app.route('/api/predict')
+def api_predict():
+    # Next-close predictions, e.g. /api/predict?ticker=AAPL&ticker=MSFT
+    tickers = request.args.getlist('ticker')
+    if not tickers:
+        return jsonify({'error': 'Pass at least one ticker parameter.'}), 400
+    # Models missing for the current data are trained in the background, never in the request
+    training = model_registry.prepare(tickers)
+    if training:
+        return jsonify({'status': 'training', 'tickers': training}), 202
+    return conditional_json(data_watermark(tickers), lambda: model_registry.predict(tickers))
+
+@app.route('/api/market_summary')
+def api_market_summary():
+    # Market Trends page data: latest close, daily change and chart series per index
+    return snapshot_json('index')
+
+@app.route('/api/movers')
+def api_movers():
+    # Top Movers page data (popular stocks); /api/top_movers ranks the whole universe
+    return snapshot_json('top_movers')
+
+@app.route('/api/recommendations')
+def api_recommendations():
+    # Recommendations page data: latest crossover signal per ticker and recent signals
+    return snapshot_json('recommendations')
+
+@app.route('/api/indicators/<ticker>')
+def api_indicators(ticker):
+    # Processed prices and indicators for one ticker, column-oriented, e.g.
+    # /api/indicators/AAPL?days=90&column=close&column=RSI
+    days = request.args.get('days', None, type=int)
+    columns = request.args.getlist('column')
+    df = get_processed_data(ticker)
+    if df is None:
+        return jsonify({'ticker': ticker, 'status': 'pending'}), 202
+    unknown = [column for column in columns if column not in df.columns]
+    if unknown:
+        return jsonify({'error': f"Unknown columns: {', '.join(unknown)}"}), 400
+
+    def build():
+        frame = df[columns or list(df.columns)]
+        if days is not None:
+            frame = frame.iloc[-days:] if days > 0 else frame.iloc[:0]
+        payload = {'ticker': ticker, 'dates': list(frame.index.strftime('%Y-%m-%d'))}
+        for column in frame.columns:
+            values = frame[column].astype('float64')
+            payload[column] = values.round(6).astype(object).where(values.notna(), None).tolist()
+        return payload
+    return conditional_json(data_watermark([ticker]), build)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    # Prometheus scrape target; enable with METRICS_ENABLED=1
+    if not metrics.ENABLED:
+        return Response('Metrics are disabled; set METRICS_ENABLED=1.\n', status=404, mimetype='text/plain')
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+_refresh_seconds = float(os.environ.get('SNAPSHOT_REFRESH_SECONDS', 0))
+if _refresh_seconds > 0:
+    snapshots.start_background_refresh(get_processed_data, _refresh_seconds)
 
 if __name__ == '__main__':
     # Ensure data directory exists
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
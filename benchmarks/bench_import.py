@@ -0,0 +1,90 @@
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+# Repository root (modules are imported from it)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry points and the heavy packages that must not load when they are imported;
+# each is only needed on the code paths that train, plot or download
+ENTRY_POINTS = {
+    'app': ['sklearn', 'plotly', 'yfinance'],
+    'main': ['sklearn', 'plotly', 'yfinance'],
+    'update_data': ['sklearn', 'plotly', 'yfinance'],
+    'src.modeling.backtest': ['sklearn', 'plotly', 'yfinance'],
+    'src.modeling.registry': ['sklearn', 'plotly', 'yfinance'],
+    'src.screening.correlation': ['sklearn', 'plotly', 'yfinance'],
+    'src.data_ingestion.download_data': ['sklearn', 'plotly', 'yfinance'],
+}
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def import_profile(module: str) -> dict:
+    """
+    Imports ``module`` in a fresh interpreter under ``python -X importtime``.
+
+    :return: Dict with the module's cumulative import time in seconds and the
+             cumulative time of every module it loaded.
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=REPO_ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f'Importing {module} failed:\n{completed.stderr[-2000:]}')
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2)) / 1e6
+    return {'module': module, 'seconds': modules.get(module), 'modules': modules}
+
+
+def check(module: str, forbidden, repeats: int = 3) -> dict:
+    """
+    Profiles ``module`` ``repeats`` times and reports its fastest import time and the
+    forbidden top-level packages it loaded.
+    """
+    profiles = [import_profile(module) for _ in range(repeats)]
+    loaded = {name.split('.')[0] for name in profiles[0]['modules']}
+    return {
+        'module': module,
+        'seconds': min(profile['seconds'] for profile in profiles),
+        'modules_loaded': len(profiles[0]['modules']),
+        'heavy_loaded': sorted(set(forbidden) & loaded),
+    }
+
+
+def run(entry_points=None, repeats: int = 3) -> list:
+    entry_points = entry_points or ENTRY_POINTS
+    return [check(module, forbidden, repeats) for module, forbidden in entry_points.items()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import time of the entry points, and a guard against '
+                                                 'heavy dependencies loading at import.')
+    parser.add_argument('--repeats', type=int, default=3, help='Imports per module (fastest is kept).')
+    parser.add_argument('--max_seconds', type=float, default=None,
+                        help='Fail if any entry point takes longer than this to import.')
+    parser.add_argument('--output', default=None, help='Optional JSON file for the results.')
+    args = parser.parse_args()
+
+    results = run(repeats=args.repeats)
+    failures = []
+    for result in results:
+        print(f"{result['module']:<35} {result['seconds'] * 1000:8.1f} ms  "
+              f"{result['modules_loaded']:5d} modules  heavy: {', '.join(result['heavy_loaded']) or '-'}")
+        if result['heavy_loaded']:
+            failures.append(f"{result['module']} imports {', '.join(result['heavy_loaded'])} at load time")
+        if args.max_seconds is not None and result['seconds'] > args.max_seconds:
+            failures.append(f"{result['module']} took {result['seconds']:.2f}s to import "
+                            f"(budget {args.max_seconds:.2f}s)")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
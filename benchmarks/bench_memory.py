@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import argparse
+import resource
+import subprocess
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic import generate_ohlcv
+
+# Repository root (the benchmark workers run from it)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pipelines compared by the benchmark
+MODES = ['original', 'lean']
+
+
+def _peak_rss_bytes() -> int:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_mode(mode: str, data_dir: str, backend: str, ticker: str) -> dict:
+    """
+    Runs one pipeline on one ticker (the preprocess, indicator and training stages)
+    and reports its memory use. Meant to run in a fresh process.
+    """
+    from src.data_processing.pipeline import load_processed_lean
+    from src.data_processing.process_data import preprocess_data
+    from src.data_storage.store import get_store
+    from src.modeling.train_model import train_model
+    from src.technical_analysis.indicators import add_technical_indicators
+
+    store = get_store(data_dir, backend)
+    baseline_rss = _peak_rss_bytes()
+    tracemalloc.start()
+    if mode == 'lean':
+        df = load_processed_lean(store, ticker)
+    else:
+        df = add_technical_indicators(preprocess_data(store.read(ticker)))
+    frame_bytes = int(df.memory_usage(deep=True).sum())
+    train_model(df)
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'mode': mode,
+        'rows': len(df),
+        'frame_bytes': frame_bytes,
+        'peak_traced_bytes': peak_traced,
+        'peak_rss_bytes': _peak_rss_bytes(),
+        'peak_rss_increase_bytes': _peak_rss_bytes() - baseline_rss,
+    }
+
+
+def benchmark(rows: int, backend: str = None) -> list:
+    """
+    Runs every mode in its own subprocess on a synthetic ticker of ``rows`` bars.
+    """
+    from src.data_storage.store import default_backend, get_store
+
+    backend = backend or default_backend()
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Minute bars: long histories overflow the nanosecond range as business days
+        get_store(data_dir, backend).write('SYN', generate_ohlcv(rows, freq='min'))
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_memory', '--worker', mode, '--data_dir', data_dir,
+                 '--backend', backend],
+                cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            result['input_rows'] = rows
+            result['backend'] = backend
+            results.append(result)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Peak memory per ticker of the original and lean pipelines.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[2_500, 25_000, 250_000],
+                        help='Synthetic history lengths to benchmark.')
+    parser.add_argument('--backend', default=None, help="Price store backend ('csv' or 'parquet').")
+    parser.add_argument('--output', default=None, help='Optional JSON file for the results.')
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--data_dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_mode(args.worker, args.data_dir, args.backend, 'SYN')))
+        sys.exit(0)
+
+    all_results = []
+    for rows in args.rows:
+        results = benchmark(rows, args.backend)
+        all_results += results
+        for result in results:
+            print(f"{rows:>9} rows  {result['mode']:<9} frame {result['frame_bytes'] / 2**20:8.2f} MiB  "
+                  f"peak traced {result['peak_traced_bytes'] / 2**20:8.2f} MiB  "
+                  f"peak RSS +{result['peak_rss_increase_bytes'] / 2**20:8.2f} MiB "
+                  f"({result['peak_rss_bytes'] / 2**20:.1f} MiB total)")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(all_results, f, indent=2)
@@ -0,0 +1,299 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_universe, synthetic_tickers, write_universe
+
+# Repository root (used for the git commit and the Flask app)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default results file
+RESULTS_FILE = 'benchmark_results.json'
+
+# Tickers of the /api/predict route; their models are trained before the routes are timed
+PREDICT_TICKERS = ['AAPL', 'MSFT']
+
+# Routes timed through the Flask test client
+ROUTES = [
+    '/',
+    '/top_movers',
+    '/recommendations',
+    '/api/top_movers',
+    '/api/signals',
+    '/api/predict?' + '&'.join(f'ticker={ticker}' for ticker in PREDICT_TICKERS),
+    '/api/market_summary',
+    '/api/movers',
+    '/api/recommendations',
+    '/api/indicators/AAPL?days=250',
+    '/api/correlations/AAPL',
+]
+
+
+def git_commit() -> dict:
+    """
+    Returns the current commit hash and whether the working tree has changes.
+    """
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    try:
+        return {'commit': git('rev-parse', 'HEAD') or None, 'dirty': bool(git('status', '--porcelain', '-uno'))}
+    except OSError:
+        return {'commit': None, 'dirty': None}
+
+
+def measure(name: str, fn, setup=None, repeats: int = 5, group: str = None, **info) -> dict:
+    """
+    Times ``fn`` and records its peak traced allocation.
+
+    ``setup`` (if given) runs before every call, untimed, and its return value is
+    passed to ``fn``; use it for inputs the function mutates. Timing runs and the
+    memory run are separate so tracemalloc does not slow the timings.
+
+    :return: Result dict with the median, minimum and maximum seconds and the peak
+             traced bytes of one call.
+    """
+    def call():
+        args = (setup(),) if setup is not None else ()
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            fn(*args)
+        return time.perf_counter() - started
+
+    timings = [call() for _ in range(repeats)]
+
+    args = (setup(),) if setup is not None else ()
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'name': name,
+        'group': group,
+        'repeats': repeats,
+        'seconds_median': statistics.median(timings),
+        'seconds_min': min(timings),
+        'seconds_max': max(timings),
+        'peak_traced_bytes': peak,
+    }
+    result.update(info)
+    return result
+
+
+def bench_pipeline(frames: dict, repeats: int) -> list:
+    """
+    Benchmarks the processing stages over every synthetic ticker.
+    """
+    from src.data_processing.process_data import preprocess_data
+    from src.modeling.train_model import train_model
+    from src.technical_analysis.indicators import add_technical_indicators
+
+    raw = list(frames.values())
+    preprocessed = [preprocess_data(df.copy()) for df in raw]
+    with_indicators = [add_technical_indicators(df.copy()) for df in preprocessed]
+    info = {'tickers': len(raw), 'rows': int(sum(len(df) for df in raw))}
+
+    return [
+        measure('preprocess_data', lambda dfs: [preprocess_data(df) for df in dfs],
+                setup=lambda: [df.copy() for df in raw], repeats=repeats, group='pipeline', **info),
+        measure('add_technical_indicators', lambda dfs: [add_technical_indicators(df) for df in dfs],
+                setup=lambda: [df.copy() for df in preprocessed], repeats=repeats, group='pipeline', **info),
+        measure('train_model', lambda dfs: [train_model(df) for df in dfs],
+                setup=lambda: [df.copy() for df in with_indicators], repeats=repeats, group='pipeline', **info),
+    ]
+
+
+def bench_loading(frames: dict, repeats: int) -> list:
+    """
+    Benchmarks reading every synthetic ticker back from each available store backend.
+    """
+    from src.data_storage.store import BACKENDS, get_store
+    from src.data_processing.pipeline import load_processed_lean
+
+    results = []
+    info = {'tickers': len(frames), 'rows': int(sum(len(df) for df in frames.values()))}
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as data_dir:
+            try:
+                store = get_store(data_dir, backend)
+            except ImportError:
+                continue
+            for ticker, df in frames.items():
+                store.write(ticker, df)
+            results.append(measure(f'load_{backend}', lambda: [store.read(t) for t in frames],
+                                   repeats=repeats, group='loading', backend=backend, **info))
+            results.append(measure(f'load_{backend}_close', lambda: [store.read(t, columns=['Close'])
+                                                                     for t in frames],
+                                   repeats=repeats, group='loading', backend=backend, **info))
+            results.append(measure(f'load_processed_lean_{backend}',
+                                   lambda: [load_processed_lean(store, t) for t in frames],
+                                   repeats=repeats, group='loading', backend=backend, **info))
+    return results
+
+
+def bench_routes(rows: int, extra_tickers: int, repeats: int, seed: int = 0) -> list:
+    """
+    Benchmarks every Flask route through the test client against a temporary data
+    directory holding synthetic data for the app's tickers (plus ``extra_tickers``
+    synthetic ones in the movers universe). Nothing is downloaded.
+
+    The first request to each route is recorded separately as the cold time. The
+    models of ``PREDICT_TICKERS`` are trained first (timed separately), as
+    ``/api/predict`` answers 202 while they train. Every request must return 200.
+    """
+    from src.universe import POPULAR_STOCKS, all_tickers
+
+    workdir = tempfile.mkdtemp(prefix='bench_app_')
+    previous_cwd = os.getcwd()
+    previous_env = {key: os.environ.get(key) for key in ('UNIVERSE_FILE', 'MODEL_DIR')}
+    try:
+        # app.py keeps its data under the relative 'data' directory
+        from src.data_storage.store import get_store
+        extra = synthetic_tickers(extra_tickers)
+        write_universe(get_store(os.path.join(workdir, 'data')), list(all_tickers()) + extra, rows, seed=seed)
+        universe_file = os.path.join(workdir, 'universe.txt')
+        with open(universe_file, 'w') as f:
+            f.write('\n'.join(POPULAR_STOCKS + extra) + '\n')
+        os.environ['UNIVERSE_FILE'] = universe_file
+        os.environ['MODEL_DIR'] = os.path.join(workdir, 'models')
+        os.chdir(workdir)
+
+        if REPO_ROOT not in sys.path:
+            sys.path.insert(0, REPO_ROOT)
+        sys.modules.pop('app', None)
+        import app as app_module
+        client = app_module.app.test_client()
+
+        def get(route):
+            status = client.get(route).status_code
+            if status != 200:
+                raise RuntimeError(f'GET {route} returned {status}')
+            return status
+
+        results = [measure('train predict models', lambda: (app_module.model_registry.prepare(PREDICT_TICKERS),
+                                                            app_module.model_registry.join()),
+                           repeats=1, group='routes', tickers=len(PREDICT_TICKERS), rows=rows)]
+        for route in ROUTES:
+            started = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                status = get(route)
+            cold = time.perf_counter() - started
+            result = measure(f'GET {route}', lambda: get(route), repeats=repeats, group='routes',
+                             status=status, cold_seconds=cold,
+                             universe_size=len(POPULAR_STOCKS) + len(extra), rows=rows)
+            results.append(result)
+        return results
+    finally:
+        os.chdir(previous_cwd)
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        import shutil
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_imports(repeats: int) -> list:
+    """
+    Records the import time of each entry point (see ``bench_import``).
+    """
+    from benchmarks.bench_import import run as run_imports
+
+    return [{'name': f"import {result['module']}", 'group': 'imports', 'repeats': repeats,
+             'seconds_median': result['seconds'], 'seconds_min': result['seconds'],
+             'seconds_max': result['seconds'], 'peak_traced_bytes': 0,
+             'modules_loaded': result['modules_loaded'], 'heavy_loaded': result['heavy_loaded']}
+            for result in run_imports(repeats=repeats)]
+
+
+def run(tickers: int, rows: int, gap_fraction: float, nan_fraction: float, repeats: int, seed: int = 0,
+        groups=('pipeline', 'loading', 'routes', 'imports')) -> dict:
+    """
+    Runs the selected benchmark groups and returns the results document.
+    """
+    frames = generate_universe(synthetic_tickers(tickers), rows, seed=seed,
+                               gap_fraction=gap_fraction, nan_fraction=nan_fraction)
+    results = []
+    if 'pipeline' in groups:
+        results += bench_pipeline(frames, repeats)
+    if 'loading' in groups:
+        results += bench_loading(frames, repeats)
+    if 'routes' in groups:
+        results += bench_routes(rows, tickers, repeats, seed=seed)
+    if 'imports' in groups:
+        results += bench_imports(repeats)
+
+    return {
+        **git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': {'numpy': np.__version__, 'pandas': pd.__version__},
+        'config': {'tickers': tickers, 'rows': rows, 'gap_fraction': gap_fraction,
+                   'nan_fraction': nan_fraction, 'repeats': repeats, 'seed': seed},
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict) -> list:
+    """
+    Pairs up results by name and returns ``(name, baseline seconds, current seconds,
+    ratio)`` tuples; a ratio above 1 means the current run is slower.
+    """
+    previous = {result['name']: result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = previous.get(result['name'])
+        if before is None:
+            continue
+        ratio = result['seconds_median'] / before['seconds_median'] if before['seconds_median'] else float('nan')
+        rows.append((result['name'], before['seconds_median'], result['seconds_median'], ratio))
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline, data loading and Flask routes '
+                                                 'on synthetic data.')
+    parser.add_argument('--tickers', type=int, default=20, help='Number of synthetic tickers.')
+    parser.add_argument('--rows', type=int, default=2500, help='Bars per ticker.')
+    parser.add_argument('--gap_fraction', type=float, default=0.01, help='Fraction of bars removed.')
+    parser.add_argument('--nan_fraction', type=float, default=0.001, help='Fraction of cells set to NaN.')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per benchmark.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    parser.add_argument('--groups', nargs='+', default=['pipeline', 'loading', 'routes', 'imports'],
+                        choices=['pipeline', 'loading', 'routes', 'imports'], help='Benchmark groups to run.')
+    parser.add_argument('--output', default=RESULTS_FILE, help='JSON file receiving the results.')
+    parser.add_argument('--compare', default=None, help='Results file from an earlier run to compare with.')
+    args = parser.parse_args()
+
+    document = run(args.tickers, args.rows, args.gap_fraction, args.nan_fraction, args.repeats,
+                   seed=args.seed, groups=args.groups)
+    with open(args.output, 'w') as f:
+        json.dump(document, f, indent=2, default=str)
+
+    for result in document['results']:
+        print(f"{result['name']:<45} median {result['seconds_median'] * 1000:10.2f} ms  "
+              f"peak {result['peak_traced_bytes'] / 2**20:8.2f} MiB")
+    print(f"Results for commit {document['commit']} written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline.get('commit')}:")
+        for name, before, after, ratio in compare(baseline, document):
+            print(f'{name:<45} {before * 1000:10.2f} ms -> {after * 1000:10.2f} ms  ({ratio:.2f}x)')
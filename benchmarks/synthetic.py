@@ -0,0 +1,91 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Default start of the synthetic histories
+DEFAULT_START = '2000-01-03'
+
+
+def generate_ohlcv(rows: int, seed: int = 0, start: str = DEFAULT_START, freq: str = 'B',
+                   gap_fraction: float = 0.0, nan_fraction: float = 0.0) -> pd.DataFrame:
+    """
+    Generates a random-walk OHLCV history in the layout the price store returns.
+
+    :param rows: Number of bars before gaps are removed.
+    :param seed: Random seed; the same arguments always produce the same frame.
+    :param start: First bar's date.
+    :param freq: Bar frequency ('B' for business days, 'min' for minute bars, ...).
+    :param gap_fraction: Fraction of bars removed at random (missing dates).
+    :param nan_fraction: Fraction of price/volume cells set to NaN at random.
+    :return: DataFrame with Date, Open, High, Low, Close and Volume columns.
+    """
+    rng = np.random.default_rng(seed)
+    close = rng.uniform(20, 500) * np.exp(np.cumsum(rng.normal(0.0002, 0.015, rows)))
+    spread = np.abs(rng.normal(0, 0.01, rows))
+    open_ = close * (1 + rng.normal(0, 0.005, rows))
+    df = pd.DataFrame({
+        'Date': pd.date_range(start, periods=rows, freq=freq),
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread),
+        'Low': np.minimum(open_, close) * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(100_000, 50_000_000, rows).astype('float64'),
+    })
+
+    if gap_fraction > 0:
+        df = df[rng.random(rows) >= gap_fraction].reset_index(drop=True)
+    if nan_fraction > 0:
+        values = df.iloc[:, 1:].to_numpy()
+        values[rng.random(values.shape) < nan_fraction] = np.nan
+        df.iloc[:, 1:] = values
+    return df
+
+
+def synthetic_tickers(count: int) -> list:
+    """
+    Returns ``count`` synthetic ticker symbols (SYN0000, SYN0001, ...).
+    """
+    return [f'SYN{i:04d}' for i in range(count)]
+
+
+def generate_universe(tickers, rows: int, seed: int = 0, **kwargs) -> dict:
+    """
+    Generates one history per ticker, each with its own seed derived from ``seed``.
+
+    :return: Dict mapping ticker to its DataFrame.
+    """
+    return {ticker: generate_ohlcv(rows, seed=seed + i, **kwargs) for i, ticker in enumerate(tickers)}
+
+
+def write_universe(store, tickers, rows: int, seed: int = 0, **kwargs) -> dict:
+    """
+    Generates and writes one history per ticker to a price store.
+
+    :return: Dict mapping ticker to the DataFrame written.
+    """
+    frames = generate_universe(tickers, rows, seed=seed, **kwargs)
+    for ticker, df in frames.items():
+        store.write(ticker, df)
+    return frames
+
+
+if __name__ == '__main__':
+    from src.data_storage.store import get_store
+
+    parser = argparse.ArgumentParser(description='Write synthetic OHLCV data to a price store.')
+    parser.add_argument('data_dir', help='Directory to write the data to.')
+    parser.add_argument('--tickers', type=int, default=10, help='Number of synthetic tickers.')
+    parser.add_argument('--symbols', nargs='+', default=None, help='Explicit ticker symbols to generate.')
+    parser.add_argument('--rows', type=int, default=2500, help='Bars per ticker.')
+    parser.add_argument('--freq', default='B', help='Bar frequency.')
+    parser.add_argument('--gap_fraction', type=float, default=0.0, help='Fraction of bars removed.')
+    parser.add_argument('--nan_fraction', type=float, default=0.0, help='Fraction of cells set to NaN.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    parser.add_argument('--backend', default=None, help="Price store backend ('csv' or 'parquet').")
+    args = parser.parse_args()
+
+    tickers = args.symbols or synthetic_tickers(args.tickers)
+    write_universe(get_store(args.data_dir, args.backend), tickers, args.rows, seed=args.seed,
+                   freq=args.freq, gap_fraction=args.gap_fraction, nan_fraction=args.nan_fraction)
+    print(f'Wrote {len(tickers)} tickers x {args.rows} bars to {args.data_dir}')
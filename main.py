@@ -1,11 +1,18 @@
+import os
+import json
+import time
 import argparse
+import numpy as np
 import pandas as pd
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from src.data_ingestion.download_data import download_stock_data
 from src.data_processing.process_data import preprocess_data
+from src.data_processing.pipeline import load_processed_lean
+from src.data_storage.store import get_store
+from src.universe import load_universe
 from src.technical_analysis.indicators import add_technical_indicators
 from src.modeling.train_model import train_model
-from src.visualization.plot_data import plot_stock_price, plot_technical_indicators, plot_predictions
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,9 +26,8 @@ def main(args):
     download_stock_data([args.ticker], args.start_date, args.end_date)
     
     # 2. Load data
-    data_path = f"data/{args.ticker}.csv"
     try:
-        df = pd.read_csv(data_path)
+        df = get_store().read(args.ticker)
     except FileNotFoundError:
         logging.error(f"Data file not found for ticker: {args.ticker}")
         return
@@ -40,6 +46,7 @@ def main(args):
 
     # 6. Visualize results
     logging.info("Visualizing results...")
+    from src.visualization.plot_data import plot_stock_price, plot_technical_indicators, plot_predictions
     plot_stock_price(df, args.ticker)
     plot_technical_indicators(df, args.ticker)
     
@@ -47,12 +54,106 @@ def main(args):
     predictions_df = pd.DataFrame({'Actual': y_test, 'Predicted': y_pred})
     plot_predictions(predictions_df['Actual'], predictions_df['Predicted'])
 
+def analyze_ticker(ticker, plot=False, lean=False):
+    """
+    Runs the preprocess, indicator, training and (optionally) plotting stages for one
+    ticker whose data is already stored. Used by the batch mode's worker processes.
+
+    :param lean: Use the allocation-lean pipeline (close only, float32) for the
+                 preprocess and indicator stages.
+    :return: Dict with the ticker's metrics and model coefficients.
+    """
+    started = time.perf_counter()
+    if lean:
+        df = load_processed_lean(get_store(), ticker)
+    else:
+        df = get_store().read(ticker)
+        df = preprocess_data(df)
+        df = add_technical_indicators(df)
+    model, X_test, y_test, y_pred = train_model(df)
+
+    if plot:
+        # Plotly is only imported by runs that plot
+        from src.visualization.plot_data import plot_stock_price, plot_technical_indicators, plot_predictions
+        plot_stock_price(df, ticker)
+        plot_technical_indicators(df, ticker)
+        plot_predictions(y_test, pd.Series(y_pred, index=y_test.index))
+
+    return {
+        'ticker': ticker,
+        'status': 'ok',
+        'rows': len(df),
+        'test_rows': len(y_test),
+        'mse': float(np.mean((y_test.to_numpy() - y_pred) ** 2)),
+        'intercept': float(model.intercept_),
+        'coefficients': dict(zip(X_test.columns, map(float, model.coef_))),
+        'seconds': time.perf_counter() - started,
+    }
+
+def run_batch(tickers, start_date, end_date, summary_path, workers=None, download=True, plot=False,
+              lean=False):
+    """
+    Runs the pipeline for many tickers.
+
+    All tickers are first downloaded together by the concurrent ingestion engine;
+    the CPU-bound stages then run across a process pool. Each ticker's result (or
+    error) is appended to ``summary_path`` as one JSON line as soon as it completes,
+    so a failing ticker never stops the others.
+
+    :return: Tuple of (succeeded, failed) ticker counts.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if download:
+        logging.info(f"Downloading data for {len(tickers)} tickers...")
+        report = download_stock_data(tickers, start_date, end_date)
+        logging.info(report.summary())
+
+    directory = os.path.dirname(summary_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    succeeded = failed = 0
+    with open(summary_path, 'w') as summary, ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(analyze_ticker, ticker, plot, lean): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                result = future.result()
+                succeeded += 1
+            except Exception as e:
+                result = {'ticker': ticker, 'status': 'error', 'error': f'{type(e).__name__}: {e}'}
+                failed += 1
+                logging.error(f"Pipeline failed for {ticker}: {e}")
+            summary.write(json.dumps(result) + '\n')
+            summary.flush()
+            logging.info(f"[{succeeded + failed}/{len(tickers)}] {ticker}: {result['status']}")
+
+    logging.info(f"Batch finished: {succeeded} succeeded, {failed} failed. Results in {summary_path}")
+    return succeeded, failed
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Stock Market Analysis Pipeline')
     parser.add_argument('--ticker', type=str, default='AAPL', help='Stock ticker to analyze.')
     parser.add_argument('--start_date', type=str, default='2020-01-01', help='Start date for historical data.')
     parser.add_argument('--end_date', type=str, default=None, help='End date for historical data.')
-    
+    parser.add_argument('--tickers', nargs='+', default=None, help='Run the batch mode for these tickers.')
+    parser.add_argument('--universe_file', type=str, default=None,
+                        help='Run the batch mode for the tickers in this file (one per line).')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes in batch mode.')
+    parser.add_argument('--summary', type=str, default='batch_summary.jsonl',
+                        help='JSON-lines file receiving per-ticker results in batch mode.')
+    parser.add_argument('--skip_download', action='store_true', help='Use stored data without downloading.')
+    parser.add_argument('--plot', action='store_true', help='Build the plots in batch mode too.')
+    parser.add_argument('--lean', action='store_true',
+                        help='Use the allocation-lean float32 pipeline in batch mode (less memory per worker).')
+
     args = parser.parse_args()
-    main(args)
+    if args.tickers or args.universe_file:
+        tickers = list(args.tickers or [])
+        if args.universe_file:
+            tickers += [ticker for ticker, _ in load_universe(args.universe_file)]
+        run_batch(tickers, args.start_date, args.end_date, args.summary, workers=args.workers,
+                  download=not args.skip_download, plot=args.plot, lean=args.lean)
+    else:
+        main(args)
@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from src.monitoring import metrics
+
+# Serialized responses kept in memory by default
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def file_version(path: str):
+    """
+    Returns ``(mtime_ns, size)`` of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def make_etag(*parts) -> str:
+    """
+    Returns a short, stable entity tag for the given parts (route, parameters and
+    data watermarks); equal parts always give the same tag.
+    """
+    return hashlib.sha1(json.dumps(parts, default=str, separators=(',', ':')).encode()).hexdigest()[:20]
+
+
+def dump_json(payload) -> bytes:
+    """
+    Serializes a payload compactly; dates and other non-JSON values become strings.
+    """
+    return json.dumps(payload, default=str, separators=(',', ':')).encode()
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of serialized responses keyed by route and parameters.
+
+    Each entry remembers the ETag it was built for; a lookup with a different ETag
+    (the underlying data changed) is a miss, and the new body replaces the old one.
+
+    :param max_entries: Number of responses kept.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (etag, body)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, etag: str):
+        """
+        Returns the cached body for ``key`` if it was built for ``etag``, else None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == etag:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                body = entry[1]
+            else:
+                self.misses += 1
+                body = None
+        metrics.count('cache_requests_total', cache='responses', result='hit' if body is not None else 'miss')
+        return body
+
+    def put(self, key, etag: str, body: bytes):
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key, etag: str, build) -> bytes:
+        """
+        Returns the cached body, or serializes ``build()`` with ``dump_json`` and caches it.
+        """
+        body = self.get(key, etag)
+        if body is None:
+            body = dump_json(build())
+            self.put(key, etag, body)
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                    'max_entries': self.max_entries}
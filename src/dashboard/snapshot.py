@@ -0,0 +1,323 @@
+import os
+import json
+import time
+import logging
+import threading
+from functools import partial
+
+from src.monitoring import metrics
+from src.screening.movers import rank_movers
+from src.technical_analysis.signals import SIGNAL_RULES, SignalIndex
+from src.universe import MARKET_INDICES, POPULAR_STOCKS, RECOMMENDATION_STOCKS
+from src.visualization.downsample import chart_series
+
+# Snapshot file (inside the data directory) shared by the refresh job and the web app
+SNAPSHOT_FILE = '_snapshot.json'
+
+# Snapshot layout version; snapshots written with another layout are rebuilt
+SNAPSHOT_VERSION = 2
+
+# Window of the "recent signals" table on the Recommendations page
+RECENT_SIGNAL_DAYS = 30
+
+# Points per Market Trends chart; the cards are a few hundred pixels wide
+CHART_POINTS = 500
+
+
+def _latest_date(df):
+    return df.index[-1].strftime('%B %d, %Y')
+
+
+def build_market_trends(get_data) -> dict:
+    """
+    Builds the Market Trends page: latest close, daily change and a chart per index.
+
+    Charts are sent as downsampled x/y arrays that the page draws with ``Plotly.newPlot``,
+    so their size does not grow with the length of the history.
+
+    :param get_data: Callable returning the processed DataFrame for a ticker (or None).
+    """
+    market_data = {}
+    latest_date = None
+    for ticker, name in MARKET_INDICES.items():
+        df = get_data(ticker)
+        if df is not None and not df.empty:
+            if latest_date is None:
+                latest_date = _latest_date(df)
+            latest_close = df['close'].iloc[-1]
+            previous_close = df['close'].iloc[-2]
+            daily_change = (latest_close - previous_close) / previous_close * 100
+
+            # Chart data for the index, reduced to CHART_POINTS points
+            with metrics.timer('chart_downsample'):
+                chart = chart_series(df['close'], CHART_POINTS)
+
+            market_data[ticker] = {
+                'name': name,
+                'latest_close': f'{latest_close:.2f}',
+                'daily_change': f'{daily_change:.2f}%',
+                'chart': chart,
+            }
+
+    return {'market_data': market_data, 'latest_date': latest_date}
+
+
+def build_top_movers(get_data) -> dict:
+    """
+    Builds the Top Movers page: the ten largest gainers and losers by daily change.
+
+    Only tickers with a bar on the latest date are ranked, so a stale ticker's old
+    move is not compared with today's.
+    """
+    bars = []
+    for ticker in POPULAR_STOCKS:
+        df = get_data(ticker)
+        if df is not None and not df.empty:
+            bars.append((ticker, df.index[-1], df['close'].iloc[-2], df['close'].iloc[-1]))
+    as_of = max((date for _, date, _, _ in bars), default=None)
+    bars = [bar for bar in bars if bar[1] == as_of]
+    tickers = [ticker for ticker, _, _, _ in bars]
+    previous_closes = [previous_close for _, _, previous_close, _ in bars]
+    latest_closes = [latest_close for _, _, _, latest_close in bars]
+    latest_date = as_of.strftime('%B %d, %Y') if as_of is not None else None
+
+    # Partial selection of the top gainers and losers by daily change
+    ranking = rank_movers(tickers, previous_closes, latest_closes, n=10)
+    for mover in ranking['top_gainers'] + ranking['top_losers']:
+        mover['daily_change'] = f"{mover['change_value']:.2f}%"
+        mover['latest_close'] = f"{mover['latest_close']:.2f}"
+
+    return {'top_gainers': ranking['top_gainers'], 'top_losers': ranking['top_losers'],
+            'latest_date': latest_date}
+
+
+def build_recommendations(get_data, signal_index=None, recent_days=RECENT_SIGNAL_DAYS) -> dict:
+    """
+    Builds the Recommendations page from SMA 50/200 crossovers on the latest bar, plus
+    the signals of the last ``recent_days`` days.
+
+    :param signal_index: Optional SignalIndex; an in-memory one is used if omitted.
+    """
+    if signal_index is None:
+        signal_index = SignalIndex()
+
+    recommendations_list = []
+    latest_date = None
+    scanned = []
+    for ticker in RECOMMENDATION_STOCKS:
+        df = get_data(ticker)
+        if df is not None and not df.empty:
+            if latest_date is None:
+                latest_date = _latest_date(df)
+            # Simple Golden Cross / Death Cross strategy
+            # Buy signal: SMA_50 crosses above SMA_200
+            # Sell signal: SMA_50 crosses below SMA_200
+            # Crossovers are looked up in the signal index; history is only rescanned
+            # when the ticker has a new bar
+            signal_index.update(ticker, df)
+            scanned.append(ticker)
+            crosses = signal_index.query(tickers=[ticker], signals=['golden_cross', 'death_cross'],
+                                         on_date=df.index[-1])
+
+            signal = "HOLD"
+            if not crosses.empty:
+                signal = SIGNAL_RULES[crosses['signal'].iloc[0]][3]
+
+            recommendations_list.append({
+                'ticker': ticker,
+                'signal': signal,
+                'latest_close': f"{df['close'].iloc[-1]:.2f}"
+            })
+    signal_index.save()
+
+    recent_signals = [{
+        'date': event.date.strftime('%Y-%m-%d'),
+        'ticker': event.ticker,
+        'signal': SIGNAL_RULES[event.signal][3],
+        'close': f'{event.close:.2f}',
+    } for event in signal_index.query(days=recent_days, tickers=scanned).itertuples()]
+
+    return {'recommendations': recommendations_list, 'recent_signals': recent_signals,
+            'recent_days': recent_days, 'latest_date': latest_date}
+
+
+# Page name -> builder; page names match the Flask endpoints
+PAGE_BUILDERS = {
+    'index': build_market_trends,
+    'top_movers': build_top_movers,
+    'recommendations': build_recommendations,
+}
+
+
+def build_snapshot(get_data, is_pending=None, signal_index=None) -> dict:
+    """
+    Materializes the payload of every dashboard page.
+
+    :param get_data: Callable returning the processed DataFrame for a ticker (or None).
+    :param is_pending: Optional callable telling whether a ticker without data is being
+                       fetched; such tickers are listed under each page's 'pending' key
+                       and the others (whose fetch failed) under 'unavailable'.
+    :param signal_index: Optional SignalIndex used and updated by the Recommendations page.
+    :return: Dict with the build time and one template context per page.
+    """
+    started = time.perf_counter()
+    builders = dict(PAGE_BUILDERS)
+    if signal_index is not None:
+        builders['recommendations'] = partial(build_recommendations, signal_index=signal_index)
+
+    pages = {}
+    for name, builder in builders.items():
+        missing = []
+
+        def get_page_data(ticker):
+            df = get_data(ticker)
+            if df is None:
+                missing.append(ticker)
+            return df
+
+        with metrics.timer(f'build_{name}'):
+            pages[name] = builder(get_page_data)
+        pending = [ticker for ticker in missing if is_pending is not None and is_pending(ticker)]
+        pages[name]['pending'] = pending
+        pages[name]['unavailable'] = [ticker for ticker in missing if ticker not in pending]
+    elapsed = time.perf_counter() - started
+    logging.info(f'Built dashboard snapshot in {elapsed:.2f}s')
+    return {
+        'version': SNAPSHOT_VERSION,
+        'created_at': time.time(),
+        'build_seconds': elapsed,
+        'pages': pages,
+    }
+
+
+def format_age(seconds: float) -> str:
+    """
+    Formats a snapshot age for display, e.g. '42 seconds', '5 minutes', '3 hours'.
+    """
+    seconds = max(0, int(seconds))
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count != 1 else ''}"
+    return f"{seconds} second{'s' if seconds != 1 else ''}"
+
+
+class SnapshotManager:
+    """
+    Holds the current dashboard snapshot in memory and on disk.
+
+    Snapshots are published atomically: the file is written to a temporary path and
+    renamed into place, and the in-memory reference is swapped in one assignment, so
+    readers always see a complete snapshot. Builds run one at a time, so they do not
+    update the signal index together and an older build never replaces a newer one. A snapshot written by another process
+    (e.g. ``update_data.py``) is picked up on the next ``current()`` call.
+
+    :param path: Snapshot file path.
+    :param is_pending: Optional callable telling whether a ticker is being fetched.
+    :param signal_index: Optional SignalIndex for the Recommendations page.
+    """
+
+    def __init__(self, path: str, is_pending=None, signal_index=None):
+        self.path = path
+        self.is_pending = is_pending
+        self.signal_index = signal_index
+        self._snapshot = None
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def current(self):
+        """
+        Returns the latest snapshot, reloading it if the file changed; None if there is none.
+        """
+        mtime = self._file_mtime()
+        if mtime is not None and mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    try:
+                        with open(self.path) as f:
+                            snapshot = json.load(f)
+                        if snapshot.get('version') == SNAPSHOT_VERSION:
+                            self._snapshot = snapshot
+                        else:
+                            logging.info(f'Ignoring dashboard snapshot {self.path} with an old layout')
+                        self._mtime = mtime
+                    except (OSError, ValueError) as e:
+                        logging.error(f'Failed to load dashboard snapshot {self.path}: {e}')
+        return self._snapshot
+
+    def publish(self, snapshot: dict):
+        """
+        Atomically replaces the snapshot on disk and in memory.
+        """
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+            self._snapshot = snapshot
+            self._mtime = self._file_mtime()
+
+    def _build_and_publish(self, get_data) -> dict:
+        # Callers hold _build_lock
+        snapshot = build_snapshot(get_data, self.is_pending, self.signal_index)
+        self.publish(snapshot)
+        return snapshot
+
+    def refresh(self, get_data) -> dict:
+        """
+        Builds a new snapshot with ``get_data`` and publishes it, after any build in progress.
+        """
+        with self._build_lock:
+            return self._build_and_publish(get_data)
+
+    def ensure(self, get_data) -> dict:
+        """
+        Returns the current snapshot, building the first one if needed.
+        """
+        snapshot = self.current()
+        if snapshot is None:
+            # Concurrent first requests wait for a single build
+            with self._build_lock:
+                snapshot = self.current() or self._build_and_publish(get_data)
+        return snapshot
+
+    def page(self, name: str, get_data):
+        """
+        Returns ``(payload, age_seconds)`` for a page, building the first snapshot if needed.
+        """
+        snapshot = self.ensure(get_data)
+        return snapshot['pages'][name], time.time() - snapshot['created_at']
+
+    def start_background_refresh(self, get_data, interval: float):
+        """
+        Rebuilds the snapshot every ``interval`` seconds on a daemon thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh(get_data)
+                except Exception as e:
+                    logging.error(f'Dashboard snapshot refresh failed: {e}')
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='snapshot-refresh', daemon=True)
+        self._thread.start()
+        logging.info(f'Refreshing dashboard snapshot every {interval}s')
+
+    def stop_background_refresh(self):
+        self._stop.set()
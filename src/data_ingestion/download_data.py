@@ -1,40 +1,101 @@
-import yfinance as yf
-import os
 import argparse
 import logging
 import pandas as pd
+from datetime import timedelta
 
-# Directory to store the data
-DATA_DIR = 'data'
+from src.data_ingestion.engine import IngestionEngine, DEFAULT_MAX_WORKERS, DEFAULT_BATCH_SIZE
+from src.data_storage.store import DATA_DIR, get_store
+from src.data_storage.watermarks import WatermarkStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def download_stock_data(tickers, start_date, end_date):
+def download_stock_data(tickers, start_date, end_date, store=None, engine=None):
     """
-    Downloads historical stock data for a list of tickers and saves it to CSV files.
+    Downloads historical stock data for a list of tickers and saves it to the price store.
+
+    :param store: Optional PriceStore; defaults to ``get_store()``.
+    :param engine: Optional IngestionEngine; defaults to one using Yahoo Finance.
+    :return: The IngestionReport for the run.
+    """
+    if store is None:
+        store = get_store()
+    if engine is None:
+        engine = IngestionEngine()
+    watermarks = WatermarkStore(store.data_dir)
+    # Watermarks are collected during the run and written to the file once at the end
+    updates = {}
+
+    def save(ticker, stock_data):
+        store.write(ticker, stock_data)
+        updates[ticker] = (pd.to_datetime(stock_data['Date']).max(), len(stock_data))
+        logging.info(f'Successfully downloaded and saved data for {ticker} to {store.path(ticker)}')
+        return len(stock_data)
+
+    jobs = [(ticker, start_date, end_date) for ticker in dict.fromkeys(tickers)]
+    try:
+        return engine.run(jobs, save)
+    finally:
+        watermarks.set_many(updates)
+
+def update_stock_data(tickers, start_date, end_date, store=None, watermarks=None, engine=None):
     """
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-
-    for ticker in tickers:
-        try:
-            stock_data = yf.download(ticker, start=start_date, end=end_date)
-            if not stock_data.empty:
-                # Reset index to make 'Date' a column
-                stock_data.reset_index(inplace=True)
-                
-                # Flatten columns if they are multi-level
-                if isinstance(stock_data.columns, pd.MultiIndex):
-                    stock_data.columns = stock_data.columns.droplevel(1)
-
-                file_path = os.path.join(DATA_DIR, f'{ticker}.csv')
-                stock_data.to_csv(file_path, index=False) # Don't save the index
-                logging.info(f'Successfully downloaded and saved data for {ticker} to {file_path}')
+    Incrementally refreshes stored data: for each ticker only the bars after its last
+    stored date are downloaded and appended. Tickers with no stored data are
+    downloaded from ``start_date``.
+
+    :param tickers: List of tickers; duplicates are refreshed once.
+    :param start_date: Start date for tickers with no stored history.
+    :param end_date: End date (exclusive, as for ``yf.download``).
+    :param store: Optional PriceStore; defaults to ``get_store()``.
+    :param watermarks: Optional WatermarkStore; defaults to one in the store's directory.
+    :param engine: Optional IngestionEngine; defaults to one using Yahoo Finance.
+    :return: The IngestionReport; ``report.rows`` maps tickers to rows appended.
+    """
+    if store is None:
+        store = get_store()
+    if watermarks is None:
+        watermarks = WatermarkStore(store.data_dir)
+    if engine is None:
+        engine = IngestionEngine()
+
+    end = pd.Timestamp(end_date) if end_date is not None else None
+    # The watermark file is read once here and written once after the run
+    known = watermarks.load()
+    updates = {}
+    last_dates = {}
+    jobs = []
+    for ticker in dict.fromkeys(tickers):
+        last_date = watermarks.get(ticker, known) if store.exists(ticker) else None
+        if last_date is None:
+            last_date = store.last_date(ticker)
+        last_dates[ticker] = last_date
+        fetch_start = pd.Timestamp(start_date) if last_date is None else last_date + timedelta(days=1)
+        if end is not None and fetch_start >= end:
+            if last_date is None:
+                logging.info(f'Skipping {ticker}: no stored data and the start date is not before the end date')
             else:
-                logging.warning(f'No data found for {ticker}')
-        except Exception as e:
-            logging.error(f'Failed to download data for {ticker}: {e}')
+                logging.info(f'{ticker} is up to date (last bar {last_date:%Y-%m-%d})')
+            continue
+        jobs.append((ticker, fetch_start.strftime('%Y-%m-%d'), end_date))
+
+    def append(ticker, stock_data):
+        last_date = last_dates[ticker]
+        # The provider may return bars at or before the requested start; keep only new ones
+        if last_date is not None:
+            stock_data = stock_data[pd.to_datetime(stock_data['Date']) > last_date]
+        if stock_data.empty:
+            logging.info(f'No new data for {ticker}')
+            return 0
+        rows_added = store.append(ticker, stock_data)
+        updates[ticker] = (pd.to_datetime(stock_data['Date']).max(), rows_added)
+        logging.info(f'Appended {rows_added} rows for {ticker} to {store.path(ticker)}')
+        return rows_added
+
+    try:
+        return engine.run(jobs, append)
+    finally:
+        watermarks.set_many(updates)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Download historical stock data.')
@@ -44,6 +105,20 @@ if __name__ == '__main__':
                         help='Start date for historical data in YYYY-MM-DD format.')
     parser.add_argument('--end_date', default=None,
                         help='End date for historical data in YYYY-MM-DD format.')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only download bars after the last stored date.')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='Number of concurrent download workers.')
+    parser.add_argument('--batch_size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Tickers per provider request.')
+    parser.add_argument('--rate_limit', type=float, default=None,
+                        help='Maximum provider requests per second.')
     args = parser.parse_args()
 
-    download_stock_data(args.tickers, args.start_date, args.end_date)
+    engine = IngestionEngine(max_workers=args.workers, batch_size=args.batch_size,
+                             rate_limit=args.rate_limit)
+    if args.incremental:
+        report = update_stock_data(args.tickers, args.start_date, args.end_date, engine=engine)
+    else:
+        report = download_stock_data(args.tickers, args.start_date, args.end_date, engine=engine)
+    print(report.summary())
@@ -0,0 +1,248 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from src.monitoring import metrics
+
+# Defaults tuned for the Yahoo Finance endpoints used by yfinance
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+
+def _flatten(stock_data: pd.DataFrame) -> pd.DataFrame:
+    # Reset index to make 'Date' a column and drop the ticker level if present
+    stock_data = stock_data.reset_index()
+    if isinstance(stock_data.columns, pd.MultiIndex):
+        stock_data.columns = stock_data.columns.droplevel(1)
+    return stock_data
+
+
+class YFinanceFetcher:
+    """
+    Fetches bars from Yahoo Finance, requesting many tickers in one call.
+
+    A fetcher is any callable ``fetcher(tickers, start_date, end_date)`` returning a
+    dict mapping tickers to DataFrames with a 'Date' column; tickers without data
+    may be omitted or map to an empty frame.
+
+    ``yf.download`` keeps its results in module-global state, so calls are serialized;
+    yfinance parallelizes the tickers of each batch itself.
+    """
+
+    _lock = threading.Lock()
+
+    def __call__(self, tickers, start_date, end_date) -> dict:
+        import yfinance as yf
+
+        with self._lock:
+            stock_data = yf.download(list(tickers), start=start_date, end=end_date,
+                                     group_by='ticker', threads=True, progress=False)
+        if stock_data.empty:
+            return {}
+        if not isinstance(stock_data.columns, pd.MultiIndex):
+            return {tickers[0]: _flatten(stock_data)}
+
+        frames = {}
+        for ticker in tickers:
+            if ticker not in stock_data.columns.get_level_values(0):
+                continue
+            frame = stock_data[ticker].dropna(how='all')
+            if not frame.empty:
+                frames[ticker] = _flatten(frame)
+        return frames
+
+
+class RateLimiter:
+    """
+    Token bucket limiting provider calls to ``rate`` per second (bursts up to ``burst``).
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+@dataclass
+class IngestionReport:
+    """
+    Outcome of an ingestion run.
+    """
+    rows: dict = field(default_factory=dict)        # ticker -> rows stored
+    failed: dict = field(default_factory=dict)      # ticker -> error message
+    no_data: list = field(default_factory=list)     # tickers the provider had nothing for
+    latency: dict = field(default_factory=dict)     # ticker -> seconds spent fetching
+    requests: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> list:
+        return list(self.rows)
+
+    def summary(self) -> str:
+        latencies = sorted(self.latency.values())
+        p50 = latencies[len(latencies) // 2] if latencies else 0.0
+        worst = latencies[-1] if latencies else 0.0
+        return (f'{len(self.rows)} succeeded, {len(self.failed)} failed, {len(self.no_data)} without data '
+                f'in {self.elapsed:.1f}s ({self.requests} provider requests, '
+                f'p50 latency {p50:.2f}s, max {worst:.2f}s)')
+
+    def to_dict(self) -> dict:
+        return {
+            'rows': self.rows,
+            'failed': self.failed,
+            'no_data': self.no_data,
+            'latency': self.latency,
+            'requests': self.requests,
+            'elapsed': self.elapsed,
+        }
+
+
+class IngestionEngine:
+    """
+    Downloads many tickers concurrently.
+
+    Jobs sharing a date window are grouped into batches of ``batch_size`` tickers and
+    each batch is fetched with a single provider request on a bounded thread pool.
+    Tickers a batch request did not return (or a batch that raised) are retried one
+    by one with exponential backoff. Every provider request passes through the
+    optional rate limiter.
+
+    :param fetcher: Callable ``fetcher(tickers, start_date, end_date) -> {ticker: DataFrame}``.
+    :param max_workers: Size of the worker pool.
+    :param batch_size: Tickers per provider request; use 1 for providers without batching.
+    :param max_retries: Per-ticker retries after the batch request.
+    :param backoff: Base delay in seconds; retry ``n`` waits ``backoff * 2 ** n``.
+    :param rate_limit: Optional maximum provider requests per second.
+    """
+
+    def __init__(self, fetcher=None, max_workers=DEFAULT_MAX_WORKERS, batch_size=DEFAULT_BATCH_SIZE,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF, rate_limit=None,
+                 sleep=time.sleep):
+        self.fetcher = fetcher or YFinanceFetcher()
+        self.max_workers = max_workers
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limiter = RateLimiter(rate_limit, sleep=sleep) if rate_limit else None
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def _request(self, tickers, start_date, end_date, report):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        with self._lock:
+            report.requests += 1
+        metrics.count('download_requests_total')
+        with metrics.timer('provider_request'):
+            return self.fetcher(tickers, start_date, end_date) or {}
+
+    def _fetch_one(self, ticker, start_date, end_date, report):
+        error = None
+        for attempt in range(self.max_retries):
+            self._sleep(self.backoff * 2 ** attempt)
+            try:
+                frame = self._request([ticker], start_date, end_date, report).get(ticker)
+                return frame, None
+            except Exception as e:
+                error = e
+                logging.warning(f'Retry {attempt + 1}/{self.max_retries} for {ticker} failed: {e}')
+        return None, error
+
+    def _run_batch(self, tickers, start_date, end_date, handler, report):
+        started = time.perf_counter()
+        batch_failed = False
+        try:
+            frames = self._request(tickers, start_date, end_date, report)
+        except Exception as e:
+            logging.warning(f'Request for {len(tickers)} tickers failed: {e}')
+            frames = {}
+            batch_failed = True
+        batch_latency = time.perf_counter() - started
+
+        for ticker in tickers:
+            frame = frames.get(ticker)
+            error = None
+            latency = batch_latency
+            # Retry tickers the request failed for or a multi-ticker batch left out
+            if batch_failed or ((frame is None or frame.empty) and len(tickers) > 1):
+                retry_started = time.perf_counter()
+                frame, error = self._fetch_one(ticker, start_date, end_date, report)
+                latency += time.perf_counter() - retry_started
+
+            with self._lock:
+                report.latency[ticker] = latency
+            if error is not None:
+                logging.error(f'Failed to download data for {ticker}: {error}')
+                with self._lock:
+                    report.failed[ticker] = str(error)
+                continue
+            if frame is None or frame.empty:
+                logging.warning(f'No data found for {ticker}')
+                with self._lock:
+                    report.no_data.append(ticker)
+                continue
+            try:
+                rows = handler(ticker, frame)
+            except Exception as e:
+                logging.error(f'Failed to store data for {ticker}: {e}')
+                with self._lock:
+                    report.failed[ticker] = str(e)
+                continue
+            with self._lock:
+                report.rows[ticker] = rows
+
+    def run(self, jobs, handler) -> IngestionReport:
+        """
+        Fetches every job and passes each non-empty result to ``handler``.
+
+        :param jobs: Iterable of ``(ticker, start_date, end_date)`` tuples.
+        :param handler: Callable ``handler(ticker, frame) -> rows stored``.
+        :return: An IngestionReport.
+        """
+        started = time.perf_counter()
+        report = IngestionReport()
+
+        # Group tickers by date window so each batch is a single provider request
+        windows = OrderedDict()
+        for ticker, start_date, end_date in jobs:
+            windows.setdefault((start_date, end_date), []).append(ticker)
+        batches = [(tickers[i:i + self.batch_size], start_date, end_date)
+                   for (start_date, end_date), tickers in windows.items()
+                   for i in range(0, len(tickers), self.batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._run_batch, tickers, start_date, end_date, handler, report)
+                       for tickers, start_date, end_date in batches]
+            for future in as_completed(futures):
+                future.result()
+
+        report.elapsed = time.perf_counter() - started
+        metrics.count('downloads_total', len(report.rows), result='ok')
+        metrics.count('downloads_total', len(report.failed), result='failed')
+        metrics.count('downloads_total', len(report.no_data), result='no_data')
+        logging.info(f'Ingestion finished: {report.summary()}')
+        return report
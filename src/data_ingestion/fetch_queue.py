@@ -0,0 +1,116 @@
+import time
+import queue
+import logging
+import threading
+
+# Tickers fetched together by one worker pass
+DEFAULT_BATCH_SIZE = 50
+
+# Seconds before a ticker whose fetch produced no data may be requested again
+DEFAULT_RETRY_AFTER = 600
+
+
+class FetchQueue:
+    """
+    Background download queue with per-ticker request coalescing.
+
+    ``request`` never blocks: it queues the ticker unless a fetch for it is already
+    pending (single flight), and a daemon worker drains the queue in batches through
+    ``download_fn``. Tickers whose fetch produced no data are not re-queued until
+    ``retry_after`` seconds have passed.
+
+    :param download_fn: Callable ``download_fn(tickers, start_date, end_date)``.
+    :param is_available: Callable telling whether a ticker has stored data after a fetch.
+    :param on_complete: Optional callable invoked after each batch with the list of
+                        tickers it resolved, whether their fetch succeeded or not.
+    """
+
+    def __init__(self, download_fn, is_available, on_complete=None,
+                 batch_size=DEFAULT_BATCH_SIZE, retry_after=DEFAULT_RETRY_AFTER):
+        self.download_fn = download_fn
+        self.is_available = is_available
+        self.on_complete = on_complete
+        self.batch_size = batch_size
+        self.retry_after = retry_after
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._failed = {}  # ticker -> time of the failed fetch
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def request(self, ticker: str, start_date=None, end_date=None) -> bool:
+        """
+        Queues a fetch for ``ticker`` unless one is pending or recently failed.
+
+        :return: True if the ticker is (now) pending.
+        """
+        with self._lock:
+            if ticker in self._pending:
+                return True
+            failed_at = self._failed.get(ticker)
+            if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+                return False
+            self._pending.add(ticker)
+            self._ensure_worker()
+        self._queue.put((ticker, start_date, end_date))
+        return True
+
+    def is_pending(self, ticker: str) -> bool:
+        with self._lock:
+            return ticker in self._pending
+
+    def pending(self) -> list:
+        with self._lock:
+            return sorted(self._pending)
+
+    def join(self):
+        """
+        Blocks until every queued fetch has finished.
+        """
+        self._queue.join()
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='fetch-queue', daemon=True)
+            self._worker.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            windows = {}
+            for ticker, start_date, end_date in batch:
+                windows.setdefault((start_date, end_date), []).append(ticker)
+
+            resolved = []
+            for (start_date, end_date), tickers in windows.items():
+                try:
+                    self.download_fn(tickers, start_date, end_date)
+                except Exception as e:
+                    logging.error(f'Background fetch of {tickers} failed: {e}')
+                now = time.monotonic()
+                with self._lock:
+                    for ticker in tickers:
+                        if self.is_available(ticker):
+                            self._failed.pop(ticker, None)
+                        else:
+                            self._failed[ticker] = now
+                        self._pending.discard(ticker)
+                        resolved.append(ticker)
+
+            # Failures are reported too, so pages stop showing the tickers as loading
+            if self.on_complete is not None:
+                try:
+                    self.on_complete(resolved)
+                except Exception as e:
+                    logging.error(f'Fetch completion callback failed: {e}')
+            for _ in batch:
+                self._queue.task_done()
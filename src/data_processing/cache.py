@@ -0,0 +1,135 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.monitoring import metrics
+
+# Default memory budget for cached frames (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Locks serializing builds of the same key; keys share them by hash, so their number
+# stays fixed however many keys are requested
+KEY_LOCK_STRIPES = 64
+
+
+class ProcessedDataCache:
+    """
+    Thread-safe LRU cache of fully processed DataFrames.
+
+    Entries are keyed by an arbitrary hashable key (e.g. ticker and date range) and
+    remember the version (mtime and size) of the source file they were built from.
+    A lookup whose source file has changed since the entry was built is treated as
+    a miss and the frame is rebuilt. When the total size of the cached frames
+    exceeds ``max_bytes`` the least recently used entries are evicted.
+
+    Cached frames are shared between callers and must not be mutated.
+
+    :param max_bytes: Memory budget for the cached frames.
+    :param name: Label of the cache in the ``cache_requests_total`` metric.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, name: str = 'processed_data'):
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries = OrderedDict()  # key -> (version, df, nbytes)
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _source_version(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _lookup(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+        if entry is not None:
+            metrics.count('cache_requests_total', cache=self.name, result='hit')
+            return entry[1]
+        return None
+
+    def get(self, key, path, loader):
+        """
+        Returns the cached frame for ``key``, rebuilding it with ``loader`` when it is
+        missing or ``path`` has changed since it was cached.
+
+        :param key: Hashable cache key.
+        :param path: Source file whose mtime and size invalidate the entry.
+        :param loader: Zero-argument callable returning the processed DataFrame (or None).
+        :return: The processed DataFrame, or None if the loader returned None.
+        """
+        version = self._source_version(path)
+        df = self._lookup(key, version)
+        if df is not None:
+            return df
+
+        # Only one thread builds a given key; the others wait and then hit the cache
+        with self._key_locks[hash(key) % KEY_LOCK_STRIPES]:
+            version = self._source_version(path)
+            df = self._lookup(key, version)
+            if df is not None:
+                return df
+            with self._lock:
+                self.misses += 1
+            metrics.count('cache_requests_total', cache=self.name, result='miss')
+            df = loader()
+            if df is not None:
+                self._store(key, version, df)
+            return df
+
+    def _store(self, key, version, df: pd.DataFrame):
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if nbytes > self.max_bytes:
+                # Too large to ever fit; serve it uncached
+                return
+            self._entries[key] = (version, df, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """
+        Drops one entry, or every entry when ``key`` is None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry[2]
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss/eviction counters and current occupancy.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+from src.data_processing.process_data import preprocess_data
+from src.monitoring import metrics
+from src.technical_analysis.indicators import add_technical_indicators
+from src.technical_analysis.streaming import INDICATOR_COLUMNS
+
+# Columns the lean pipeline reads from the price store
+REQUIRED_COLUMNS = ['Close']
+
+# Output columns, in order: close, daily return, then the indicators
+LEAN_COLUMNS = ['close', 'daily_return'] + INDICATOR_COLUMNS
+
+
+def _rolling_mean_into(values, window, out, scratch):
+    # out[t] = mean(values[t - window + 1 : t + 1]); NaN during warm-up
+    np.cumsum(values, out=scratch)
+    out[:window - 1] = np.nan
+    if len(values) < window:
+        out[:] = np.nan
+        return
+    out[window - 1] = scratch[window - 1]
+    np.subtract(scratch[window:], scratch[:-window], out=out[window:])
+    out[window - 1:] /= window
+
+
+def _ewm_mean_into(values, span, out):
+    # pandas runs the adjust=False recurrence in C; its result is copied into out
+    # and released straight away
+    out[:] = pd.Series(values, copy=False).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def compute_indicators_into(close: np.ndarray, out: np.ndarray):
+    """
+    Writes every ``add_technical_indicators`` column for ``close`` into ``out``.
+
+    :param close: float64 array of closes.
+    :param out: Preallocated (len(close), len(INDICATOR_COLUMNS)) array, in
+                ``INDICATOR_COLUMNS`` order; may be float32.
+    """
+    n = len(close)
+    column = {name: i for i, name in enumerate(INDICATOR_COLUMNS)}
+
+    # Two float64 scratch buffers are reused for every indicator
+    scratch = np.empty(n)
+    work = np.empty(n)
+    centered = close - close[0] if n else close  # centering limits cancellation in the sums
+
+    _rolling_mean_into(centered, 50, work, scratch)
+    out[:, column['SMA_50']] = work + close[0] if n else work
+    _rolling_mean_into(centered, 200, work, scratch)
+    out[:, column['SMA_200']] = work + close[0] if n else work
+
+    _ewm_mean_into(close, 50, work)
+    out[:, column['EMA_50']] = work
+    _ewm_mean_into(close, 200, work)
+    out[:, column['EMA_200']] = work
+
+    # RSI from rolling mean gains and losses; the first move counts as zero
+    delta = np.empty(n)
+    delta[:1] = 0.0
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    gain = np.maximum(delta, 0.0)
+    _rolling_mean_into(gain, 14, work, scratch)
+    np.negative(delta, out=delta)
+    np.maximum(delta, 0.0, out=delta)
+    _rolling_mean_into(delta, 14, gain, scratch)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(work, gain, out=work)
+    out[:, column['RSI']] = 100 - (100 / (1 + work))
+
+    # MACD
+    _ewm_mean_into(close, 12, work)
+    _ewm_mean_into(close, 26, delta)
+    np.subtract(work, delta, out=work)
+    out[:, column['MACD']] = work
+    _ewm_mean_into(work, 9, delta)
+    out[:, column['MACD_signal']] = delta
+    out[:, column['MACD_hist']] = work - delta
+
+    # Bollinger bands from rolling sums of the centered closes and their squares
+    _rolling_mean_into(centered, 20, work, scratch)
+    np.multiply(centered, centered, out=gain)
+    _rolling_mean_into(gain, 20, delta, scratch)
+    # sample variance = (E[x^2] - E[x]^2) * n / (n - 1)
+    np.subtract(delta, work * work, out=delta)
+    delta *= 20 / 19
+    np.maximum(delta, 0.0, out=delta)
+    np.sqrt(delta, out=delta)
+    if n:
+        work += close[0]
+    out[:, column['middle_band']] = work
+    out[:, column['upper_band']] = work + (delta * 2)
+    out[:, column['lower_band']] = work - (delta * 2)
+
+
+def load_processed_data(store, ticker):
+    """
+    Reads a ticker from the price store and runs preprocessing and indicators.
+
+    :return: The processed DataFrame, or None if the ticker has no stored data.
+    """
+    if not store.exists(ticker):
+        return None
+    df = store.read(ticker)
+    df = preprocess_data(df)
+    df = add_technical_indicators(df)
+    metrics.count('rows_processed_total', len(df), stage='processed_data')
+    return df
+
+
+def load_processed_lean(store, ticker: str, dtype='float32', start=None, end=None) -> pd.DataFrame:
+    """
+    Allocation-lean equivalent of ``preprocess_data`` + ``add_technical_indicators``.
+
+    Only the ``Close`` column is read from the store. The daily return and every
+    indicator are computed into one preallocated ``dtype`` block, and the rows the
+    original pipeline drops (the first bar and the indicator warm-up) are trimmed once
+    at the end. The result has the ``close``, ``daily_return`` and indicator columns of
+    the original pipeline, without the unused open/high/low/volume columns.
+
+    :param store: PriceStore to read from.
+    :param ticker: The ticker symbol.
+    :param dtype: Output dtype; float32 halves memory, float64 matches the original values.
+    :return: DataFrame indexed by date.
+    """
+    raw = store.read(ticker, columns=REQUIRED_COLUMNS, start=start, end=end)
+    raw = raw.sort_values('Date')
+    close = raw['Close'].ffill().to_numpy(dtype='float64')
+    dates = pd.DatetimeIndex(raw['Date'])
+    del raw
+
+    # preprocess_data drops leading NaNs and then the first row (no daily return)
+    valid = ~np.isnan(close)
+    first = int(np.argmax(valid)) + 1 if valid.any() else len(close)
+    previous_close = close[first - 1:-1] if first < len(close) else close[:0]
+    close = close[first:]
+    dates = dates[first:]
+
+    block = np.empty((len(close), len(LEAN_COLUMNS)), dtype=dtype)
+    block[:, 0] = close
+    block[:, 1] = close / previous_close - 1
+    compute_indicators_into(close, block[:, 2:])
+
+    # Trim rows with NaNs once; normally just the leading warm-up rows (a view, no copy)
+    keep = ~np.isnan(block).any(axis=1)
+    start_row = int(np.argmax(keep)) if keep.any() else len(keep)
+    if keep[start_row:].all():
+        block = block[start_row:]
+        dates = dates[start_row:]
+    else:
+        block = block[keep]
+        dates = dates[keep]
+
+    return pd.DataFrame(block, index=pd.DatetimeIndex(dates, name='date'), columns=LEAN_COLUMNS, copy=False)
+
+
+if __name__ == '__main__':
+    # Compare the lean pipeline with the original one on a stored ticker
+    import sys
+    from src.data_processing.process_data import preprocess_data
+    from src.data_storage.store import get_store
+    from src.technical_analysis.indicators import add_technical_indicators
+
+    ticker = sys.argv[1] if len(sys.argv) > 1 else 'AAPL'
+    store = get_store()
+    expected = add_technical_indicators(preprocess_data(store.read(ticker)))
+    for dtype in ('float64', 'float32'):
+        lean = load_processed_lean(store, ticker, dtype=dtype)
+        max_error = (lean[LEAN_COLUMNS] - expected[LEAN_COLUMNS]).abs().max().max()
+        print(f"{dtype}: {len(lean)} rows ({len(expected)} expected), "
+              f"{lean.memory_usage().sum()} bytes, max absolute difference {max_error:.3e}")
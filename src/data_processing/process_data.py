@@ -1,5 +1,9 @@
 import pandas as pd
 
+from src.monitoring.metrics import timed
+
+
+@timed()
 def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans and preprocesses the stock data.
@@ -0,0 +1,46 @@
+import os
+import argparse
+import logging
+
+from src.data_storage.store import DATA_DIR, CSVStore, ParquetStore
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def migrate_csv_to_parquet(data_dir: str = DATA_DIR, remove_csv: bool = False, overwrite: bool = False):
+    """
+    Converts every legacy ``<TICKER>.csv`` file in ``data_dir`` to ``<TICKER>.parquet``.
+
+    :param data_dir: Directory holding the CSV files.
+    :param remove_csv: Delete each CSV once its Parquet file has been written.
+    :param overwrite: Re-convert tickers that already have a Parquet file.
+    :return: List of migrated tickers.
+    """
+    csv_store = CSVStore(data_dir)
+    parquet_store = ParquetStore(data_dir)
+
+    migrated = []
+    for ticker in csv_store.tickers():
+        if os.path.exists(parquet_store.path(ticker)) and not overwrite:
+            logging.info(f'Skipping {ticker}: Parquet file already exists')
+            continue
+        try:
+            df = csv_store.read(ticker)
+            parquet_store.write(ticker, df)
+        except Exception as e:
+            logging.error(f'Failed to migrate {ticker}: {e}')
+            continue
+        if remove_csv:
+            os.remove(csv_store.path(ticker))
+        migrated.append(ticker)
+        logging.info(f'Migrated {ticker} ({len(df)} rows) to {parquet_store.path(ticker)}')
+    return migrated
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert per-ticker CSV files to Parquet.')
+    parser.add_argument('--data_dir', default=DATA_DIR, help='Directory holding the CSV files.')
+    parser.add_argument('--remove_csv', action='store_true', help='Delete CSV files after conversion.')
+    parser.add_argument('--overwrite', action='store_true', help='Re-convert existing Parquet files.')
+    args = parser.parse_args()
+
+    migrate_csv_to_parquet(args.data_dir, args.remove_csv, args.overwrite)
@@ -0,0 +1,304 @@
+import os
+import logging
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from src.monitoring.metrics import timed
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# Directory to store the data
+DATA_DIR = 'data'
+
+# Column holding the bar timestamp in every stored frame
+DATE_COLUMN = 'Date'
+
+# Rows per Parquet row group; small groups let date-range reads skip most of a file
+ROW_GROUP_SIZE = 4096
+
+
+def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns a copy of ``df`` with a datetime ``Date`` column, sorted by date, and
+    float64 value columns.
+    """
+    df = df.copy()
+    if DATE_COLUMN not in df.columns:
+        df = df.reset_index()
+        df.rename(columns={df.columns[0]: DATE_COLUMN}, inplace=True)
+    df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN])
+    for col in df.columns:
+        if col != DATE_COLUMN:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    df.sort_values(DATE_COLUMN, inplace=True)
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+def _slice_dates(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    if start is not None:
+        df = df[df[DATE_COLUMN] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df[DATE_COLUMN] <= pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+class PriceStore(ABC):
+    """
+    Base class for per-ticker OHLCV storage.
+
+    Frames are exchanged with a ``Date`` column (not an index) and the provider's
+    column names (``Close``, ``High``, ...), i.e. the layout ``preprocess_data``
+    expects. Backends implement ``read``, ``iter_chunks`` and ``write``.
+    """
+
+    extension = None
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+
+    def path(self, ticker: str) -> str:
+        return os.path.join(self.data_dir, f'{ticker}{self.extension}')
+
+    def source_path(self, ticker: str) -> str:
+        """
+        Returns the file currently backing ``ticker``; its mtime versions the data.
+        """
+        return self.path(ticker)
+
+    def exists(self, ticker: str) -> bool:
+        return os.path.exists(self.source_path(ticker))
+
+    def tickers(self) -> list:
+        """
+        Returns the sorted list of tickers with stored data.
+        """
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(name[:-len(self.extension)] for name in os.listdir(self.data_dir)
+                      if name.endswith(self.extension))
+
+    @abstractmethod
+    def read(self, ticker: str, columns=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Reads stored bars for a ticker.
+
+        :param ticker: The ticker symbol.
+        :param columns: Optional list of columns to load; ``Date`` is always included.
+        :param start: Optional first date (inclusive).
+        :param end: Optional last date (inclusive).
+        :return: DataFrame with a ``Date`` column. Raises FileNotFoundError if missing.
+        """
+
+    @abstractmethod
+    def iter_chunks(self, ticker: str, chunk_rows: int, columns=None):
+        """
+        Yields a ticker's stored bars in date order as DataFrames of at most
+        ``chunk_rows`` rows, without loading the whole history.
+
+        :param columns: Optional list of columns to load; ``Date`` is always included.
+        """
+
+    @abstractmethod
+    def write(self, ticker: str, df: pd.DataFrame):
+        """
+        Replaces the stored bars for a ticker.
+        """
+
+    def append(self, ticker: str, df: pd.DataFrame) -> int:
+        """
+        Appends bars for a ticker, replacing any stored bars with the same date.
+
+        :return: Number of rows added to the stored history.
+        """
+        new_rows = _normalize_frame(df)
+        if not self.exists(ticker):
+            self.write(ticker, new_rows)
+            return len(new_rows)
+        existing = self.read(ticker)
+        combined = pd.concat([existing, new_rows], ignore_index=True)
+        combined.drop_duplicates(subset=DATE_COLUMN, keep='last', inplace=True)
+        self.write(ticker, combined)
+        return len(combined) - len(existing)
+
+    def tail(self, ticker: str, n: int, columns=None) -> pd.DataFrame:
+        """
+        Returns the last ``n`` stored bars for a ticker.
+        """
+        return self.read(ticker, columns=columns).tail(n).reset_index(drop=True)
+
+    def last_date(self, ticker: str):
+        """
+        Returns the date of the last stored bar for a ticker, or None if there is none.
+        """
+        if not self.exists(ticker):
+            return None
+        dates = self.read(ticker, columns=[DATE_COLUMN])[DATE_COLUMN]
+        return dates.max() if len(dates) else None
+
+    def _columns(self, columns):
+        if columns is None:
+            return None
+        return [DATE_COLUMN] + [col for col in columns if col != DATE_COLUMN]
+
+    def _replace(self, ticker, write_fn):
+        # Write to a temporary file and rename so readers never see a partial file
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+        path = self.path(ticker)
+        tmp_path = f'{path}.tmp'
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+
+
+class CSVStore(PriceStore):
+    """
+    Legacy text storage: one ``data/<TICKER>.csv`` per ticker.
+    """
+
+    extension = '.csv'
+
+    @timed('csv_read')
+    def read(self, ticker, columns=None, start=None, end=None):
+        df = pd.read_csv(self.path(ticker), usecols=self._columns(columns),
+                         parse_dates=[DATE_COLUMN])
+        return _slice_dates(df, start, end)
+
+    def iter_chunks(self, ticker, chunk_rows, columns=None):
+        with pd.read_csv(self.path(ticker), usecols=self._columns(columns), parse_dates=[DATE_COLUMN],
+                         chunksize=chunk_rows) as reader:
+            yield from reader
+
+    def write(self, ticker, df):
+        df = _normalize_frame(df)
+        self._replace(ticker, lambda path: df.to_csv(path, index=False))
+
+
+class ParquetStore(PriceStore):
+    """
+    Columnar storage: one ``data/<TICKER>.parquet`` per ticker with a typed datetime
+    ``Date`` column and float64 value columns.
+
+    Reads project columns and push date filters down to Parquet row groups, so only
+    the requested slice is decoded. Tickers that have not been migrated yet are read
+    from their legacy CSV file.
+    """
+
+    extension = '.parquet'
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        if pq is None:
+            raise ImportError('ParquetStore requires pyarrow: pip install pyarrow')
+        super().__init__(data_dir)
+        self._legacy = CSVStore(data_dir)
+
+    def source_path(self, ticker):
+        path = self.path(ticker)
+        if not os.path.exists(path) and self._legacy.exists(ticker):
+            return self._legacy.path(ticker)
+        return path
+
+    def tickers(self):
+        return sorted(set(super().tickers()) | set(self._legacy.tickers()))
+
+    @timed('parquet_read')
+    def read(self, ticker, columns=None, start=None, end=None):
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            if self._legacy.exists(ticker):
+                return self._legacy.read(ticker, columns, start, end)
+            raise FileNotFoundError(path)
+
+        filters = []
+        if start is not None:
+            filters.append((DATE_COLUMN, '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append((DATE_COLUMN, '<=', pd.Timestamp(end)))
+        table = pq.read_table(path, columns=self._columns(columns),
+                              filters=filters or None, memory_map=True)
+        return table.to_pandas()
+
+    def tail(self, ticker, n, columns=None):
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return self._legacy.tail(ticker, n, columns)
+        # Decode only the trailing row groups that hold the last n rows
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        metadata = parquet_file.metadata
+        groups = []
+        rows = 0
+        for i in reversed(range(metadata.num_row_groups)):
+            groups.insert(0, i)
+            rows += metadata.row_group(i).num_rows
+            if rows >= n:
+                break
+        table = parquet_file.read_row_groups(groups, columns=self._columns(columns))
+        return table.to_pandas().tail(n).reset_index(drop=True)
+
+    def iter_chunks(self, ticker, chunk_rows, columns=None):
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            yield from self._legacy.iter_chunks(ticker, chunk_rows, columns)
+            return
+        # Batches are decoded one row group at a time
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=self._columns(columns)):
+            yield batch.to_pandas()
+
+    def last_date(self, ticker):
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return self._legacy.last_date(ticker)
+        # Row-group statistics give the maximum date without decoding any data
+        metadata = pq.ParquetFile(path).metadata
+        column = metadata.schema.names.index(DATE_COLUMN)
+        last = None
+        for i in range(metadata.num_row_groups):
+            statistics = metadata.row_group(i).column(column).statistics
+            if statistics is None or not statistics.has_min_max:
+                return super().last_date(ticker)
+            if last is None or statistics.max > last:
+                last = statistics.max
+        return pd.Timestamp(last) if last is not None else None
+
+    def write(self, ticker, df):
+        table = pa.Table.from_pandas(_normalize_frame(df), preserve_index=False)
+        self._replace(ticker, lambda path: pq.write_table(
+            table, path, row_group_size=ROW_GROUP_SIZE))
+
+
+BACKENDS = {
+    'csv': CSVStore,
+    'parquet': ParquetStore,
+}
+
+
+def default_backend() -> str:
+    """
+    Returns the backend named by PRICE_STORE_BACKEND, or Parquet when pyarrow is installed.
+    """
+    backend = os.environ.get('PRICE_STORE_BACKEND')
+    if backend:
+        return backend
+    return 'parquet' if pq is not None else 'csv'
+
+
+def get_store(data_dir: str = DATA_DIR, backend: str = None) -> PriceStore:
+    """
+    Creates the price store for ``data_dir``.
+
+    :param data_dir: Directory holding the per-ticker files.
+    :param backend: 'csv' or 'parquet'; defaults to ``default_backend()``.
+    :return: A PriceStore instance.
+    """
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown price store backend '{backend}'.")
+    logging.debug(f'Using {backend} price store in {data_dir}')
+    return BACKENDS[backend](data_dir)
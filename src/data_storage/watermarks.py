@@ -0,0 +1,74 @@
+import os
+import json
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from src.data_storage.store import DATA_DIR
+
+# File (inside the data directory) recording the last stored bar per ticker
+WATERMARK_FILE = '_watermarks.json'
+
+
+class WatermarkStore:
+    """
+    Persists a per-ticker watermark: the date of the last stored bar, the time of
+    the refresh that wrote it and the number of rows it appended.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.path = os.path.join(data_dir, WATERMARK_FILE)
+        self._lock = threading.Lock()
+
+    def load(self) -> dict:
+        """
+        Returns all watermarks as ``{ticker: {'last_date': ..., 'updated_at': ..., 'rows_added': ...}}``.
+        """
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, ticker: str, watermarks: dict = None):
+        """
+        Returns the last stored date for ``ticker`` as a Timestamp, or None.
+
+        :param watermarks: Optional result of ``load()``, to look up many tickers
+                           without re-reading the file for each.
+        """
+        if watermarks is None:
+            watermarks = self.load()
+        entry = watermarks.get(ticker)
+        if entry is None:
+            return None
+        return pd.Timestamp(entry['last_date'])
+
+    def set(self, ticker: str, last_date, rows_added: int = 0):
+        self.set_many({ticker: (last_date, rows_added)})
+
+    def set_many(self, updates: dict):
+        """
+        Records many watermarks with a single read and write of the file.
+
+        :param updates: Dict mapping tickers to ``(last_date, rows_added)`` tuples.
+        """
+        if not updates:
+            return
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            watermarks = self.load()
+            for ticker, (last_date, rows_added) in updates.items():
+                watermarks[ticker] = {
+                    'last_date': pd.Timestamp(last_date).strftime('%Y-%m-%d'),
+                    'updated_at': updated_at,
+                    'rows_added': int(rows_added),
+                }
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(watermarks, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,234 @@
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.modeling.train_model import FEATURES
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Default walk-forward layout: first fit on 60% of the rows, then refit every 20 bars
+DEFAULT_INITIAL_FRACTION = 0.6
+DEFAULT_STEP = 20
+
+
+class IncrementalOLS:
+    """
+    Ordinary least squares with an intercept, fitted from running sufficient statistics.
+
+    ``add`` (and ``remove``, for rolling windows) merge a block of rows into the
+    count, means and centered cross-product matrices using the pairwise update of
+    Chan et al., so refitting after new rows costs O(rows * features^2) for the new
+    rows plus one small solve, instead of a fit over the whole history. The solution
+    matches ``sklearn.linear_model.LinearRegression`` on the same rows.
+    """
+
+    def __init__(self, n_features: int):
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = 0.0
+        self.sxx = np.zeros((n_features, n_features))
+        self.sxy = np.zeros(n_features)
+        self.coef_ = np.zeros(n_features)
+        self.intercept_ = 0.0
+
+    def _merge(self, X, y, sign):
+        m = len(X)
+        if m == 0:
+            return
+        batch_mean_x = X.mean(axis=0)
+        batch_mean_y = y.mean()
+        dx = X - batch_mean_x
+        dy = y - batch_mean_y
+        batch_sxx = dx.T @ dx
+        batch_sxy = dx.T @ dy
+
+        n = self.n + sign * m
+        if n <= 0:
+            self.__init__(len(self.mean_x))
+            return
+        delta_x = batch_mean_x - self.mean_x
+        delta_y = batch_mean_y - self.mean_y
+        if sign > 0:
+            weight = self.n * m / n
+            self.sxx += batch_sxx + weight * np.outer(delta_x, delta_x)
+            self.sxy += batch_sxy + weight * delta_x * delta_y
+            self.mean_x += delta_x * m / n
+            self.mean_y += delta_y * m / n
+        else:
+            # Inverse of the merge: take the block back out of the statistics
+            self.mean_x -= delta_x * m / n
+            self.mean_y -= delta_y * m / n
+            delta_x = batch_mean_x - self.mean_x
+            delta_y = batch_mean_y - self.mean_y
+            weight = n * m / self.n
+            self.sxx -= batch_sxx + weight * np.outer(delta_x, delta_x)
+            self.sxy -= batch_sxy + weight * delta_x * delta_y
+        self.n = n
+
+    def add(self, X: np.ndarray, y: np.ndarray):
+        self._merge(np.asarray(X, dtype='float64'), np.asarray(y, dtype='float64'), 1)
+
+    def remove(self, X: np.ndarray, y: np.ndarray):
+        self._merge(np.asarray(X, dtype='float64'), np.asarray(y, dtype='float64'), -1)
+
+    def fit(self) -> 'IncrementalOLS':
+        """
+        Solves the normal equations for the rows currently in the statistics.
+        """
+        self.coef_ = np.linalg.lstsq(self.sxx, self.sxy, rcond=None)[0]
+        self.intercept_ = self.mean_y - self.mean_x @ self.coef_
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X, dtype='float64') @ self.coef_ + self.intercept_
+
+
+def walk_forward_backtest(df: pd.DataFrame, features=FEATURES, initial_train=None,
+                          step=DEFAULT_STEP, train_window=None) -> pd.DataFrame:
+    """
+    Walk-forward backtest of the next-close linear model on one ticker.
+
+    The model is fitted on the first ``initial_train`` rows, predicts the next ``step``
+    rows, then absorbs them and refits, until the data runs out. With
+    ``train_window`` set, only the most recent ``train_window`` rows are kept
+    (rolling window); otherwise the window expands.
+
+    A simple strategy is scored alongside: hold the stock over a bar when the model
+    predicts the next close above the current close, stay flat otherwise.
+
+    :param df: DataFrame from ``add_technical_indicators`` (not modified).
+    :param features: Feature columns.
+    :param initial_train: Rows in the first training window; defaults to 60%.
+    :param step: Rows predicted per window before refitting.
+    :param train_window: Optional rolling training-window length.
+    :return: DataFrame with one row per window: start, end, train_rows, test_rows, mse,
+             mae, strategy_return and buy_hold_return.
+    """
+    for feature in features:
+        if feature not in df.columns:
+            raise ValueError(f"Feature '{feature}' not found in DataFrame.")
+
+    close = df['close'].to_numpy(dtype='float64')
+    X = df[features].to_numpy(dtype='float64')[:-1]
+    y = close[1:]
+    current = close[:-1]
+    dates = df.index[:-1]
+
+    if initial_train is None:
+        initial_train = int(len(X) * DEFAULT_INITIAL_FRACTION)
+    if initial_train <= len(features) or initial_train >= len(X):
+        raise ValueError(f'Not enough rows ({len(X)}) for an initial training window of {initial_train}.')
+
+    model = IncrementalOLS(len(features))
+    model.add(X[:initial_train], y[:initial_train])
+    window_start = 0
+
+    results = []
+    for start in range(initial_train, len(X), step):
+        end = min(start + step, len(X))
+        if train_window is not None and start - window_start > train_window:
+            drop = start - train_window
+            model.remove(X[window_start:drop], y[window_start:drop])
+            window_start = drop
+        model.fit()
+
+        predicted = model.predict(X[start:end])
+        actual = y[start:end]
+        errors = predicted - actual
+        position = (predicted > current[start:end]).astype('float64')
+        bar_returns = actual / current[start:end] - 1
+        results.append({
+            'start': dates[start],
+            'end': dates[end - 1],
+            'train_rows': model.n,
+            'test_rows': end - start,
+            'mse': float(np.mean(errors ** 2)),
+            'mae': float(np.mean(np.abs(errors))),
+            'strategy_return': float(np.prod(1 + position * bar_returns) - 1),
+            'buy_hold_return': float(np.prod(1 + bar_returns) - 1),
+        })
+
+        # Absorb the window we just predicted before the next refit
+        model.add(X[start:end], y[start:end])
+
+    return pd.DataFrame(results)
+
+
+def summarize_backtest(windows: pd.DataFrame) -> dict:
+    """
+    Aggregates per-window results into overall error and compounded returns.
+    """
+    rows = windows['test_rows']
+    return {
+        'windows': len(windows),
+        'mse': float(np.average(windows['mse'], weights=rows)),
+        'mae': float(np.average(windows['mae'], weights=rows)),
+        'strategy_return': float(np.prod(1 + windows['strategy_return']) - 1),
+        'buy_hold_return': float(np.prod(1 + windows['buy_hold_return']) - 1),
+    }
+
+
+def _backtest_ticker(ticker, data_dir, backend, step, train_window):
+    # Runs in a worker process: load, process and backtest one ticker
+    from src.data_storage.store import get_store
+    from src.data_processing.pipeline import load_processed_data
+
+    df = load_processed_data(get_store(data_dir, backend), ticker)
+    if df is None:
+        raise FileNotFoundError(f'No stored data for {ticker}')
+    return walk_forward_backtest(df, step=step, train_window=train_window)
+
+
+def backtest_universe(tickers, data_dir=None, backend=None, step=DEFAULT_STEP, train_window=None,
+                      workers=None):
+    """
+    Backtests many tickers in parallel on a process pool.
+
+    :return: Tuple ``(summary, windows, errors)``: a per-ticker summary DataFrame, a
+             dict of per-window DataFrames and a dict of per-ticker error messages.
+    """
+    from src.data_storage.store import DATA_DIR, default_backend
+
+    data_dir = data_dir or DATA_DIR
+    backend = backend or default_backend()
+
+    windows = {}
+    errors = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_backtest_ticker, ticker, data_dir, backend, step, train_window): ticker
+                   for ticker in dict.fromkeys(tickers)}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                windows[ticker] = future.result()
+                logging.info(f'Backtested {ticker}: {len(windows[ticker])} windows')
+            except Exception as e:
+                errors[ticker] = str(e)
+                logging.error(f'Backtest failed for {ticker}: {e}')
+
+    summary = pd.DataFrame.from_dict(
+        {ticker: summarize_backtest(result) for ticker, result in windows.items() if len(result)},
+        orient='index')
+    return summary, windows, errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the next-close model.')
+    parser.add_argument('--tickers', nargs='+', default=['AAPL', 'MSFT', 'GOOG'],
+                        help='Tickers to backtest (must have stored data).')
+    parser.add_argument('--step', type=int, default=DEFAULT_STEP, help='Bars predicted per window.')
+    parser.add_argument('--train_window', type=int, default=None,
+                        help='Rolling training window in bars (default: expanding).')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes.')
+    parser.add_argument('--output', default=None, help='Optional CSV file for the summary.')
+    args = parser.parse_args()
+
+    summary, _, errors = backtest_universe(args.tickers, step=args.step,
+                                           train_window=args.train_window, workers=args.workers)
+    print(summary)
+    if args.output:
+        summary.to_csv(args.output, index_label='ticker')
@@ -0,0 +1,257 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.modeling.train_model import FEATURES, train_model
+
+# Directory holding the serialized models
+MODEL_DIR = 'models'
+
+# Fitted models kept in memory
+DEFAULT_MAX_MODELS = 256
+
+
+def feature_set_id(features) -> str:
+    """
+    Returns a short stable identifier for an ordered list of feature names.
+    """
+    return hashlib.sha1('|'.join(features).encode()).hexdigest()[:12]
+
+
+class LinearModelArtifact:
+    """
+    Parameters of a fitted linear model: enough to predict with one dot product.
+    """
+
+    def __init__(self, ticker, features, coef, intercept, watermark, mse=None, trained_at=None):
+        self.ticker = ticker
+        self.features = list(features)
+        self.coef = np.asarray(coef, dtype='float64')
+        self.intercept = float(intercept)
+        self.watermark = watermark
+        self.mse = mse
+        self.trained_at = trained_at or datetime.now().isoformat(timespec='seconds')
+
+    def predict(self, X) -> np.ndarray:
+        return np.asarray(X, dtype='float64') @ self.coef + self.intercept
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f'{path}.tmp.npz'
+        np.savez(tmp_path, ticker=self.ticker, features=np.array(self.features), coef=self.coef,
+                 intercept=self.intercept, watermark=self.watermark,
+                 mse=np.nan if self.mse is None else self.mse, trained_at=self.trained_at)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'LinearModelArtifact':
+        with np.load(path, allow_pickle=False) as data:
+            mse = float(data['mse'])
+            return cls(str(data['ticker']), [str(name) for name in data['features']], data['coef'],
+                       float(data['intercept']), str(data['watermark']),
+                       None if np.isnan(mse) else mse, str(data['trained_at']))
+
+
+class ModelRegistry:
+    """
+    Stores fitted models keyed by ticker, feature set and data watermark.
+
+    A model is only trained when no artifact exists for the ticker's current
+    watermark (the date of its last stored bar) and feature set; otherwise the
+    serialized artifact is loaded. Loaded models are kept in an in-memory LRU.
+
+    ``prepare`` trains missing models on a background thread (one training per model,
+    however many requests ask for it), so request handlers never train inline.
+
+    :param get_data: Callable returning the processed DataFrame for a ticker (or None).
+    :param get_watermark: Callable returning the ticker's data watermark (or None).
+    :param root: Directory for the serialized models.
+    :param max_models: Number of models kept in memory.
+    """
+
+    def __init__(self, get_data, get_watermark, root=MODEL_DIR, max_models=DEFAULT_MAX_MODELS):
+        self.get_data = get_data
+        self.get_watermark = get_watermark
+        self.root = root
+        self.max_models = max_models
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._training = {}  # key -> Future of a background training
+        self._failed = {}    # key -> error message of a failed training
+        self._executor = None
+        self.trained = 0
+        self.loaded = 0
+
+    def path(self, ticker, features, watermark) -> str:
+        return os.path.join(self.root, ticker, f'{feature_set_id(features)}_{watermark}.npz')
+
+    def _remember(self, key, artifact):
+        with self._lock:
+            self._models[key] = artifact
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def train(self, ticker, features=FEATURES, watermark=None) -> LinearModelArtifact:
+        """
+        Trains a model on the ticker's processed data and saves it under ``watermark``.
+        """
+        df = self.get_data(ticker)
+        if df is None or df.empty:
+            raise FileNotFoundError(f'No stored data for {ticker}')
+        watermark = watermark or df.index[-1].strftime('%Y-%m-%d')
+
+        # train_model adds a target column and drops rows, so give it a copy
+        model, X_test, y_test, y_pred = train_model(df[['close'] + list(features)].copy())
+        mse = float(np.mean((np.asarray(y_test) - y_pred) ** 2))
+        artifact = LinearModelArtifact(ticker, features, model.coef_, model.intercept_, watermark, mse)
+        artifact.save(self.path(ticker, features, watermark))
+        self.trained += 1
+        logging.info(f'Trained and saved model for {ticker} at watermark {watermark}')
+        return artifact
+
+    def _is_available(self, key, path) -> bool:
+        with self._lock:
+            if key in self._models or key in self._failed:
+                return True
+        return os.path.exists(path)
+
+    def _train_in_background(self, key, ticker, features, watermark):
+        try:
+            self._remember(key, self.train(ticker, features, watermark))
+        except Exception as e:
+            logging.error(f'Training the model for {ticker} failed: {e}')
+            with self._lock:
+                # Only the failure for the ticker's latest data is worth remembering
+                for failed in [failed for failed in self._failed if failed[:2] == key[:2]]:
+                    del self._failed[failed]
+                self._failed[key] = str(e)
+        finally:
+            with self._lock:
+                self._training.pop(key, None)
+
+    def prepare(self, tickers, features=FEATURES) -> list:
+        """
+        Queues background training for every ticker whose model for its current data
+        does not exist yet.
+
+        :return: Tickers whose model is still being trained.
+        """
+        training = []
+        for ticker in dict.fromkeys(tickers):
+            watermark = self.get_watermark(ticker)
+            if watermark is None:
+                continue
+            key = (ticker, feature_set_id(features), watermark)
+            if self._is_available(key, self.path(ticker, features, watermark)):
+                continue
+            with self._lock:
+                if key not in self._training:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-training')
+                    self._training[key] = self._executor.submit(self._train_in_background, key, ticker,
+                                                                features, watermark)
+            training.append(ticker)
+        return training
+
+    def join(self):
+        """
+        Blocks until every queued background training has finished.
+        """
+        with self._lock:
+            futures = list(self._training.values())
+        wait(futures)
+
+    def get(self, ticker, features=FEATURES) -> LinearModelArtifact:
+        """
+        Returns the model for the ticker's current data, loading or training it if needed.
+        """
+        watermark = self.get_watermark(ticker)
+        if watermark is None:
+            raise FileNotFoundError(f'No stored data for {ticker}')
+        key = (ticker, feature_set_id(features), watermark)
+        with self._lock:
+            artifact = self._models.get(key)
+            if artifact is not None:
+                self._models.move_to_end(key)
+                return artifact
+            # A training that failed for this data is not retried until new data arrives
+            if key in self._failed:
+                raise ValueError(self._failed[key])
+
+        path = self.path(ticker, features, watermark)
+        if os.path.exists(path):
+            artifact = LinearModelArtifact.load(path)
+            self.loaded += 1
+        else:
+            artifact = self.train(ticker, features, watermark)
+        self._remember(key, artifact)
+        return artifact
+
+    def predict(self, tickers, features=FEATURES) -> dict:
+        """
+        Predicts the next close for each ticker from its latest feature row.
+
+        :return: Dict mapping each ticker to ``{'prediction', 'latest_close', 'date',
+                 'watermark'}``, or to ``{'error': message}`` if it cannot be served.
+        """
+        results = {}
+        rows = []
+        artifacts = []
+        served = []
+        for ticker in dict.fromkeys(tickers):
+            try:
+                artifact = self.get(ticker, features)
+                df = self.get_data(ticker)
+                if df is None or df.empty:
+                    raise FileNotFoundError(f'No stored data for {ticker}')
+            except Exception as e:
+                results[ticker] = {'error': str(e)}
+                continue
+            rows.append(df[artifact.features].iloc[-1].to_numpy(dtype='float64'))
+            artifacts.append(artifact)
+            served.append((ticker, df))
+
+        if rows:
+            # One row-wise dot product for the whole batch
+            X = np.vstack(rows)
+            coef = np.vstack([artifact.coef for artifact in artifacts])
+            intercept = np.array([artifact.intercept for artifact in artifacts])
+            predictions = np.einsum('ij,ij->i', X, coef) + intercept
+            for (ticker, df), artifact, prediction in zip(served, artifacts, predictions):
+                results[ticker] = {
+                    'prediction': float(prediction),
+                    'latest_close': float(df['close'].iloc[-1]),
+                    'date': df.index[-1].strftime('%Y-%m-%d'),
+                    'watermark': artifact.watermark,
+                }
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'models_in_memory': len(self._models), 'trained': self.trained, 'loaded': self.loaded,
+                    'training': len(self._training), 'failed': len(self._failed)}
+
+
+def store_watermark(store, watermarks=None):
+    """
+    Returns a ``get_watermark`` callable for ModelRegistry backed by the price store:
+    the recorded watermark if there is one, otherwise the last stored date.
+    """
+    def get_watermark(ticker):
+        if not store.exists(ticker):
+            return None
+        last_date = watermarks.get(ticker) if watermarks is not None else None
+        if last_date is None:
+            last_date = store.last_date(ticker)
+        return None if last_date is None else pd.Timestamp(last_date).strftime('%Y-%m-%d')
+    return get_watermark
@@ -1,9 +1,10 @@
+import logging
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error
 import numpy as np
 
+# Technical indicators used as model features
+FEATURES = ['SMA_50', 'SMA_200', 'EMA_50', 'EMA_200', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist', 'upper_band', 'middle_band', 'lower_band']
+
 def train_model(df: pd.DataFrame):
     """
     Trains a simple linear regression model to predict the next day's adjusted close price.
@@ -11,13 +12,18 @@ def train_model(df: pd.DataFrame):
     :param df: The input DataFrame with features and target.
     :return: The trained model and the test data for evaluation.
     """
+    # scikit-learn takes seconds to import; only load it when a model is trained
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error
+
     # Define features (X) and target (y)
     # We will use the technical indicators to predict the next day's 'Adj Close'
     # We need to shift the 'Adj Close' to get the next day's price as the target
     df['target'] = df['close'].shift(-1)
     df.dropna(inplace=True)
 
-    features = ['SMA_50', 'SMA_200', 'EMA_50', 'EMA_200', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist', 'upper_band', 'middle_band', 'lower_band']
+    features = FEATURES
     
     # Ensure all feature columns are present
     for feature in features:
@@ -39,7 +45,7 @@ def train_model(df: pd.DataFrame):
 
     # Evaluate the model
     mse = mean_squared_error(y_test, y_pred)
-    print(f"Model Mean Squared Error: {mse}")
+    logging.info(f"Model Mean Squared Error: {mse}")
 
     return model, X_test, y_test, y_pred
 
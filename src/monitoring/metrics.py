@@ -0,0 +1,262 @@
+import io
+import os
+import time
+import bisect
+import pstats
+import cProfile
+import threading
+import functools
+from contextlib import nullcontext
+
+# Instrumentation is off unless METRICS_ENABLED is set; while off, every helper
+# below returns after a single flag check
+ENABLED = os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+# Prefix of every exported metric name
+NAMESPACE = 'stockapp'
+
+# Latency histogram bucket upper bounds (seconds)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Help text of the metrics the application records
+METRIC_HELP = {
+    'operation_seconds': 'Latency of instrumented operations.',
+    'http_request_seconds': 'Latency of HTTP requests by endpoint.',
+    'http_requests_total': 'HTTP requests by endpoint and status.',
+    'cache_requests_total': 'Cache lookups by cache and result.',
+    'rows_processed_total': 'Rows processed by pipeline stage.',
+    'download_requests_total': 'Requests sent to the market data provider.',
+    'downloads_total': 'Ticker downloads by result.',
+    'correlation_refresh_total': 'Correlation window refreshes by mode (append or rebuild).',
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class Counter:
+    """
+    Monotonic counter with one value per label set.
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, labels=()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, labels, value
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with one set of buckets, sum and count per label set.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., +Inf count], sum
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels=()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(sorted(labels.items())))
+        return sum(series[0]) if series is not None else 0
+
+    def samples(self):
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket', labels + (('le', le),), cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms, rendered in the Prometheus text format.
+    """
+
+    def __init__(self, namespace: str = NAMESPACE):
+        self.namespace = namespace
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    full_name = f'{self.namespace}_{name}' if self.namespace else name
+                    metric = self._metrics[name] = cls(full_name, METRIC_HELP.get(name, name))
+        return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get(Counter, name)
+
+    def histogram(self, name: str) -> Histogram:
+        return self._get(Histogram, name)
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for _, metric in sorted(self._metrics.items()):
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for sample_name, labels, value in metric.samples():
+                lines.append(f'{sample_name}{_format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+def set_enabled(enabled: bool):
+    """
+    Turns instrumentation on or off at runtime.
+    """
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+def count(name: str, amount: float = 1, **labels):
+    """
+    Adds ``amount`` to the counter ``name`` for the given labels.
+    """
+    if ENABLED:
+        REGISTRY.counter(name).inc(amount, tuple(sorted(labels.items())))
+
+
+def observe(name: str, value: float, **labels):
+    """
+    Records ``value`` in the histogram ``name`` for the given labels.
+    """
+    if ENABLED:
+        REGISTRY.histogram(name).observe(value, tuple(sorted(labels.items())))
+
+
+class _Timer:
+    __slots__ = ('labels', 'started')
+
+    def __init__(self, labels):
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        REGISTRY.histogram('operation_seconds').observe(time.perf_counter() - self.started, self.labels)
+        return False
+
+
+_NULL_TIMER = nullcontext()
+
+
+def timer(operation: str):
+    """
+    Context manager recording the duration of a block in ``operation_seconds``::
+
+        with metrics.timer('plotly_render'):
+            ...
+    """
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer((('operation', operation),))
+
+
+def timed(operation: str = None):
+    """
+    Decorator recording every call's duration in ``operation_seconds``, labelled with
+    ``operation`` (default: the function's name).
+    """
+    def decorate(fn):
+        labels = (('operation', operation or fn.__name__),)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                REGISTRY.histogram('operation_seconds').observe(time.perf_counter() - started, labels)
+        return wrapper
+    return decorate
+
+
+def profile_stats(profiler: cProfile.Profile, sort: str = 'cumulative', limit: int = 50) -> str:
+    """
+    Formats a finished profiler's statistics as text.
+    """
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+if __name__ == '__main__':
+    # Overhead of an instrumented call, disabled and enabled
+    import timeit
+
+    @timed('noop')
+    def noop():
+        pass
+
+    def plain():
+        pass
+
+    calls = 200_000
+    baseline = timeit.timeit(plain, number=calls)
+    set_enabled(False)
+    disabled = timeit.timeit(noop, number=calls)
+    set_enabled(True)
+    enabled = timeit.timeit(noop, number=calls)
+    print(f'plain call:       {baseline / calls * 1e9:8.1f} ns')
+    print(f'timed (disabled): {disabled / calls * 1e9:8.1f} ns')
+    print(f'timed (enabled):  {enabled / calls * 1e9:8.1f} ns')
+    print(REGISTRY.render())
@@ -0,0 +1,369 @@
+import os
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring import metrics
+from src.screening.movers import top_n_indices, universe_version
+
+# Trading days in the rolling window by default (about one year)
+DEFAULT_WINDOW = 252
+
+# Overlapping returns a pair needs before its correlation is reported
+DEFAULT_MIN_PERIODS = 60
+
+# Number of pairs returned per ticker by default
+DEFAULT_TOP_PAIRS = 10
+
+# Tickers per block in the matrix products; bounds the temporaries to
+# BLOCK_SIZE x tickers values instead of tickers x tickers
+BLOCK_SIZE = 512
+
+
+def returns_matrix(closes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aligns daily returns across tickers: ``close / previous close - 1`` on the union
+    of all tickers' dates. A return is NaN where either close is missing, so no
+    ticker is forward-filled across days it did not trade.
+
+    :param closes: Wide (dates x tickers) DataFrame of closes.
+    """
+    return (closes / closes.shift(1) - 1).iloc[1:]
+
+
+def _add_products(out: np.ndarray, left: np.ndarray, right: np.ndarray, block: int):
+    # out += left.T @ right, one block of out's rows at a time
+    for start in range(0, out.shape[0], block):
+        end = min(start + block, out.shape[0])
+        out[start:end] += left[:, start:end].T @ right
+
+
+class RollingCorrelation:
+    """
+    Rolling pairwise correlation and covariance of a (dates x tickers) returns
+    matrix, updated incrementally.
+
+    For every pair ``(i, j)`` it keeps, over the rows of the window where both
+    returns are present, the count, the sums of ``x_i`` and of ``x_i**2`` and the sum
+    of ``x_i * x_j``. Each is a tickers x tickers matrix built from matrix products
+    of the zero-filled returns and their validity mask, so a new row adds (and the
+    row leaving the window subtracts) one outer product instead of recomputing the
+    whole window. Missing returns are handled pairwise, as ``DataFrame.corr`` does.
+
+    The sums are recomputed from the window every ``window`` updated rows so rounding
+    errors from the subtractions do not accumulate. State is four tickers x tickers
+    float64 matrices (about 290 MB for 3,000 tickers) plus the window itself.
+
+    :param tickers: Column labels of the returns.
+    :param window: Rows in the rolling window.
+    :param min_periods: Overlapping returns a pair needs for its statistics.
+    """
+
+    def __init__(self, tickers, window: int = DEFAULT_WINDOW, min_periods: int = DEFAULT_MIN_PERIODS,
+                 block: int = BLOCK_SIZE):
+        self.tickers = list(tickers)
+        self.window = window
+        self.min_periods = max(min_periods, 2)
+        self.block = block
+        self._positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self._values = np.zeros((0, n))
+        self._valid = np.zeros((0, n))
+        self._count = np.zeros((n, n))
+        self._sum = np.zeros((n, n))          # [i, j]: sum of x_i where x_j is present
+        self._sum_squares = np.zeros((n, n))  # [i, j]: sum of x_i**2 where x_j is present
+        self._products = np.zeros((n, n))     # [i, j]: sum of x_i * x_j
+        self._rows_since_rebuild = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def _accumulate(self, values: np.ndarray, valid: np.ndarray, sign: np.ndarray):
+        # Adds rows with sign +1 and removes rows with sign -1, in one product per matrix
+        signed_valid = valid * sign
+        _add_products(self._count, signed_valid, valid, self.block)
+        _add_products(self._sum, values * sign, valid, self.block)
+        _add_products(self._sum_squares, values * values * sign, valid, self.block)
+        _add_products(self._products, values * sign, values, self.block)
+
+    def _rebuild(self):
+        for matrix in (self._count, self._sum, self._sum_squares, self._products):
+            matrix.fill(0.0)
+        self._accumulate(self._values, self._valid, np.ones((len(self._values), 1)))
+        self._rows_since_rebuild = 0
+
+    @metrics.timed('correlation_update')
+    def update(self, returns):
+        """
+        Appends rows of returns (aligned with ``tickers``) and drops the rows that
+        fall out of the window.
+        """
+        returns = np.asarray(returns, dtype='float64').reshape(-1, len(self.tickers))
+        if not len(returns):
+            return
+        valid = ~np.isnan(returns)
+        values = np.where(valid, returns, 0.0)
+        valid = valid.astype('float64')
+
+        values = np.vstack([self._values, values])[-self.window:]
+        valid = np.vstack([self._valid, valid])[-self.window:]
+        added = min(len(returns), self.window)
+        removed = len(self._values) + added - len(values)
+        self._rows_since_rebuild += len(returns)
+        if self._rows_since_rebuild >= self.window:
+            self._values, self._valid = values, valid
+            self._rebuild()
+            return
+        sign = np.concatenate([-np.ones(removed), np.ones(added)])[:, None]
+        self._accumulate(np.vstack([self._values[:removed], values[-added:]]),
+                         np.vstack([self._valid[:removed], valid[-added:]]), sign)
+        self._values, self._valid = values, valid
+
+    def _statistics(self, rows: slice):
+        # Pairwise covariance, correlation and count for a block of rows
+        count = self._count[rows]
+        sum_i, sum_j = self._sum[rows], self._sum[:, rows].T
+        squares_i, squares_j = self._sum_squares[rows], self._sum_squares[:, rows].T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = (self._products[rows] - sum_i * sum_j / count) / (count - 1)
+            variance_i = (squares_i - sum_i * sum_i / count) / (count - 1)
+            variance_j = (squares_j - sum_j * sum_j / count) / (count - 1)
+            correlation = np.clip(covariance / np.sqrt(variance_i * variance_j), -1.0, 1.0)
+        insufficient = count < self.min_periods
+        covariance[insufficient] = np.nan
+        correlation[insufficient] = np.nan
+        return covariance, correlation, count
+
+    def matrices(self):
+        """
+        Returns the (correlation, covariance) matrices as tickers x tickers DataFrames,
+        built one block of rows at a time.
+        """
+        n = len(self.tickers)
+        correlation = np.empty((n, n))
+        covariance = np.empty((n, n))
+        for start in range(0, n, self.block):
+            rows = slice(start, min(start + self.block, n))
+            covariance[rows], correlation[rows], _ = self._statistics(rows)
+        return (pd.DataFrame(correlation, index=self.tickers, columns=self.tickers),
+                pd.DataFrame(covariance, index=self.tickers, columns=self.tickers))
+
+    def top_pairs(self, ticker: str, n: int = DEFAULT_TOP_PAIRS, largest: bool = True) -> list:
+        """
+        Returns the ``n`` tickers most (or, with ``largest=False``, least) correlated
+        with ``ticker``; only that ticker's row of the matrix is computed.
+
+        :return: List of ``{'ticker', 'correlation', 'covariance', 'observations'}``
+                 dicts, best first.
+        """
+        i = self._positions[ticker]
+        covariance, correlation, count = (values[0] for values in self._statistics(slice(i, i + 1)))
+        correlation = correlation.copy()
+        correlation[i] = np.nan
+        return [{'ticker': self.tickers[j], 'correlation': float(correlation[j]),
+                 'covariance': float(covariance[j]), 'observations': int(count[j])}
+                for j in top_n_indices(correlation, n, largest=largest)]
+
+
+class CorrelationService:
+    """
+    Rolling correlations over a universe, read from the price store and kept up to
+    date as bars are appended.
+
+    The first call reads the last ``window + 1`` closes of every ticker. Later calls
+    only read tickers whose source file changed, and only their bars from the start
+    of the window; bars after the last one already included are added to the window
+    as new rows. If the bars already inside the window changed (a backfill or a
+    correction), the window is rebuilt from the store instead.
+
+    The window is updated in place, so refreshes and the statistics read from it
+    run under one lock.
+
+    :param store: PriceStore to read from.
+    :param universe: List of ``(ticker, sector)`` tuples (see ``load_universe``).
+    """
+
+    def __init__(self, store, universe, window: int = DEFAULT_WINDOW, min_periods: int = DEFAULT_MIN_PERIODS):
+        self.store = store
+        self.tickers = [ticker for ticker, _ in universe]
+        self.window = window
+        self.min_periods = min_periods
+        self._rolling = None
+        self._version = None
+        self._sources = {}       # ticker -> (mtime_ns, size) of the source file when last read
+        self._last_dates = {}    # ticker -> date of its last bar included
+        self._last_date = None   # last date of the aligned window
+        self._window_closes = None  # aligned closes of the window (dates x tickers)
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        """
+        Returns a token that changes whenever a universe ticker's source file changes.
+        """
+        return universe_version(self.store, self.tickers)
+
+    def _source(self, ticker):
+        try:
+            stat = os.stat(self.store.source_path(ticker))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _closes(self, ticker, start=None, last=None) -> pd.Series:
+        try:
+            if last is not None:
+                df = self.store.tail(ticker, last, columns=['Close'])
+            else:
+                df = self.store.read(ticker, columns=['Close'], start=start)
+        except FileNotFoundError:
+            return pd.Series(dtype='float64')
+        return df.set_index('Date')['Close']
+
+    def _apply(self, closes: pd.DataFrame):
+        # Remembers the aligned closes of the window: changes are checked against them
+        # and the next returns are computed from the last row
+        self._window_closes = closes.iloc[-(self.window + 1):]
+        self._last_date = closes.index[-1]
+        for ticker in self.tickers:
+            series = closes[ticker].dropna()
+            if len(series):
+                self._last_dates[ticker] = series.index[-1]
+
+    def _rebuild(self, sources):
+        self._sources = sources
+        self._last_dates = {}
+        series = {ticker: self._closes(ticker, last=self.window + 1) for ticker in self.tickers}
+        closes = pd.DataFrame(series, columns=self.tickers).sort_index()
+        closes = closes.iloc[-(self.window + 1):]
+        self._rolling = RollingCorrelation(self.tickers, self.window, self.min_periods)
+        if len(closes) > 1:
+            self._rolling.update(returns_matrix(closes).to_numpy())
+        if len(closes):
+            self._apply(closes)
+        metrics.count('correlation_refresh_total', mode='rebuild')
+
+    def _extend(self, sources) -> bool:
+        # Adds the bars appended since the last refresh; False if a rebuild is needed
+        if self._last_date is None:
+            return False
+        changed = [ticker for ticker in self.tickers if sources.get(ticker) != self._sources.get(ticker)]
+        window_start = self._window_closes.index[0]
+        new = {}
+        for ticker in changed:
+            since = self._last_dates.get(ticker)
+            if since is None:
+                return False
+            series = self._closes(ticker, start=window_start)
+            known = self._window_closes[ticker].dropna()
+            stored = series[series.index <= since].dropna()
+            # Relative tolerance, as a CSV store's read/write round trip can change the last digit
+            if not (stored.index.equals(known.index)
+                    and np.allclose(stored.to_numpy(), known.to_numpy(), rtol=1e-12, atol=0.0)):
+                return False
+            series = series[series.index > since]
+            if (series.index <= self._last_date).any():
+                return False
+            new[ticker] = series
+        self._sources = sources
+        appended = pd.DataFrame(new, columns=self.tickers).sort_index()
+        if appended.empty:
+            return True
+        # Built from arrays, as pd.concat warns about all-NaN columns
+        closes = pd.DataFrame(np.vstack([self._window_closes.to_numpy(dtype='float64'),
+                                         appended.to_numpy(dtype='float64')]),
+                              index=self._window_closes.index.append(appended.index), columns=self.tickers)
+        self._rolling.update(returns_matrix(closes.iloc[-(len(appended) + 1):]).to_numpy())
+        self._apply(closes)
+        metrics.count('correlation_refresh_total', mode='append')
+        return True
+
+    def _refresh(self) -> str:
+        # Callers hold _lock
+        version = self.version()
+        if version != self._version:
+            sources = {ticker: self._source(ticker) for ticker in self.tickers}
+            if self._rolling is None or not self._extend(sources):
+                self._rebuild(sources)
+            self._version = version
+        return version
+
+    def refresh(self) -> str:
+        """
+        Brings the window up to date with the store.
+
+        :return: The version the window now reflects.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def matrices(self):
+        """
+        Returns the current (correlation, covariance) matrices as DataFrames.
+        """
+        with self._lock:
+            self._refresh()
+            return self._rolling.matrices()
+
+    def top_pairs(self, ticker: str, n: int = DEFAULT_TOP_PAIRS, refresh: bool = True) -> dict:
+        """
+        Returns the tickers most and least correlated with ``ticker`` over the window.
+
+        :param refresh: Whether to bring the window up to date first; pass False to
+                        answer from the version returned by the last ``refresh()``.
+        :return: Dict with 'ticker', 'window', 'as_of' (last date of the window),
+                 'most_correlated' and 'least_correlated' lists of pairs, or None if
+                 ``ticker`` is not in the universe.
+        """
+        if ticker not in self.tickers:
+            return None
+        with self._lock:
+            if refresh or self._rolling is None:
+                self._refresh()
+            return {
+                'ticker': ticker,
+                'window': self.window,
+                'as_of': self._last_date.strftime('%Y-%m-%d') if self._last_date is not None else None,
+                'most_correlated': self._rolling.top_pairs(ticker, n, largest=True),
+                'least_correlated': self._rolling.top_pairs(ticker, n, largest=False),
+            }
+
+
+if __name__ == '__main__':
+    # Compare the incremental matrices with pandas on random returns
+    import time
+
+    parser = argparse.ArgumentParser(description='Check rolling correlations against pandas and time them.')
+    parser.add_argument('--tickers', type=int, default=500, help='Number of tickers.')
+    parser.add_argument('--rows', type=int, default=600, help='Rows of returns.')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='Rolling window.')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    factor = rng.normal(0, 0.01, (args.rows, 1))
+    returns = pd.DataFrame(factor * rng.uniform(0, 1.5, args.tickers) + rng.normal(0, 0.01, (args.rows, args.tickers)),
+                           columns=[f'T{i}' for i in range(args.tickers)])
+    returns = returns.mask(rng.random(returns.shape) < 0.02)
+
+    rolling = RollingCorrelation(returns.columns, args.window)
+    started = time.perf_counter()
+    rolling.update(returns.iloc[:args.window].to_numpy())
+    initial = time.perf_counter() - started
+    started = time.perf_counter()
+    for i in range(args.window, args.rows):
+        rolling.update(returns.iloc[i].to_numpy())
+    per_row = (time.perf_counter() - started) / max(args.rows - args.window, 1)
+
+    started = time.perf_counter()
+    correlation, covariance = rolling.matrices()
+    matrices = time.perf_counter() - started
+    tail = returns.iloc[-args.window:]
+    started = time.perf_counter()
+    expected = tail.corr(min_periods=DEFAULT_MIN_PERIODS)
+    pandas_seconds = time.perf_counter() - started
+    print(f'{args.tickers} tickers, window {args.window}: initial {initial:.3f}s, '
+          f'{per_row * 1000:.2f} ms per appended row, matrices {matrices:.3f}s (pandas corr {pandas_seconds:.3f}s)')
+    print(f'max correlation difference {np.nanmax(np.abs(correlation - expected).to_numpy()):.2e}, '
+          f'max covariance difference '
+          f'{np.nanmax(np.abs(covariance - tail.cov(min_periods=DEFAULT_MIN_PERIODS)).to_numpy()):.2e}')
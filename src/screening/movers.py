@@ -0,0 +1,163 @@
+import os
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Number of gainers and losers returned by default
+DEFAULT_TOP_N = 10
+
+
+def top_n_indices(values: np.ndarray, n: int, largest: bool = True) -> np.ndarray:
+    """
+    Returns the indices of the ``n`` largest (or smallest) values, best first.
+
+    Uses ``np.argpartition`` so only the selected ``n`` values are sorted. NaN values
+    are never selected.
+    """
+    candidates = np.flatnonzero(~np.isnan(values))
+    if n <= 0 or len(candidates) == 0:
+        return np.array([], dtype=int)
+    keys = -values[candidates] if largest else values[candidates]
+    if n < len(candidates):
+        selected = np.argpartition(keys, n - 1)[:n]
+    else:
+        selected = np.arange(len(candidates))
+    return candidates[selected[np.argsort(keys[selected], kind='stable')]]
+
+
+def rank_movers(tickers, previous_close, latest_close, n=DEFAULT_TOP_N, volume=None,
+                sectors=None, min_volume=None, sector_filter=None) -> dict:
+    """
+    Ranks tickers by daily change and selects the top gainers and losers.
+
+    :param tickers: Sequence of tickers.
+    :param previous_close: Array of previous closes, aligned with ``tickers``.
+    :param latest_close: Array of latest closes, aligned with ``tickers``.
+    :param n: Number of gainers and of losers to return.
+    :param volume: Optional array of latest volumes (required for ``min_volume``).
+    :param sectors: Optional sequence of sectors (required for ``sector_filter``).
+    :param min_volume: Optional minimum latest volume.
+    :param sector_filter: Optional collection of sectors to keep.
+    :return: Dict with 'top_gainers' and 'top_losers' lists of
+             ``{'ticker', 'latest_close', 'change_value'}`` dicts.
+    """
+    tickers = np.asarray(tickers, dtype=object)
+    previous_close = np.asarray(previous_close, dtype='float64')
+    latest_close = np.asarray(latest_close, dtype='float64')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (latest_close - previous_close) / previous_close * 100
+    change[~np.isfinite(change)] = np.nan
+
+    if min_volume is not None and volume is not None:
+        change[~(np.asarray(volume, dtype='float64') >= min_volume)] = np.nan
+    if sector_filter and sectors is not None:
+        keep = np.isin(np.asarray(sectors, dtype=object), list(sector_filter))
+        change[~keep] = np.nan
+
+    def rows(indices):
+        return [{'ticker': tickers[i], 'latest_close': float(latest_close[i]),
+                 'change_value': float(change[i])} for i in indices]
+
+    return {
+        'top_gainers': rows(top_n_indices(change, n, largest=True)),
+        'top_losers': rows(top_n_indices(change, n, largest=False)),
+    }
+
+
+def universe_version(store, tickers) -> str:
+    """
+    Returns a token that changes whenever one of the tickers' source files changes.
+    """
+    digest = hashlib.sha1()
+    for ticker in tickers:
+        try:
+            stat = os.stat(store.source_path(ticker))
+        except FileNotFoundError:
+            continue
+        digest.update(f'{ticker}:{stat.st_mtime_ns}:{stat.st_size};'.encode())
+    return digest.hexdigest()
+
+
+class MoversRanker:
+    """
+    Ranks a configurable universe by daily change straight from the price store.
+
+    The last two bars of each ticker are read with ``PriceStore.tail`` and kept in
+    per-ticker cache entries invalidated by the source file's mtime, so a ranking
+    over thousands of tickers re-reads only files that changed and then runs as a
+    handful of array operations.
+
+    :param store: PriceStore to read from.
+    :param universe: List of ``(ticker, sector)`` tuples (see ``load_universe``).
+    """
+
+    def __init__(self, store, universe):
+        self.store = store
+        self.universe = list(universe)
+        self._bars = {}  # ticker -> (mtime, previous close, latest close, volume, date)
+        self._lock = threading.Lock()
+
+    def _latest_bars(self, ticker):
+        path = self.store.source_path(ticker)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        cached = self._bars.get(ticker)
+        if cached is not None and cached[0] == mtime:
+            return cached
+
+        tail = self.store.tail(ticker, 2, columns=['Close', 'Volume'])
+        if len(tail) < 2:
+            return None
+        entry = (mtime, tail['Close'].iloc[0], tail['Close'].iloc[1],
+                 tail['Volume'].iloc[1], tail['Date'].iloc[1])
+        with self._lock:
+            self._bars[ticker] = entry
+        return entry
+
+    def version(self) -> str:
+        """
+        Returns a token that changes whenever a universe ticker's source file changes.
+        """
+        return universe_version(self.store, [ticker for ticker, _ in self.universe])
+
+    def latest_bars(self) -> pd.DataFrame:
+        """
+        Returns the previous close, latest close, latest volume, date and sector of
+        every ticker in the universe that has at least two stored bars.
+        """
+        records = []
+        for ticker, sector in self.universe:
+            entry = self._latest_bars(ticker)
+            if entry is not None:
+                records.append((ticker, sector) + entry[1:])
+        return pd.DataFrame(records, columns=['ticker', 'sector', 'previous_close',
+                                              'latest_close', 'volume', 'date'])
+
+    def rank(self, n=DEFAULT_TOP_N, min_volume=None, sectors=None) -> dict:
+        """
+        Returns the top ``n`` gainers and losers, optionally filtered by minimum
+        volume and sector, plus the latest bar date and the number of ranked tickers.
+
+        Moves are only ranked as of the universe's latest bar date: tickers whose last
+        bar is older (stale, delisted or not yet updated) are listed under 'stale'
+        with their ``last_date`` instead of being ranked.
+        """
+        bars = self.latest_bars()
+        latest = bars['date'].max() if len(bars) else None
+        is_stale = bars['date'] < latest if latest is not None else np.zeros(0, dtype=bool)
+        stale = bars[is_stale]
+        bars = bars[~is_stale]
+        result = rank_movers(bars['ticker'].to_numpy(), bars['previous_close'].to_numpy(),
+                             bars['latest_close'].to_numpy(), n=n,
+                             volume=bars['volume'].to_numpy(), sectors=bars['sector'].to_numpy(),
+                             min_volume=min_volume, sector_filter=sectors)
+        result['latest_date'] = latest.strftime('%Y-%m-%d') if latest is not None else None
+        result['universe_size'] = len(bars)
+        result['stale'] = [{'ticker': ticker, 'last_date': date.strftime('%Y-%m-%d')}
+                           for ticker, date in zip(stale['ticker'], stale['date'])]
+        return result
@@ -0,0 +1,215 @@
+import os
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.technical_analysis.streaming import INDICATOR_COLUMNS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Rows read and written per chunk by default
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Closes carried into the next chunk: enough for the longest rolling window (SMA 200)
+# and for RSI's 14 deltas
+OVERLAP_ROWS = 200
+
+# EMA spans carried across chunks
+EMA_SPANS = {'EMA_50': 50, 'EMA_200': 200, 'ema_12': 12, 'ema_26': 26}
+
+
+def _seeded_ewm(values: pd.Series, span: int, previous) -> pd.Series:
+    # ewm(adjust=False) restarted from the previous chunk's last value: prepending it
+    # makes pandas run exactly the recurrence it would have run over the whole series
+    if previous is None:
+        return values.ewm(span=span, adjust=False).mean()
+    seeded = pd.concat([pd.Series([previous]), values.reset_index(drop=True)], ignore_index=True)
+    return pd.Series(seeded.ewm(span=span, adjust=False).mean().to_numpy()[1:], index=values.index)
+
+
+class ChunkedIndicators:
+    """
+    Runs ``preprocess_data`` and ``add_technical_indicators`` over a history that
+    arrives in date-ordered chunks, carrying their state across chunk boundaries:
+
+    - the last row, for forward-filling, and the last close, for the daily return;
+    - the last ``OVERLAP_ROWS`` closes, which are prepended to the next chunk so the
+      rolling means, RSI and Bollinger bands see their full windows;
+    - the last value of every EMA, which seeds the EMA of the next chunk.
+
+    Memory is bounded by the chunk size plus the overlap, and the processed rows
+    match the in-memory path (up to floating-point rounding in the rolling sums).
+    """
+
+    def __init__(self):
+        self._last_row = None
+        self._previous_close = None
+        self._overlap = pd.Series(dtype='float64')
+        self._ema = {}
+        self._macd_signal = None
+        self.rows_in = 0
+        self.rows_out = 0
+
+    def _preprocess(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        # Same steps as preprocess_data, continued from the previous chunk
+        chunk = chunk.copy()
+        chunk.columns = [col.lower() for col in chunk.columns]
+        if not isinstance(chunk.index, pd.DatetimeIndex):
+            chunk['date'] = pd.to_datetime(chunk['date'])
+            chunk.set_index('date', inplace=True)
+        if self._last_row is not None:
+            chunk = pd.concat([self._last_row, chunk]).ffill().iloc[1:]
+        else:
+            chunk = chunk.ffill()
+        if len(chunk):
+            self._last_row = chunk.iloc[-1:]
+        chunk = chunk.dropna()
+
+        close = chunk['close']
+        previous = close.shift(1)
+        if self._previous_close is not None and len(close):
+            previous.iloc[0] = self._previous_close
+        chunk['daily_return'] = close / previous - 1
+        if len(close):
+            self._previous_close = close.iloc[-1]
+        # The very first row has no daily return and is dropped, as in preprocess_data
+        return chunk.dropna()
+
+    def _indicators(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        close = chunk['close']
+        n = len(close)
+        # The first chunk has no carried closes (and pd.concat warns about empty entries)
+        combined = close if self._overlap.empty else pd.concat([self._overlap, close])
+
+        # Rolling windows over the carried closes plus this chunk; keep this chunk's rows
+        sma_50 = combined.rolling(window=50).mean().iloc[-n:]
+        sma_200 = combined.rolling(window=200).mean().iloc[-n:]
+        delta = combined.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        rsi = (100 - (100 / (1 + gain / loss))).iloc[-n:]
+        middle_band = combined.rolling(window=20).mean().iloc[-n:]
+        std_dev = combined.rolling(window=20).std().iloc[-n:]
+
+        # EMAs continue from their last values
+        ema = {name: _seeded_ewm(close, span, self._ema.get(name)) for name, span in EMA_SPANS.items()}
+        macd = ema['ema_12'] - ema['ema_26']
+        macd_signal = _seeded_ewm(macd, 9, self._macd_signal)
+
+        chunk['SMA_50'] = sma_50.to_numpy()
+        chunk['SMA_200'] = sma_200.to_numpy()
+        chunk['EMA_50'] = ema['EMA_50']
+        chunk['EMA_200'] = ema['EMA_200']
+        chunk['RSI'] = rsi.to_numpy()
+        chunk['MACD'] = macd
+        chunk['MACD_signal'] = macd_signal
+        chunk['MACD_hist'] = macd - macd_signal
+        chunk['middle_band'] = middle_band.to_numpy()
+        chunk['upper_band'] = chunk['middle_band'] + (std_dev.to_numpy() * 2)
+        chunk['lower_band'] = chunk['middle_band'] - (std_dev.to_numpy() * 2)
+
+        self._overlap = combined.iloc[-OVERLAP_ROWS:]
+        self._ema = {name: series.iloc[-1] for name, series in ema.items()}
+        self._macd_signal = macd_signal.iloc[-1]
+        return chunk
+
+    def process(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Processes the next chunk of raw bars (store layout, with a ``Date`` column).
+
+        :return: The chunk's processed rows, in the layout of the in-memory path; may be
+                 empty while the indicators warm up.
+        """
+        self.rows_in += len(chunk)
+        chunk = self._preprocess(chunk)
+        if chunk.empty:
+            return chunk
+        chunk = self._indicators(chunk).dropna()
+        self.rows_out += len(chunk)
+        return chunk
+
+
+def iter_processed_chunks(store, ticker: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yields a ticker's processed rows chunk by chunk, reading the store incrementally.
+
+    The store returns bars in date order, so the chunks do not need sorting.
+    """
+    processor = ChunkedIndicators()
+    for chunk in store.iter_chunks(ticker, chunk_rows):
+        processed = processor.process(chunk)
+        if not processed.empty:
+            yield processed
+
+
+def write_processed_chunked(store, ticker: str, output_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """
+    Processes a ticker chunk by chunk and writes each chunk to ``output_path`` as soon
+    as it is ready: a Parquet file (one row group per chunk) if the path ends in
+    ``.parquet``, CSV otherwise. The file is written to a temporary path and renamed
+    into place when complete.
+
+    :return: Number of rows written.
+    """
+    directory = os.path.dirname(output_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    tmp_path = f'{output_path}.tmp'
+    parquet = output_path.endswith('.parquet')
+    writer = None
+    rows = 0
+    completed = False
+    try:
+        for chunk in iter_processed_chunks(store, ticker, chunk_rows):
+            if parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(chunk, preserve_index=True)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(tmp_path, mode='a' if rows else 'w', header=not rows, index_label='date')
+            rows += len(chunk)
+        completed = True
+    finally:
+        if writer is not None:
+            writer.close()
+        # Do not leave a partial file behind when processing fails
+        if not completed and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    if os.path.exists(tmp_path):
+        os.replace(tmp_path, output_path)
+    return rows
+
+
+if __name__ == '__main__':
+    from src.data_storage.store import get_store
+
+    parser = argparse.ArgumentParser(description='Compute technical indicators for a long history in chunks.')
+    parser.add_argument('ticker', help='Ticker to process.')
+    parser.add_argument('--output', required=True, help='Output file (.parquet or .csv).')
+    parser.add_argument('--chunk_rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Rows per chunk.')
+    parser.add_argument('--verify', action='store_true',
+                        help='Also run the in-memory pipeline and compare (loads the full history).')
+    args = parser.parse_args()
+
+    store = get_store()
+    rows = write_processed_chunked(store, args.ticker, args.output, args.chunk_rows)
+    logging.info(f'Wrote {rows} processed rows for {args.ticker} to {args.output}')
+
+    if args.verify:
+        from src.data_processing.process_data import preprocess_data
+        from src.technical_analysis.indicators import add_technical_indicators
+
+        expected = add_technical_indicators(preprocess_data(store.read(args.ticker)))
+        chunked = pd.concat(iter_processed_chunks(store, args.ticker, args.chunk_rows))
+        same_rows = chunked.index.equals(expected.index)
+        columns = ['close', 'daily_return'] + INDICATOR_COLUMNS
+        scale = np.maximum(expected[columns].abs(), 1.0)
+        max_error = ((chunked[columns] - expected[columns]).abs() / scale).max().max() if same_rows else np.nan
+        logging.info(f'Same rows as the in-memory path: {same_rows}; max relative difference {max_error:.2e}')
@@ -1,5 +1,9 @@
 import pandas as pd
+import numpy as np
 
+from src.monitoring.metrics import timed
+
+@timed()
 def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculates and adds technical indicators to the DataFrame using pandas.
@@ -45,12 +49,12 @@ if __name__ == '__main__':
     # Create a sample dataframe
     data = {
         'date': pd.to_datetime(pd.date_range(start='2022-01-01', periods=300)),
-        'open': pd.np.random.uniform(100, 200, 300),
-        'high': pd.np.random.uniform(100, 200, 300),
-        'low': pd.np.random.uniform(100, 200, 300),
-        'close': pd.np.random.uniform(100, 200, 300),
-        'adj close': pd.np.random.uniform(100, 200, 300),
-        'volume': pd.np.random.randint(1000, 5000, 300)
+        'open': np.random.uniform(100, 200, 300),
+        'high': np.random.uniform(100, 200, 300),
+        'low': np.random.uniform(100, 200, 300),
+        'close': np.random.uniform(100, 200, 300),
+        'adj close': np.random.uniform(100, 200, 300),
+        'volume': np.random.randint(1000, 5000, 300)
     }
     df = pd.DataFrame(data)
     df.set_index('date', inplace=True)
@@ -0,0 +1,247 @@
+import numpy as np
+import pandas as pd
+
+from src.technical_analysis.streaming import INDICATOR_COLUMNS
+
+
+def _first_valid(values: np.ndarray) -> np.ndarray:
+    """
+    Returns, per column, the first non-NaN value (NaN for empty columns).
+    """
+    valid = ~np.isnan(values)
+    first_row = np.argmax(valid, axis=0)
+    first = values[first_row, np.arange(values.shape[1])]
+    first[~valid.any(axis=0)] = np.nan
+    return first
+
+
+def _window_sums(cumulative: np.ndarray, window: int) -> np.ndarray:
+    # Differences of cumulative sums give the sum over each full window
+    sums = cumulative[window - 1:].copy()
+    sums[1:] -= cumulative[:-window]
+    return sums
+
+
+def _rolling_sums(values: np.ndarray, window: int, squares: bool = False):
+    """
+    Returns (center, window sums, window sums of squares, complete-window mask) for
+    every row from ``window - 1`` on. Columns are centered on their first value
+    before summing to limit cancellation.
+    """
+    center = np.nan_to_num(_first_valid(values))
+    centered = values - center
+    nan = np.isnan(centered)
+    has_nan = nan.any()
+    if has_nan:
+        centered[nan] = 0.0
+
+    sums = _window_sums(np.cumsum(centered, axis=0), window)
+    square_sums = None
+    if squares:
+        np.multiply(centered, centered, out=centered)
+        square_sums = _window_sums(np.cumsum(centered, axis=0), window)
+    complete = None
+    if has_nan:
+        complete = _window_sums(np.cumsum(~nan, axis=0, dtype=np.int32), window) == window
+    return center, sums, square_sums, complete
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Column-wise rolling mean of a (dates x tickers) array via cumulative sums.
+
+    A window containing NaN yields NaN, as ``Series.rolling(window).mean()`` does.
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    center, sums, _, complete = _rolling_sums(values, window)
+    means = out[window - 1:]
+    np.divide(sums, window, out=means)
+    means += center
+    if complete is not None:
+        means[~complete] = np.nan
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Column-wise rolling sample standard deviation (ddof=1) via cumulative sums of the
+    centered values and their squares.
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    _, sums, square_sums, complete = _rolling_sums(values, window, squares=True)
+    std = out[window - 1:]
+    np.multiply(sums, sums, out=sums)
+    sums /= window
+    np.subtract(square_sums, sums, out=std)
+    std /= window - 1
+    np.maximum(std, 0.0, out=std)
+    np.sqrt(std, out=std)
+    if complete is not None:
+        std[~complete] = np.nan
+    return out
+
+
+def ewm_mean(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Column-wise EMA with ``alpha = 2 / (span + 1)``, matching
+    ``ewm(span=span, adjust=False).mean()`` for columns whose only NaNs are leading.
+
+    The recurrence runs once over the dates, updating every ticker per step.
+    """
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty(values.shape)
+    if len(values) == 0:
+        return out
+
+    # Each ticker's EMA starts at its first value; earlier rows stay NaN
+    valid = ~np.isnan(values)
+    starts = np.where(valid.any(axis=0), np.argmax(valid, axis=0), len(values))
+    starts_at = {}
+    for column, start in enumerate(starts):
+        starts_at.setdefault(int(start), []).append(column)
+
+    previous = np.full(values.shape[1], np.nan)
+    for t in range(len(values)):
+        np.multiply(previous, 1.0 - alpha, out=previous)
+        previous += alpha * values[t]
+        if t in starts_at:
+            columns = starts_at[t]
+            previous[columns] = values[t, columns]
+        out[t] = previous
+    return out
+
+
+class PanelIndicators:
+    """
+    Technical indicators for many tickers, stored as (dates x tickers) arrays.
+
+    Index a result by indicator name to get a wide DataFrame, or call ``ticker`` to get
+    one ticker's frame in the layout ``add_technical_indicators`` produces.
+    """
+
+    def __init__(self, dates: pd.DatetimeIndex, tickers: list, close: np.ndarray, values: dict,
+                 last_dates: pd.Series = None):
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.close = close
+        self.values = values
+        self.last_dates = last_dates
+        self._columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        array = self.close if name == 'close' else self.values[name]
+        return pd.DataFrame(array, index=self.dates, columns=self.tickers)
+
+    def ticker(self, ticker: str, dropna: bool = True) -> pd.DataFrame:
+        """
+        Returns one ticker's close and indicators; by default without warm-up rows.
+        """
+        i = self._columns[ticker]
+        data = {'close': self.close[:, i]}
+        data.update({name: self.values[name][:, i] for name in INDICATOR_COLUMNS})
+        df = pd.DataFrame(data, index=self.dates)
+        df = df[~np.isnan(self.close[:, i])]
+        return df.dropna() if dropna else df
+
+    def latest(self) -> pd.DataFrame:
+        """
+        Returns the last row of every indicator as a (tickers x indicators) DataFrame.
+
+        Tickers without a bar on the panel's last date (delisted or stale) have NaN
+        values there, so old values are never reported as current; their
+        ``last_date`` column tells when they last traded.
+        """
+        data = {'close': self.close[-1]}
+        data.update({name: self.values[name][-1] for name in INDICATOR_COLUMNS})
+        latest = pd.DataFrame(data, index=self.tickers)
+        if self.last_dates is not None:
+            latest['last_date'] = self.last_dates.reindex(self.tickers).to_numpy()
+        return latest
+
+
+def compute_panel_indicators(closes: pd.DataFrame) -> PanelIndicators:
+    """
+    Computes every indicator of ``add_technical_indicators`` for all tickers at once.
+
+    :param closes: Wide DataFrame of close prices (dates x tickers). Tickers may start
+                   and end at different dates; gaps between a ticker's first and last
+                   price are forward-filled, as ``preprocess_data`` does. Dates after
+                   its last price stay NaN rather than repeating it.
+    :return: A PanelIndicators result.
+    """
+    closes = closes.sort_index()
+    last_dates = closes.apply(pd.Series.last_valid_index)
+    # True up to each ticker's last price; later rows are not forward-filled
+    traded = closes.notna()[::-1].cummax()[::-1]
+    closes = closes.ffill().where(traded)
+    close = closes.to_numpy(dtype='float64')
+
+    values = {}
+    values['SMA_50'] = rolling_mean(close, 50)
+    values['SMA_200'] = rolling_mean(close, 200)
+    values['EMA_50'] = ewm_mean(close, 50)
+    values['EMA_200'] = ewm_mean(close, 200)
+
+    # RSI: the first move of each ticker counts as zero, as diff() + where() do per ticker
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    started = ~np.isnan(close)
+    gain = np.where(started, np.where(delta > 0, delta, 0.0), np.nan)
+    loss = np.where(started, np.where(delta < 0, -delta, 0.0), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = rolling_mean(gain, 14) / rolling_mean(loss, 14)
+        values['RSI'] = 100 - (100 / (1 + rs))
+
+    ema_12 = ewm_mean(close, 12)
+    ema_26 = ewm_mean(close, 26)
+    values['MACD'] = ema_12 - ema_26
+    values['MACD_signal'] = ewm_mean(values['MACD'], 9)
+    values['MACD_hist'] = values['MACD'] - values['MACD_signal']
+
+    values['middle_band'] = rolling_mean(close, 20)
+    std_dev = rolling_std(close, 20)
+    values['upper_band'] = values['middle_band'] + (std_dev * 2)
+    values['lower_band'] = values['middle_band'] - (std_dev * 2)
+
+    return PanelIndicators(closes.index, closes.columns, close, values, last_dates)
+
+
+def load_close_panel(store, tickers, start=None, end=None) -> pd.DataFrame:
+    """
+    Reads the close prices of ``tickers`` from a price store into a wide DataFrame.
+
+    Only the ``Close`` column is read; tickers without stored data are skipped.
+    """
+    series = {}
+    for ticker in tickers:
+        try:
+            df = store.read(ticker, columns=['Close'], start=start, end=end)
+        except FileNotFoundError:
+            continue
+        series[ticker] = df.set_index('Date')['Close']
+    if not series:
+        return pd.DataFrame()
+    return pd.DataFrame(series).sort_index()
+
+
+if __name__ == '__main__':
+    # Compare the panel against the per-ticker pandas pipeline
+    from src.technical_analysis.indicators import add_technical_indicators
+
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='2020-01-01', periods=1000, freq='B')
+    closes = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), 50)), axis=0)),
+                          index=dates, columns=[f'T{i}' for i in range(50)])
+    closes.iloc[:300, 0] = np.nan  # a ticker that listed later
+
+    panel = compute_panel_indicators(closes)
+    for ticker in ['T0', 'T1']:
+        expected = add_technical_indicators(pd.DataFrame({'close': closes[ticker].dropna()}))
+        result = panel.ticker(ticker)
+        max_error = (result[INDICATOR_COLUMNS] - expected[INDICATOR_COLUMNS]).abs().max().max()
+        print(f"{ticker}: {len(result)} rows, max absolute difference {max_error:.3e}")
+    print(panel.latest().head())
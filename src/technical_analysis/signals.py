@@ -0,0 +1,256 @@
+import os
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Signal name -> (series, reference, direction, label). A signal fires on the bar
+# where ``series - reference`` changes sign in the given direction.
+SIGNAL_RULES = {
+    'golden_cross': ('SMA_50', 'SMA_200', 'up', 'BUY (Golden Cross)'),
+    'death_cross': ('SMA_50', 'SMA_200', 'down', 'SELL (Death Cross)'),
+    'rsi_overbought': ('RSI', 70.0, 'up', 'RSI above 70 (Overbought)'),
+    'rsi_oversold': ('RSI', 30.0, 'down', 'RSI below 30 (Oversold)'),
+    'macd_bullish': ('MACD', 'MACD_signal', 'up', 'MACD crossed above signal'),
+    'macd_bearish': ('MACD', 'MACD_signal', 'down', 'MACD crossed below signal'),
+    'bollinger_upper_break': ('close', 'upper_band', 'up', 'Close above upper Bollinger band'),
+    'bollinger_lower_break': ('close', 'lower_band', 'down', 'Close below lower Bollinger band'),
+}
+
+EVENT_COLUMNS = ['date', 'ticker', 'signal', 'close']
+
+# Index files (inside the data directory)
+SIGNAL_INDEX_FILE = '_signals.csv'
+
+
+def _file_version(path: str):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@contextmanager
+def _file_lock(path: str):
+    # Exclusive lock held across processes (the web app and update_data.py)
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _empty_events() -> pd.DataFrame:
+    return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'ticker': pd.Series(dtype=object),
+                         'signal': pd.Series(dtype=object), 'close': pd.Series(dtype='float64')})
+
+
+def scan_signals(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """
+    Finds every signal event in a processed DataFrame's full history.
+
+    Crossings are detected with vectorized sign changes: an upward signal fires on a
+    bar where ``series > reference`` after a bar where ``series <= reference`` (the
+    comparison the Recommendations page has always used), and vice versa for
+    downward signals.
+
+    :param df: DataFrame from ``add_technical_indicators`` (DatetimeIndex).
+    :param ticker: Ticker recorded on the events.
+    :return: DataFrame with columns date, ticker, signal and close, sorted by date.
+    """
+    events = []
+    for signal, (column, reference, direction, _) in SIGNAL_RULES.items():
+        if column not in df.columns or (isinstance(reference, str) and reference not in df.columns):
+            continue
+        values = df[column].to_numpy(dtype='float64')
+        reference_values = df[reference].to_numpy(dtype='float64') if isinstance(reference, str) else reference
+        diff = values - reference_values
+        previous, current = diff[:-1], diff[1:]
+        if direction == 'up':
+            fired = (current > 0) & (previous <= 0)
+        else:
+            fired = (current < 0) & (previous >= 0)
+        rows = np.flatnonzero(fired) + 1
+        if len(rows):
+            events.append(pd.DataFrame({
+                'date': df.index[rows],
+                'ticker': ticker,
+                'signal': signal,
+                'close': df['close'].to_numpy()[rows],
+            }))
+    if not events:
+        return _empty_events()
+    return pd.concat(events, ignore_index=True).sort_values(['date', 'signal'], ignore_index=True)
+
+
+class SignalIndex:
+    """
+    Persistent index of signal events by date and ticker.
+
+    ``update`` rescans a ticker only when its latest bar differs from the one it was
+    last scanned at, so unchanged histories are never rescanned. Events are stored in
+    a CSV file with a JSON sidecar recording the last scanned bar per ticker; without
+    a path the index lives in memory only.
+
+    Several processes may share the files (the web app and ``update_data.py``). The
+    index reloads them when they change on disk, and ``save`` merges under a file
+    lock: for every ticker, the events scanned at the later bar win, so a process
+    never writes back another process's tickers from a stale copy.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._changed = set()  # tickers rescanned here since the files were last synced
+        self._loaded_version = None
+        self.events = _empty_events()
+        self.scanned = {}
+        if path is None:
+            # In-memory index
+            self._scanned_path = None
+            return
+        self._scanned_path = f'{os.path.splitext(path)[0]}_scanned.json'
+        with self._lock:
+            self._sync()
+
+    def _files_version(self):
+        return (_file_version(self.path), _file_version(self._scanned_path))
+
+    def _sync(self):
+        # Merges the files into memory if another process changed them (caller holds _lock)
+        if self.path is None:
+            return
+        version = self._files_version()
+        if version == self._loaded_version:
+            return
+        try:
+            events = pd.read_csv(self.path, parse_dates=['date'])
+            with open(self._scanned_path) as f:
+                scanned = json.load(f)
+        except FileNotFoundError:
+            events, scanned = _empty_events(), {}
+        except ValueError:
+            # Unreadable index; keep what is in memory
+            self._loaded_version = version
+            return
+
+        # Local rescans win only if they are at least as recent as the file's
+        keep = {ticker for ticker in self._changed if self.scanned[ticker] >= scanned.get(ticker, '')}
+        frames = [frame for frame in (events[~events['ticker'].isin(keep)],
+                                      self.events[self.events['ticker'].isin(keep)]) if not frame.empty]
+        self.events = pd.concat(frames, ignore_index=True) if frames else _empty_events()
+        scanned.update({ticker: self.scanned[ticker] for ticker in keep})
+        self.scanned = scanned
+        self._changed = keep
+        self._loaded_version = version
+
+    def update(self, ticker: str, df: pd.DataFrame) -> bool:
+        """
+        Rescans ``ticker`` if its data has a new latest bar.
+
+        :return: True if the ticker's events were replaced.
+        """
+        if df is None or df.empty:
+            return False
+        last_bar = df.index[-1].strftime('%Y-%m-%d')
+        with self._lock:
+            self._sync()
+            # Also skips data older than what another process already indexed
+            if self.scanned.get(ticker, '') >= last_bar:
+                return False
+        ticker_events = scan_signals(df, ticker)
+        with self._lock:
+            others = self.events[self.events['ticker'] != ticker]
+            frames = [frame for frame in (others, ticker_events) if not frame.empty]
+            self.events = (pd.concat(frames, ignore_index=True) if frames
+                           else _empty_events())
+            self.scanned[ticker] = last_bar
+            self._changed.add(ticker)
+        return True
+
+    def version(self) -> str:
+        """
+        Returns a token that changes whenever any ticker is rescanned, here or by
+        another process sharing the index files.
+        """
+        with self._lock:
+            self._sync()
+            scanned = sorted(self.scanned.items())
+        return hashlib.sha1(json.dumps(scanned, separators=(',', ':')).encode()).hexdigest()
+
+    def rebuild(self, tickers, get_data):
+        """
+        Updates every ticker in ``tickers`` and saves the index.
+        """
+        for ticker in tickers:
+            self.update(ticker, get_data(ticker))
+        self.save()
+
+    def save(self):
+        """
+        Writes the tickers rescanned since the last save to disk, merged with the
+        current files under an exclusive lock.
+        """
+        with self._lock:
+            if not self._changed or self.path is None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with _file_lock(f'{self.path}.lock'):
+                self._sync()
+                if not self._changed:
+                    return
+                # Temporary names are per process, so concurrent writers never share one
+                suffix = f'{os.getpid()}.tmp'
+                events = self.events.sort_values(['date', 'ticker', 'signal'], ignore_index=True)
+                events.to_csv(f'{self.path}.{suffix}', index=False, date_format='%Y-%m-%d')
+                with open(f'{self._scanned_path}.{suffix}', 'w') as f:
+                    json.dump(self.scanned, f, indent=2, sort_keys=True)
+                os.replace(f'{self.path}.{suffix}', self.path)
+                os.replace(f'{self._scanned_path}.{suffix}', self._scanned_path)
+                self._loaded_version = self._files_version()
+                self._changed = set()
+
+    def query(self, days: int = None, tickers=None, signals=None, on_date=None) -> pd.DataFrame:
+        """
+        Returns indexed events, newest first.
+
+        :param days: Only events within this many calendar days of the latest indexed date.
+        :param tickers: Optional collection of tickers to keep.
+        :param signals: Optional collection of signal names to keep.
+        :param on_date: Only events on this date.
+        """
+        with self._lock:
+            self._sync()
+            indexed = self.events
+        events = indexed
+        if tickers is not None:
+            events = events[events['ticker'].isin(list(tickers))]
+        if signals is not None:
+            events = events[events['signal'].isin(list(signals))]
+        if on_date is not None:
+            events = events[events['date'] == pd.Timestamp(on_date)]
+        if days is not None and not indexed.empty:
+            cutoff = indexed['date'].max() - pd.Timedelta(days=days)
+            events = events[events['date'] > cutoff]
+        return events.sort_values(['date', 'ticker'], ascending=[False, True], ignore_index=True)
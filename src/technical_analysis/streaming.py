@@ -0,0 +1,224 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Indicator columns in the order add_technical_indicators creates them
+INDICATOR_COLUMNS = ['SMA_50', 'SMA_200', 'EMA_50', 'EMA_200', 'RSI', 'MACD', 'MACD_signal',
+                     'MACD_hist', 'middle_band', 'upper_band', 'lower_band']
+
+
+class RollingMean:
+    """
+    Mean over the last ``window`` values, updated in O(1) with a compensated running sum.
+
+    Matches ``Series.rolling(window).mean()``: NaN until ``window`` values have been seen.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def _add(self, x):
+        # Kahan summation keeps the running sum from drifting over long histories
+        y = x - self._compensation
+        t = self._sum + y
+        self._compensation = (t - self._sum) - y
+        self._sum = t
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        self._add(x)
+        if len(self.values) > self.window:
+            self._add(-self.values.popleft())
+        if len(self.values) < self.window:
+            return math.nan
+        return self._sum / self.window
+
+
+class RollingStd:
+    """
+    Sample standard deviation (ddof=1) over the last ``window`` values.
+
+    Uses Welford's recurrences for adding and removing a value, so each update is
+    O(1) and numerically stable. Matches ``Series.rolling(window).std()``.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self._mean = 0.0
+        self._ssqdm = 0.0
+
+    def _add(self, x):
+        n = len(self.values)
+        delta = x - self._mean
+        self._mean += delta / n
+        self._ssqdm += delta * (x - self._mean)
+
+    def _remove(self, x):
+        n = len(self.values)
+        if n == 0:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / n
+        self._ssqdm -= delta * (x - self._mean)
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        self._add(x)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        if len(self.values) < self.window:
+            return math.nan
+        return math.sqrt(max(self._ssqdm / (self.window - 1), 0.0))
+
+
+class EMA:
+    """
+    Exponential moving average with ``alpha = 2 / (span + 1)``, seeded with the first
+    value. Matches ``Series.ewm(span=span, adjust=False).mean()``.
+    """
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value = (1.0 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+
+def _ratio(numerator, denominator):
+    # Follow pandas/NumPy semantics: x / 0 is inf and 0 / 0 is NaN
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+class StreamingIndicators:
+    """
+    Stateful version of ``add_technical_indicators`` for one ticker.
+
+    Seed it with the close history, then feed new bars one at a time; every update is
+    O(1) per indicator and produces the same values as recomputing the batch pandas
+    indicators over the full history (NaN while an indicator is still warming up).
+    """
+
+    def __init__(self):
+        self.sma_50 = RollingMean(50)
+        self.sma_200 = RollingMean(200)
+        self.ema_50 = EMA(50)
+        self.ema_200 = EMA(200)
+        self.ema_12 = EMA(12)
+        self.ema_26 = EMA(26)
+        self.macd_signal = EMA(9)
+        self.avg_gain = RollingMean(14)
+        self.avg_loss = RollingMean(14)
+        self.band_mean = RollingMean(20)
+        self.band_std = RollingStd(20)
+        self.previous_close = math.nan
+        self.bars = 0
+        self.latest = dict.fromkeys(INDICATOR_COLUMNS, math.nan)
+
+    @classmethod
+    def from_history(cls, closes) -> 'StreamingIndicators':
+        """
+        Creates an engine seeded with a sequence (or Series) of historical closes.
+        """
+        engine = cls()
+        engine.seed(closes)
+        return engine
+
+    def seed(self, closes):
+        """
+        Feeds historical closes through the engine without building per-bar output.
+        """
+        for close in np.asarray(closes, dtype='float64'):
+            self.update(close)
+
+    def update(self, close: float) -> dict:
+        """
+        Adds one bar and returns the indicator values for it.
+
+        :param close: The bar's close price. A missing (NaN) close repeats the previous
+                      one, as ``preprocess_data``'s forward fill does; before the first
+                      valid close it is skipped.
+        :return: Dict keyed by the ``add_technical_indicators`` column names.
+        """
+        close = float(close)
+        if math.isnan(close):
+            if not self.bars:
+                return self.latest
+            close = self.previous_close
+
+        # diff() is NaN on the first bar, which the batch RSI counts as a zero move
+        delta = close - self.previous_close if self.bars else 0.0
+        self.previous_close = close
+        self.bars += 1
+
+        gain = self.avg_gain.update(delta if delta > 0 else 0.0)
+        loss = self.avg_loss.update(-delta if delta < 0 else 0.0)
+        rsi = 100 - (100 / (1 + _ratio(gain, loss)))
+
+        macd = self.ema_12.update(close) - self.ema_26.update(close)
+        macd_signal = self.macd_signal.update(macd)
+
+        middle_band = self.band_mean.update(close)
+        std_dev = self.band_std.update(close)
+
+        self.latest = {
+            'SMA_50': self.sma_50.update(close),
+            'SMA_200': self.sma_200.update(close),
+            'EMA_50': self.ema_50.update(close),
+            'EMA_200': self.ema_200.update(close),
+            'RSI': rsi,
+            'MACD': macd,
+            'MACD_signal': macd_signal,
+            'MACD_hist': macd - macd_signal,
+            'middle_band': middle_band,
+            'upper_band': middle_band + (std_dev * 2),
+            'lower_band': middle_band - (std_dev * 2),
+        }
+        return self.latest
+
+    def update_many(self, closes: pd.Series) -> pd.DataFrame:
+        """
+        Adds several bars and returns their indicator values, indexed like ``closes``.
+        """
+        rows = [dict(self.update(close)) for close in closes]
+        return pd.DataFrame(rows, index=closes.index, columns=INDICATOR_COLUMNS)
+
+    @property
+    def is_warm(self) -> bool:
+        """
+        True once every indicator has enough history to be defined.
+        """
+        return self.bars >= self.sma_200.window
+
+
+if __name__ == '__main__':
+    # Check the streaming engine against the batch pandas indicators
+    from src.technical_analysis.indicators import add_technical_indicators
+
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='2015-01-01', periods=2500, freq='B')
+    closes = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates)))), index=dates)
+
+    batch = add_technical_indicators(pd.DataFrame({'close': closes}))
+
+    # Seed with most of the history, then stream the remaining bars one at a time
+    engine = StreamingIndicators.from_history(closes.iloc[:2000])
+    streamed = engine.update_many(closes.iloc[2000:])
+
+    expected = batch.loc[streamed.index, INDICATOR_COLUMNS]
+    max_error = (streamed - expected).abs().max().max()
+    print(f"Max absolute difference over {len(streamed)} streamed bars: {max_error:.3e}")
+    assert np.allclose(streamed.values, expected.values, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,53 @@
+import os
+
+# Ticker universes used by the web application and the data refresh job
+
+# Market indices shown on the Market Trends page
+MARKET_INDICES = {
+    '^GSPC': 'S&P 500',
+    '^IXIC': 'NASDAQ',
+    '^DJI': 'Dow Jones Industrial Average'
+}
+
+# Popular stocks ranked on the Top Movers page
+POPULAR_STOCKS = ['AAPL', 'GOOG', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'JPM', 'V', 'PFE', 'DIS', 'INTC', 'BA', 'KO', 'PEP', 'MCD', 'NKE', 'WMT', 'HD', 'COST', 'AXP', 'IBM', 'CSCO', 'ORCL', 'ADBE', 'CRM', 'SAP', 'TM', 'SONY']
+
+# Stocks scored on the Recommendations page
+RECOMMENDATION_STOCKS = ['AAPL', 'GOOG', 'MSFT', 'AMZN', 'TSLA', 'NVDA']
+
+def unique_tickers(*ticker_lists) -> list:
+    """
+    Merges ticker lists, dropping duplicates while keeping first-seen order.
+    """
+    return list(dict.fromkeys(ticker for tickers in ticker_lists for ticker in tickers))
+
+def all_tickers() -> list:
+    """
+    Returns every ticker the web application needs data for, without duplicates.
+    """
+    return unique_tickers(MARKET_INDICES, POPULAR_STOCKS, RECOMMENDATION_STOCKS)
+
+def load_universe(path: str = None) -> list:
+    """
+    Loads a screening universe from a text file with one ticker per line, optionally
+    followed by a comma and its sector (e.g. ``AAPL,Technology``). Blank lines, lines
+    starting with '#' and a ``ticker,sector`` header are skipped.
+
+    :param path: Universe file; defaults to $UNIVERSE_FILE, or the popular stocks.
+    :return: List of ``(ticker, sector)`` tuples; sector is None when not given.
+    """
+    path = path or os.environ.get('UNIVERSE_FILE')
+    if not path:
+        return [(ticker, None) for ticker in POPULAR_STOCKS]
+
+    universe = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            ticker, _, sector = (part.strip() for part in line.partition(','))
+            if ticker.lower() == 'ticker':
+                continue
+            universe.setdefault(ticker.upper(), sector or None)
+    return list(universe.items())
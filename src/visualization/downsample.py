@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+# Points kept per chart series by default
+DEFAULT_MAX_POINTS = 1000
+
+# Decimals kept for chart values in the JSON payloads
+CHART_DECIMALS = 4
+
+
+def _as_numeric(x) -> np.ndarray:
+    # Datetimes become int64 nanoseconds so triangle areas can be computed on them
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    return x.astype('float64')
+
+
+def lttb_indices(x, y, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of ``max_points - 2`` equal-width
+    buckets in between, the point forming the largest triangle with the point kept
+    from the previous bucket and the mean of the next bucket. Peaks, troughs and the
+    overall shape of the line survive even at high reduction ratios.
+
+    :param x: Increasing x values (numbers or datetimes).
+    :param y: Values, aligned with ``x``; must not contain NaNs.
+    :param max_points: Number of points to keep.
+    :return: Sorted indices of the kept points.
+    """
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        raise ValueError('LTTB keeps at least 3 points.')
+    x = _as_numeric(x)
+    y = np.asarray(y, dtype='float64')
+
+    # Bucket edges over the points between the first and the last
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    kept = np.empty(max_points, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = end, edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+
+        # Twice the triangle area for every candidate point in the bucket
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def minmax_indices(y, max_points: int) -> np.ndarray:
+    """
+    Min/max bucketing: keeps the first and last points and the lowest and highest
+    point of each of ``(max_points - 2) // 2`` equal-width buckets.
+
+    Cheaper than LTTB and guarantees every extreme is kept; good for noisy series.
+
+    :return: Sorted indices of the kept points.
+    """
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype='float64')
+    buckets = max((max_points - 2) // 2, 1)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    kept = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            kept.append(start + int(np.argmin(y[start:end])))
+            kept.append(start + int(np.argmax(y[start:end])))
+    return np.unique(kept)
+
+
+# Downsampling methods by name
+METHODS = {
+    'lttb': lambda x, y, max_points: lttb_indices(x, y, max_points),
+    'minmax': lambda x, y, max_points: minmax_indices(y, max_points),
+}
+
+
+def downsample_series(series: pd.Series, max_points: int = DEFAULT_MAX_POINTS, method: str = 'lttb') -> pd.Series:
+    """
+    Reduces a Series (indexed by date or number) to at most ``max_points`` points.
+
+    NaN values are dropped first.
+    """
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    indices = METHODS[method](series.index.to_numpy(), series.to_numpy(), max_points)
+    return series.iloc[indices]
+
+
+def chart_series(series: pd.Series, max_points: int = DEFAULT_MAX_POINTS, method: str = 'lttb',
+                 decimals: int = CHART_DECIMALS) -> dict:
+    """
+    Downsamples a Series and returns it as compact, JSON-ready chart data.
+
+    :return: Dict with 'x' (ISO dates, or numbers for a non-date index) and 'y'
+             (values rounded to ``decimals``) lists, ready for ``Plotly.newPlot``.
+    """
+    series = downsample_series(series, max_points, method)
+    if isinstance(series.index, pd.DatetimeIndex):
+        date_format = '%Y-%m-%d' if (series.index == series.index.normalize()).all() else '%Y-%m-%dT%H:%M:%S'
+        x = list(series.index.strftime(date_format))
+    else:
+        x = series.index.tolist()
+    return {'x': x, 'y': np.round(series.to_numpy(dtype='float64'), decimals).tolist()}
+
+
+if __name__ == '__main__':
+    # Reduction of a long random walk
+    import json
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('1950-01-03', periods=20000)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates)))), index=dates)
+    for method in METHODS:
+        reduced = downsample_series(close, 500, method)
+        kept_extremes = reduced.max() == close.max() and reduced.min() == close.min()
+        payload = len(json.dumps(chart_series(close, 500, method)))
+        print(f'{method}: {len(close)} -> {len(reduced)} points, extremes kept: {kept_extremes}, '
+              f'{payload} JSON bytes (full series: {len(json.dumps(chart_series(close, len(close))))})')
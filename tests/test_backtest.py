@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from benchmarks.synthetic import generate_ohlcv
+from src.data_processing.pipeline import load_processed_data
+from src.data_processing.process_data import preprocess_data
+from src.data_storage.store import get_store
+from src.modeling.backtest import IncrementalOLS, walk_forward_backtest
+from src.modeling.train_model import FEATURES
+from src.technical_analysis.indicators import add_technical_indicators
+
+
+@pytest.fixture
+def regression():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 6)) * [1, 10, 100, 0.1, 5, 50] + [0, 100, -20, 3, 0, 1000]
+    y = X @ rng.normal(size=6) + 7.5 + rng.normal(0, 0.5, 500)
+    return X, y
+
+
+def _assert_same_fit(model, X, y):
+    expected = LinearRegression().fit(X, y)
+    assert np.allclose(model.coef_, expected.coef_, rtol=1e-8, atol=1e-10)
+    assert model.intercept_ == pytest.approx(expected.intercept_, rel=1e-8, abs=1e-8)
+    assert np.allclose(model.predict(X), expected.predict(X), rtol=1e-10)
+
+
+def test_fit_matches_linear_regression(regression):
+    X, y = regression
+    model = IncrementalOLS(X.shape[1])
+    model.add(X, y)
+
+    _assert_same_fit(model.fit(), X, y)
+
+
+def test_blocks_added_incrementally_match_one_fit(regression):
+    X, y = regression
+    model = IncrementalOLS(X.shape[1])
+    for start in range(0, len(X), 37):
+        model.add(X[start:start + 37], y[start:start + 37])
+
+    assert model.n == len(X)
+    _assert_same_fit(model.fit(), X, y)
+
+
+def test_removing_rows_gives_rolling_window_fit(regression):
+    X, y = regression
+    model = IncrementalOLS(X.shape[1])
+    model.add(X[:200], y[:200])
+    for start in range(200, 500, 50):
+        model.add(X[start:start + 50], y[start:start + 50])
+        model.remove(X[start - 200:start - 150], y[start - 200:start - 150])
+
+    assert model.n == 200
+    _assert_same_fit(model.fit(), X[300:], y[300:])
+
+
+@pytest.mark.parametrize('train_window', [None, 250])
+def test_walk_forward_matches_refitting_linear_regression(train_window):
+    df = add_technical_indicators(preprocess_data(generate_ohlcv(1200, seed=4)))
+    windows = walk_forward_backtest(df, step=50, train_window=train_window)
+
+    X = df[FEATURES].to_numpy(dtype='float64')[:-1]
+    y = df['close'].to_numpy(dtype='float64')[1:]
+    start = int(len(X) * 0.6)
+    window_start = 0
+    for window in windows.itertuples():
+        if train_window is not None and start - window_start > train_window:
+            window_start = start - train_window
+        end = start + window.test_rows
+        expected = LinearRegression().fit(X[window_start:start], y[window_start:start])
+        mse = np.mean((expected.predict(X[start:end]) - y[start:end]) ** 2)
+        assert window.train_rows == start - window_start
+        assert window.mse == pytest.approx(mse, rel=1e-6)
+        start = end
+
+
+def test_load_processed_data(tmp_path):
+    store = get_store(str(tmp_path))
+    raw = generate_ohlcv(400, seed=5, gap_fraction=0.02, nan_fraction=0.01)
+    store.write('AAPL', raw)
+
+    result = load_processed_data(store, 'AAPL')
+
+    expected = add_technical_indicators(preprocess_data(store.read('AAPL')))
+    pd.testing.assert_frame_equal(result, expected)
+    assert load_processed_data(store, 'MISSING') is None
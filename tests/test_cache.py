@@ -0,0 +1,59 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from src.data_processing.cache import KEY_LOCK_STRIPES, ProcessedDataCache
+
+
+def _frame(rows=100):
+    return pd.DataFrame({'close': range(rows)}, dtype='float64')
+
+
+def test_concurrent_misses_build_a_key_once(tmp_path):
+    path = tmp_path / 'AAPL.csv'
+    path.write_text('x')
+    cache = ProcessedDataCache()
+    builds = []
+
+    def loader():
+        builds.append(1)
+        time.sleep(0.05)
+        return _frame()
+
+    threads = [threading.Thread(target=cache.get, args=('AAPL', str(path), loader)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert cache.stats()['hits'] == 7
+
+
+def test_changed_source_is_rebuilt(tmp_path):
+    path = tmp_path / 'AAPL.csv'
+    path.write_text('x')
+    cache = ProcessedDataCache()
+    first = cache.get('AAPL', str(path), _frame)
+
+    path.write_text('xy')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.get('AAPL', str(path), _frame) is not first
+    assert cache.get('AAPL', str(path), _frame) is cache.get('AAPL', str(path), _frame)
+
+
+def test_many_keys_keep_memory_bounded(tmp_path):
+    frame_bytes = int(_frame().memory_usage(index=True, deep=True).sum())
+    cache = ProcessedDataCache(max_bytes=frame_bytes * 10)
+
+    for i in range(1000):
+        cache.get(('AAPL', f'2020-01-{i}', None), str(tmp_path / 'missing.csv'), _frame)
+
+    stats = cache.stats()
+    assert stats['entries'] == 10
+    assert stats['evictions'] == 990
+    assert len(cache._key_locks) == KEY_LOCK_STRIPES
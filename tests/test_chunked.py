@@ -0,0 +1,82 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from src.data_processing.process_data import preprocess_data
+from src.data_storage.store import get_store
+from src.technical_analysis import chunked
+from src.technical_analysis.chunked import OVERLAP_ROWS, iter_processed_chunks, write_processed_chunked
+from src.technical_analysis.indicators import add_technical_indicators
+
+# Below the overlap, at it, just past it, larger, and one chunk holding everything
+CHUNK_SIZES = [OVERLAP_ROWS // 2 + 7, OVERLAP_ROWS, OVERLAP_ROWS + 1, 1000, 100_000]
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def store(request, tmp_path):
+    store = get_store(str(tmp_path / 'data'), request.param)
+    raw = generate_ohlcv(3000, seed=7, gap_fraction=0.05, nan_fraction=0.02)
+    raw.loc[:3, 'Close'] = np.nan
+    raw.loc[1190:1215, 'Close'] = np.nan  # a run of missing closes across chunk boundaries
+    store.write('AAPL', raw)
+    return store
+
+
+def _assert_matches_in_memory(result, store):
+    expected = add_technical_indicators(preprocess_data(store.read('AAPL')))
+    assert result.index.equals(expected.index)
+    assert list(result.columns) == list(expected.columns)
+    for column in expected.columns:
+        assert np.allclose(result[column], expected[column], rtol=1e-9, atol=1e-9, equal_nan=True), column
+
+
+@pytest.mark.parametrize('chunk_rows', CHUNK_SIZES)
+def test_chunks_match_in_memory_pipeline(store, chunk_rows):
+    result = pd.concat(list(iter_processed_chunks(store, 'AAPL', chunk_rows)))
+
+    _assert_matches_in_memory(result, store)
+
+
+def test_chunked_processing_emits_no_warnings(store):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        list(iter_processed_chunks(store, 'AAPL', OVERLAP_ROWS))
+
+    assert [str(warning.message) for warning in caught if warning.filename == chunked.__file__] == []
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.parquet'])
+def test_write_processed_chunked(store, tmp_path, extension):
+    output_path = str(tmp_path / f'AAPL_processed{extension}')
+
+    rows = write_processed_chunked(store, 'AAPL', output_path, chunk_rows=OVERLAP_ROWS)
+
+    if extension == '.parquet':
+        result = pd.read_parquet(output_path)
+    else:
+        result = pd.read_csv(output_path, index_col='date', parse_dates=['date'])
+        result.index.name = None
+    assert rows == len(result)
+    result.index.freq = None
+    _assert_matches_in_memory(result, store)
+    assert not os.path.exists(f'{output_path}.tmp')
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.parquet'])
+def test_failed_write_removes_partial_file(store, tmp_path, monkeypatch, extension):
+    output_path = str(tmp_path / f'AAPL_processed{extension}')
+
+    def failing_chunks(store, ticker, chunk_rows):
+        yield from list(iter_processed_chunks(store, ticker, chunk_rows))[:2]
+        raise OSError('disk full')
+
+    monkeypatch.setattr(chunked, 'iter_processed_chunks', failing_chunks)
+    with pytest.raises(OSError):
+        write_processed_chunked(store, 'AAPL', output_path, chunk_rows=500)
+
+    assert not os.path.exists(f'{output_path}.tmp')
+    assert not os.path.exists(output_path)
@@ -0,0 +1,141 @@
+import threading
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from src.data_storage.store import get_store
+from src.screening.correlation import CorrelationService, RollingCorrelation, returns_matrix
+
+TICKERS = [f'T{i}' for i in range(12)]
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(0)
+    factor = rng.normal(0, 0.01, (700, 1))
+    returns = pd.DataFrame(factor * rng.uniform(0, 1.5, len(TICKERS)) + rng.normal(0, 0.01, (700, len(TICKERS))),
+                           columns=TICKERS)
+    returns = returns.mask(rng.random(returns.shape) < 0.05)
+    returns.iloc[:400, 0] = np.nan   # listed late
+    returns.iloc[500:, 1] = np.nan   # delisted
+    return returns
+
+
+def _assert_matches_pandas(correlation, covariance, returns, min_periods):
+    expected_correlation = returns.corr(min_periods=min_periods)
+    expected_covariance = returns.cov(min_periods=min_periods)
+    assert np.array_equal(np.isnan(correlation.to_numpy()), np.isnan(expected_correlation.to_numpy()))
+    assert np.allclose(correlation, expected_correlation, rtol=1e-9, atol=1e-12, equal_nan=True)
+    assert np.allclose(covariance, expected_covariance, rtol=1e-9, atol=1e-14, equal_nan=True)
+
+
+@pytest.mark.parametrize('window', [60, 252])
+@pytest.mark.parametrize('block', [1, 9, 64])
+def test_blocked_appends_match_pandas(returns, window, block):
+    rolling = RollingCorrelation(TICKERS, window=window, min_periods=30, block=5)
+
+    for start in range(0, len(returns), block):
+        rolling.update(returns.iloc[start:start + block].to_numpy())
+        if start % 180 == 0 or start + block >= len(returns):
+            correlation, covariance = rolling.matrices()
+            _assert_matches_pandas(correlation, covariance,
+                                   returns.iloc[:start + block].iloc[-window:], min_periods=30)
+
+
+def test_top_pairs_are_sorted_row_of_matrix(returns):
+    rolling = RollingCorrelation(TICKERS, window=150, min_periods=30)
+    rolling.update(returns.to_numpy())
+    expected = returns.iloc[-150:].corr(min_periods=30)['T3'].drop('T3').dropna()
+
+    most = rolling.top_pairs('T3', 3)
+    least = rolling.top_pairs('T3', 3, largest=False)
+
+    assert [pair['ticker'] for pair in most] == list(expected.sort_values(ascending=False).index[:3])
+    assert [pair['ticker'] for pair in least] == list(expected.sort_values().index[:3])
+    assert most[0]['correlation'] == pytest.approx(expected.max(), rel=1e-9)
+    assert 'T1' not in [pair['ticker'] for pair in most + least]  # delisted: too few recent returns
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def store(request, tmp_path):
+    return get_store(str(tmp_path / 'data'), request.param)
+
+
+def _histories():
+    frames = {ticker: generate_ohlcv(500, seed=i, start='2022-01-03', gap_fraction=0.03, nan_fraction=0.01)
+              for i, ticker in enumerate(TICKERS[:6])}
+    frames['T5'] = frames['T5'].iloc[200:]  # listed later
+    return frames
+
+
+def _expected(store, window):
+    closes = pd.DataFrame({ticker: store.read(ticker, columns=['Close']).set_index('Date')['Close']
+                           for ticker in TICKERS[:6]}).sort_index()
+    return returns_matrix(closes.iloc[-(window + 1):])
+
+
+def test_service_matches_pandas_with_staggered_appends_and_backfill(store):
+    frames = _histories()
+    # Every ticker starts 60 bars short, and the tickers catch up at different times
+    for ticker, frame in frames.items():
+        store.write(ticker, frame.iloc[:-60])
+    service = CorrelationService(store, [(ticker, 'Tech') for ticker in TICKERS[:6]], window=120, min_periods=30)
+
+    def check():
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            correlation, covariance = service.matrices()
+        _assert_matches_pandas(correlation, covariance, _expected(store, 120), min_periods=30)
+
+    check()
+    for step, cut in enumerate([45, 30, 10, 0]):
+        for i, (ticker, frame) in enumerate(frames.items()):
+            if i % 2 == step % 2 or cut == 0:
+                store.append(ticker, frame.iloc[len(frame) - 60:len(frame) - cut])
+        check()
+
+    # A correction to a bar inside the window triggers a rebuild
+    corrected = frames['T2'].copy()
+    corrected.loc[corrected.index[-20], 'Close'] *= 1.1
+    store.write('T2', corrected)
+    check()
+
+
+def test_concurrent_requests_read_complete_updates(store):
+    frames = _histories()
+    dates = pd.bdate_range('2022-01-03', periods=500)
+    for ticker, frame in frames.items():
+        store.write(ticker, frame[frame['Date'] < dates[300]])
+    service = CorrelationService(store, [(ticker, 'Tech') for ticker in TICKERS[:6]], window=120, min_periods=30)
+    service.refresh()
+    rolling = service._rolling
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            result = service.top_pairs('T0', 5, refresh=False)
+            for pair in result['most_correlated'] + result['least_correlated']:
+                if not -1.0 <= pair['correlation'] <= 1.0 or pair['observations'] > 120:
+                    errors.append(pair)
+            time.sleep(0.001)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for end in range(320, 520, 20):
+        for ticker, frame in frames.items():
+            store.append(ticker, frame[(frame['Date'] >= dates[end - 20]) & (frame['Date'] < dates[min(end, 499)])])
+        service.refresh()
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    assert service._rolling is rolling  # every refresh extended the window in place
+    correlation, covariance = service.matrices()
+    _assert_matches_pandas(correlation, covariance, _expected(store, 120), min_periods=30)
@@ -0,0 +1,57 @@
+from src.dashboard.snapshot import build_snapshot
+from src.data_ingestion.fetch_queue import FetchQueue
+
+
+def _queue(available, completed, retry_after=600):
+    def download(tickers, start_date, end_date):
+        if 'BROKEN' in tickers:
+            raise ConnectionError('provider down')
+
+    return FetchQueue(download, is_available=lambda ticker: ticker in available,
+                      on_complete=completed.append, retry_after=retry_after)
+
+
+def test_on_complete_reports_successes_and_failures():
+    completed = []
+    fetch_queue = _queue({'AAPL'}, completed)
+
+    for ticker in ['AAPL', 'NODATA']:
+        assert fetch_queue.request(ticker)
+    fetch_queue.join()
+
+    assert sorted(ticker for batch in completed for ticker in batch) == ['AAPL', 'NODATA']
+    assert fetch_queue.pending() == []
+
+
+def test_on_complete_runs_when_the_download_raises():
+    completed = []
+    fetch_queue = _queue(set(), completed)
+
+    fetch_queue.request('BROKEN')
+    fetch_queue.join()
+
+    assert completed == [['BROKEN']]
+    assert not fetch_queue.is_pending('BROKEN')
+
+
+def test_failed_ticker_waits_for_retry_window():
+    completed = []
+    fetch_queue = _queue(set(), completed, retry_after=600)
+    fetch_queue.request('NODATA')
+    fetch_queue.join()
+
+    assert not fetch_queue.request('NODATA')
+
+    fetch_queue.retry_after = 0
+    assert fetch_queue.request('NODATA')
+    fetch_queue.join()
+    assert completed == [['NODATA'], ['NODATA']]
+
+
+def test_snapshot_lists_failed_tickers_as_unavailable():
+    snapshot = build_snapshot(lambda ticker: None, is_pending=lambda ticker: ticker == 'AAPL')
+
+    page = snapshot['pages']['top_movers']
+    assert 'AAPL' in page['pending']
+    assert 'AAPL' not in page['unavailable']
+    assert page['unavailable'] and all(ticker != 'AAPL' for ticker in page['unavailable'])
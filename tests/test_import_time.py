@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from benchmarks.bench_import import ENTRY_POINTS, check
+
+# About three times the measured import time of app (0.8 s), well below the 2.8 s the
+# eager imports took; raise it with IMPORT_BUDGET_SECONDS on slow machines
+IMPORT_BUDGET_SECONDS = float(os.environ.get('IMPORT_BUDGET_SECONDS', 2.5))
+
+
+@pytest.mark.parametrize('module', list(ENTRY_POINTS))
+def test_entry_point_imports_without_heavy_packages(module):
+    # The fastest of two imports, so one slow start does not fail the test
+    result = check(module, ENTRY_POINTS[module], repeats=2)
+
+    assert result['heavy_loaded'] == []
+    assert result['seconds'] < IMPORT_BUDGET_SECONDS
+
+
+def test_check_detects_heavy_packages():
+    result = check('src.modeling.train_model', ['sklearn'], repeats=1)
+    assert result['heavy_loaded'] == []
+
+    result = check('sklearn.linear_model', ['sklearn', 'plotly'], repeats=1)
+    assert result['heavy_loaded'] == ['sklearn']
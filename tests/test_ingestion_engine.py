@@ -0,0 +1,168 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.data_ingestion.engine import IngestionEngine, RateLimiter
+
+
+def _bars(ticker, rows=3):
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2024-01-01', periods=rows),
+        'Close': [100.0 + i for i in range(rows)],
+        'Volume': [1000] * rows,
+    })
+
+
+class FakeProvider:
+    """
+    Local stand-in for the market data provider.
+
+    :param missing: Tickers the provider has no data for.
+    :param fail_times: Dict mapping tickers to the number of requests containing
+                       them that raise before they succeed.
+    :param omit_from_batches: Tickers left out of multi-ticker responses.
+    :param delay: Seconds each request takes.
+    """
+
+    def __init__(self, missing=(), fail_times=None, omit_from_batches=(), delay=0.0):
+        self.missing = set(missing)
+        self.fail_times = dict(fail_times or {})
+        self.omit_from_batches = set(omit_from_batches)
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, tickers, start_date, end_date):
+        with self._lock:
+            self.calls.append((list(tickers), start_date, end_date))
+            failing = [t for t in tickers if self.fail_times.get(t, 0) > 0]
+            for ticker in failing:
+                self.fail_times[ticker] -= 1
+        if self.delay:
+            time.sleep(self.delay)
+        if failing:
+            raise ConnectionError(f'transient error for {", ".join(failing)}')
+        return {ticker: _bars(ticker) for ticker in tickers
+                if ticker not in self.missing
+                and not (len(tickers) > 1 and ticker in self.omit_from_batches)}
+
+
+def _engine(provider, sleeps, **kwargs):
+    kwargs.setdefault('max_workers', 1)
+    return IngestionEngine(fetcher=provider, sleep=sleeps.append, **kwargs)
+
+
+def _store_rows(ticker, frame):
+    return len(frame)
+
+
+def test_batches_tickers_per_date_window():
+    provider = FakeProvider()
+    tickers = [f'T{i}' for i in range(7)]
+    jobs = [(ticker, '2024-01-01', '2024-02-01') for ticker in tickers]
+    jobs.append(('LATE', '2024-01-15', '2024-02-01'))
+
+    report = _engine(provider, [], batch_size=3).run(jobs, _store_rows)
+
+    assert report.rows == {ticker: 3 for ticker in tickers + ['LATE']}
+    assert report.requests == len(provider.calls) == 4
+    assert sorted(len(tickers) for tickers, _, _ in provider.calls) == [1, 1, 3, 3]
+    assert (['LATE'], '2024-01-15', '2024-02-01') in provider.calls
+    assert not report.failed and not report.no_data
+
+
+def test_retries_transient_errors_with_backoff():
+    provider = FakeProvider(fail_times={'A': 2})
+    sleeps = []
+
+    report = _engine(provider, sleeps, batch_size=2, backoff=0.5).run(
+        [('A', '2024-01-01', None), ('B', '2024-01-01', None)], _store_rows)
+
+    # The batch raised, so both tickers were retried alone; A failed once more
+    assert report.rows == {'A': 3, 'B': 3}
+    assert report.requests == 4
+    assert sleeps == [0.5, 1.0, 0.5]
+    assert not report.failed
+
+
+def test_gives_up_after_max_retries():
+    provider = FakeProvider(fail_times={'A': 10})
+    sleeps = []
+
+    report = _engine(provider, sleeps, batch_size=1, max_retries=3, backoff=1.0).run(
+        [('A', '2024-01-01', None)], _store_rows)
+
+    assert list(report.failed) == ['A']
+    assert 'transient error' in report.failed['A']
+    assert report.requests == 4
+    assert sleeps == [1.0, 2.0, 4.0]
+
+
+def test_tickers_left_out_of_a_batch_are_fetched_alone():
+    provider = FakeProvider(omit_from_batches={'B'}, missing={'C'})
+
+    report = _engine(provider, [], batch_size=3).run(
+        [(ticker, '2024-01-01', None) for ticker in 'ABC'], _store_rows)
+
+    assert report.rows == {'A': 3, 'B': 3}
+    assert report.no_data == ['C']
+    assert (['B'], '2024-01-01', None) in provider.calls
+    assert (['C'], '2024-01-01', None) in provider.calls
+
+
+def test_handler_errors_are_reported_per_ticker():
+    def handler(ticker, frame):
+        if ticker == 'B':
+            raise OSError('disk full')
+        return len(frame)
+
+    report = _engine(FakeProvider(), [], batch_size=2).run(
+        [('A', '2024-01-01', None), ('B', '2024-01-01', None)], handler)
+
+    assert report.rows == {'A': 3}
+    assert report.failed == {'B': 'disk full'}
+
+
+def test_report_records_latency_and_elapsed_time():
+    provider = FakeProvider(delay=0.02)
+
+    report = _engine(provider, [], batch_size=2, max_workers=2).run(
+        [(ticker, '2024-01-01', None) for ticker in 'ABCD'], _store_rows)
+
+    assert set(report.latency) == set('ABCD')
+    assert all(latency >= 0.02 for latency in report.latency.values())
+    assert report.elapsed >= 0.02
+    summary = report.summary()
+    assert '4 succeeded, 0 failed, 0 without data' in summary
+    assert '2 provider requests' in summary
+    assert report.to_dict()['rows'] == {ticker: 3 for ticker in 'ABCD'}
+
+
+def test_rate_limiter_spaces_out_requests():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2.0, burst=1, clock=lambda: now[0], sleep=sleep)
+    for _ in range(5):
+        limiter.acquire()
+
+    # The first request uses the initial token; each later one waits half a second
+    assert now[0] == pytest.approx(2.0)
+    assert sleeps == pytest.approx([0.5] * 4)
+
+
+def test_engine_requests_pass_through_the_rate_limiter():
+    sleeps = []
+    engine = _engine(FakeProvider(), sleeps, batch_size=1, rate_limit=1000.0)
+    acquired = []
+    engine.limiter.acquire = lambda: acquired.append(True)
+
+    report = engine.run([(ticker, '2024-01-01', None) for ticker in 'ABC'], _store_rows)
+
+    assert len(acquired) == report.requests == 3
@@ -0,0 +1,126 @@
+import pytest
+
+from src.monitoring import metrics
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, 'ENABLED', True)
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+@pytest.fixture
+def disabled(monkeypatch):
+    monkeypatch.setattr(metrics, 'ENABLED', False)
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+def test_counter_keeps_one_value_per_label_set(enabled):
+    metrics.count('http_requests_total', endpoint='index', status='200')
+    metrics.count('http_requests_total', status='200', endpoint='index')
+    metrics.count('http_requests_total', 3, endpoint='index', status='500')
+
+    counter = metrics.REGISTRY.counter('http_requests_total')
+    assert counter.value(endpoint='index', status='200') == 2
+    assert counter.value(endpoint='index', status='500') == 3
+    assert counter.value(endpoint='other', status='200') == 0
+
+
+def test_histogram_buckets_per_label_set(enabled):
+    for value in [0.0004, 0.001, 0.003, 50.0]:
+        metrics.observe('http_request_seconds', value, endpoint='index')
+    metrics.observe('http_request_seconds', 0.2, endpoint='api')
+
+    histogram = metrics.REGISTRY.histogram('http_request_seconds')
+    assert histogram.count(endpoint='index') == 4
+    assert histogram.count(endpoint='api') == 1
+
+    samples = {(name, labels): value for name, labels, value in histogram.samples()}
+    index = (('endpoint', 'index'),)
+    prefix = f'{metrics.NAMESPACE}_http_request_seconds'
+    # Buckets are cumulative and a value equal to a bound falls in that bound's bucket
+    assert samples[(f'{prefix}_bucket', index + (('le', '0.0005'),))] == 1
+    assert samples[(f'{prefix}_bucket', index + (('le', '0.001'),))] == 2
+    assert samples[(f'{prefix}_bucket', index + (('le', '0.005'),))] == 3
+    assert samples[(f'{prefix}_bucket', index + (('le', '30.0'),))] == 3
+    assert samples[(f'{prefix}_bucket', index + (('le', '+Inf'),))] == 4
+    assert samples[(f'{prefix}_count', index)] == 4
+    assert samples[(f'{prefix}_sum', index)] == pytest.approx(50.0044)
+
+
+def test_render_prometheus_text_format(enabled):
+    metrics.count('downloads_total', result='ok')
+    metrics.count('downloads_total', result='say "hi"\n')
+    metrics.observe('operation_seconds', 0.002, operation='load')
+
+    lines = metrics.REGISTRY.render().splitlines()
+
+    name = f'{metrics.NAMESPACE}_downloads_total'
+    assert lines[:4] == [
+        f'# HELP {name} {metrics.METRIC_HELP["downloads_total"]}',
+        f'# TYPE {name} counter',
+        f'{name}{{result="ok"}} 1',
+        f'{name}{{result="say \\"hi\\"\\n"}} 1',
+    ]
+    name = f'{metrics.NAMESPACE}_operation_seconds'
+    assert f'# TYPE {name} histogram' in lines
+    assert f'{name}_bucket{{operation="load",le="0.0025"}} 1' in lines
+    assert f'{name}_bucket{{operation="load",le="+Inf"}} 1' in lines
+    assert f'{name}_sum{{operation="load"}} 0.002' in lines
+    assert f'{name}_count{{operation="load"}} 1' in lines
+    for line in lines:
+        if not line.startswith('#'):
+            float(line.rsplit(' ', 1)[1])
+
+
+def test_disabled_helpers_record_nothing(disabled):
+    @metrics.timed('noop')
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    with metrics.timer('block'):
+        pass
+    metrics.count('downloads_total', result='ok')
+    metrics.observe('http_request_seconds', 0.1, endpoint='index')
+
+    assert metrics.REGISTRY.render() == '\n'
+
+
+def test_timed_records_when_enabled(enabled):
+    @metrics.timed()
+    def work():
+        return 'done'
+
+    assert work() == 'done'
+    assert metrics.REGISTRY.histogram('operation_seconds').count(operation='work') == 1
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # app.py keeps its data under the relative 'data' directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('MODEL_DIR', str(tmp_path / 'models'))
+    import app
+    return app.app.test_client()
+
+
+def test_metrics_endpoint_is_404_when_disabled(disabled, client):
+    response = client.get('/metrics')
+
+    assert response.status_code == 404
+    assert metrics.REGISTRY.render() == '\n'
+
+
+def test_metrics_endpoint_renders_requests_when_enabled(enabled, client):
+    client.get('/metrics')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert f'{metrics.NAMESPACE}_http_requests_total{{endpoint="metrics_endpoint",status="200"}} 1' in body
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from benchmarks.synthetic import generate_ohlcv
+from src.dashboard.snapshot import build_top_movers
+from src.data_processing.process_data import preprocess_data
+from src.data_storage.store import get_store
+from src.screening.movers import MoversRanker
+from src.universe import POPULAR_STOCKS
+
+
+def _bars(rows, seed):
+    return generate_ohlcv(rows, seed=seed, start='2024-01-01')
+
+
+def test_stale_ticker_is_not_ranked(tmp_path):
+    store = get_store(str(tmp_path))
+    store.write('AAPL', _bars(300, 0))
+    store.write('MSFT', _bars(300, 1))
+    stale = _bars(300, 2).iloc[:-5].copy()
+    # The stale ticker's last recorded move is far larger than any current one
+    stale.loc[stale.index[-1], 'Close'] = stale['Close'].iloc[-2] * 1.5
+    store.write('OLD', stale)
+
+    result = MoversRanker(store, [('AAPL', 'Tech'), ('MSFT', 'Tech'), ('OLD', 'Tech')]).rank(n=5)
+
+    ranked = {mover['ticker'] for mover in result['top_gainers'] + result['top_losers']}
+    assert ranked == {'AAPL', 'MSFT'}
+    assert result['universe_size'] == 2
+    assert result['latest_date'] == _bars(300, 0)['Date'].iloc[-1].strftime('%Y-%m-%d')
+    assert result['stale'] == [{'ticker': 'OLD', 'last_date': stale['Date'].iloc[-1].strftime('%Y-%m-%d')}]
+
+
+def test_top_movers_page_skips_stale_tickers():
+    frames = {ticker: preprocess_data(_bars(300, seed)) for seed, ticker in enumerate(POPULAR_STOCKS)}
+    stale_ticker = POPULAR_STOCKS[0]
+    frames[stale_ticker] = frames[stale_ticker].iloc[:-3]
+    frames[stale_ticker].iloc[-1, frames[stale_ticker].columns.get_loc('close')] *= 10
+
+    page = build_top_movers(frames.get)
+
+    ranked = {mover['ticker'] for mover in page['top_gainers'] + page['top_losers']}
+    assert stale_ticker not in ranked
+    assert page['latest_date'] == pd.Timestamp(_bars(300, 0)['Date'].iloc[-1]).strftime('%B %d, %Y')
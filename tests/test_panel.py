@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.technical_analysis.indicators import add_technical_indicators
+from src.technical_analysis.panel import compute_panel_indicators
+from src.technical_analysis.streaming import INDICATOR_COLUMNS
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='2020-01-01', periods=1000, freq='B')
+    closes = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), 20)), axis=0)),
+                          index=dates, columns=[f'T{i}' for i in range(20)])
+    closes.iloc[:300, 0] = np.nan   # listed later
+    closes.iloc[700:, 1] = np.nan   # delisted
+    closes.iloc[-3:, 2] = np.nan    # stale: no bars for the last three days
+    return closes
+
+
+@pytest.mark.parametrize('ticker', ['T0', 'T1', 'T2', 'T3'])
+def test_ticker_matches_per_ticker_pipeline(closes, ticker):
+    panel = compute_panel_indicators(closes)
+    expected = add_technical_indicators(pd.DataFrame({'close': closes[ticker].dropna()}))
+
+    result = panel.ticker(ticker)
+
+    assert result.index.equals(expected.index)
+    for column in ['close'] + INDICATOR_COLUMNS:
+        assert np.allclose(result[column], expected[column], rtol=1e-9, atol=1e-9), column
+
+
+def test_interior_gaps_are_forward_filled(closes):
+    gappy = closes.copy()
+    gappy.iloc[500:505, 3] = np.nan
+
+    result = compute_panel_indicators(gappy).ticker('T3')
+    expected = add_technical_indicators(pd.DataFrame({'close': gappy['T3'].ffill()}))
+
+    assert result.index.equals(expected.index)
+    assert np.allclose(result[INDICATOR_COLUMNS], expected[INDICATOR_COLUMNS], rtol=1e-9, atol=1e-9)
+
+
+def test_latest_does_not_report_stale_values_as_current(closes):
+    latest = compute_panel_indicators(closes).latest()
+
+    assert latest.loc[['T1', 'T2'], ['close'] + INDICATOR_COLUMNS].isna().all().all()
+    assert latest.loc['T1', 'last_date'] == closes.index[699]
+    assert latest.loc['T2', 'last_date'] == closes.index[-4]
+
+    current = latest.drop(index=['T1', 'T2'])
+    assert current[['close'] + INDICATOR_COLUMNS].notna().all().all()
+    assert (current['last_date'] == closes.index[-1]).all()
+    assert current.loc['T3', 'close'] == closes['T3'].iloc[-1]
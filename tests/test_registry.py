@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from src.data_processing.process_data import preprocess_data
+from src.modeling.registry import ModelRegistry
+from src.technical_analysis.indicators import add_technical_indicators
+
+
+@pytest.fixture
+def data():
+    return {'AAPL': add_technical_indicators(preprocess_data(generate_ohlcv(600, seed=0))),
+            'TINY': add_technical_indicators(preprocess_data(generate_ohlcv(201, seed=1)))}
+
+
+def _registry(tmp_path, data, calls, gate=None):
+    def get_data(ticker):
+        calls.append(ticker)
+        if gate is not None:
+            gate.wait()
+        return data.get(ticker)
+
+    def get_watermark(ticker):
+        df = data.get(ticker)
+        return None if df is None else df.index[-1].strftime('%Y-%m-%d')
+
+    return ModelRegistry(get_data, get_watermark, root=str(tmp_path))
+
+
+def test_prepare_trains_in_background_once(tmp_path, data):
+    calls = []
+    gate = threading.Event()
+    registry = _registry(tmp_path, data, calls, gate)
+
+    assert registry.prepare(['AAPL', 'AAPL']) == ['AAPL']
+    assert registry.prepare(['AAPL']) == ['AAPL']
+    assert registry.stats()['training'] == 1
+
+    gate.set()
+    registry.join()
+
+    assert registry.prepare(['AAPL']) == []
+    assert registry.trained == 1
+    calls.clear()
+    result = registry.predict(['AAPL'])['AAPL']
+    assert 'prediction' in result
+    assert calls == ['AAPL']  # only the feature row is read; nothing is retrained
+    assert registry.trained == 1
+
+
+def test_saved_model_is_ready_for_a_new_registry(tmp_path, data):
+    registry = _registry(tmp_path, data, [])
+    registry.prepare(['AAPL'])
+    registry.join()
+
+    restarted = _registry(tmp_path, data, [])
+    assert restarted.prepare(['AAPL']) == []
+    assert 'prediction' in restarted.predict(['AAPL'])['AAPL']
+    assert restarted.trained == 0 and restarted.loaded == 1
+
+
+def test_failed_training_is_reported_not_retried(tmp_path, data):
+    data['TINY'] = data['TINY'].iloc[:1]
+    calls = []
+    registry = _registry(tmp_path, data, calls)
+
+    assert registry.prepare(['TINY', 'MISSING']) == ['TINY']
+    registry.join()
+
+    assert registry.prepare(['TINY', 'MISSING']) == []
+    calls.clear()
+    results = registry.predict(['TINY', 'MISSING'])
+    assert 'error' in results['TINY'] and 'error' in results['MISSING']
+    assert calls == []
+    assert registry.stats()['failed'] == 1
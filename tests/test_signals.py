@@ -0,0 +1,93 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.technical_analysis.indicators import add_technical_indicators
+from src.technical_analysis.signals import SIGNAL_INDEX_FILE, SignalIndex
+
+
+def _processed(rows, seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=rows)
+    closes = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows))), index=dates)
+    return add_technical_indicators(pd.DataFrame({'close': closes}))
+
+
+@pytest.fixture
+def path(tmp_path):
+    return os.path.join(tmp_path, SIGNAL_INDEX_FILE)
+
+
+def _bump_mtime(path):
+    # Make sure a rewrite within the same clock tick is still seen as a change
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_reloads_events_saved_by_another_process(path):
+    app_index = SignalIndex(path)
+    version = app_index.version()
+
+    writer = SignalIndex(path)
+    writer.update('AAPL', _processed(600, 0))
+    writer.save()
+    _bump_mtime(path)
+
+    assert app_index.version() != version
+    assert set(app_index.query()['ticker']) == {'AAPL'}
+    assert app_index.scanned == writer.scanned
+
+
+def test_save_merges_instead_of_overwriting_newer_tickers(path):
+    app_index = SignalIndex(path)
+    app_index.update('MSFT', _processed(500, 1))
+
+    writer = SignalIndex(path)
+    writer.update('AAPL', _processed(600, 0))
+    writer.update('MSFT', _processed(600, 1))
+    writer.save()
+    newer_msft = writer.query(tickers=['MSFT'])
+
+    # The app's MSFT scan is older than the file's and must not roll it back
+    app_index.update('GOOGL', _processed(550, 2))
+    app_index.save()
+
+    reloaded = SignalIndex(path)
+    assert set(reloaded.scanned) == {'AAPL', 'MSFT', 'GOOGL'}
+    assert reloaded.scanned['MSFT'] == writer.scanned['MSFT']
+    pd.testing.assert_frame_equal(reloaded.query(tickers=['MSFT']), newer_msft)
+    assert not reloaded.query(tickers=['AAPL']).empty
+
+
+def test_stale_data_does_not_replace_newer_scan(path):
+    writer = SignalIndex(path)
+    writer.update('AAPL', _processed(600, 0))
+    writer.save()
+
+    app_index = SignalIndex(path)
+    assert not app_index.update('AAPL', _processed(500, 0))
+    assert app_index.scanned['AAPL'] == writer.scanned['AAPL']
+
+
+def test_concurrent_writers_keep_every_ticker(path):
+    frames = {f'T{i}': _processed(300, i) for i in range(8)}
+
+    def write(tickers):
+        index = SignalIndex(path)
+        for ticker in tickers:
+            index.update(ticker, frames[ticker])
+            index.save()
+
+    threads = [threading.Thread(target=write, args=(list(frames)[i::2],)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reloaded = SignalIndex(path)
+    assert set(reloaded.scanned) == set(frames)
+    assert set(reloaded.query()['ticker']) <= set(frames)
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith('.tmp')]
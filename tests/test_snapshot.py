@@ -0,0 +1,43 @@
+import os
+import threading
+import time
+
+from src.dashboard.snapshot import SNAPSHOT_FILE, SnapshotManager
+
+
+def test_refreshes_from_several_threads_do_not_overlap(tmp_path):
+    manager = SnapshotManager(os.path.join(tmp_path, SNAPSHOT_FILE))
+    building = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def get_data(ticker):
+        with lock:
+            building.append(threading.get_ident())
+            if len(set(building)) > 1:
+                overlaps.append(ticker)
+        time.sleep(0.0005)
+        with lock:
+            building.remove(threading.get_ident())
+        return None
+
+    threads = [threading.Thread(target=manager.refresh, args=(get_data,)) for _ in range(3)]
+    threads.append(threading.Thread(target=manager.ensure, args=(get_data,)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert manager.current()['created_at'] == SnapshotManager(manager.path).current()['created_at']
+
+
+def test_ensure_builds_once(tmp_path):
+    manager = SnapshotManager(os.path.join(tmp_path, SNAPSHOT_FILE))
+    calls = []
+
+    first = manager.ensure(lambda ticker: calls.append(ticker))
+    built = len(calls)
+
+    assert manager.ensure(lambda ticker: calls.append(ticker)) is first
+    assert len(calls) == built
@@ -0,0 +1,22 @@
+import pytest
+
+from src.data_storage.store import BACKENDS, PriceStore, get_store
+
+
+def test_incomplete_backend_fails_when_created(tmp_path):
+    class ReadOnlyStore(PriceStore):
+        extension = '.txt'
+
+        def read(self, ticker, columns=None, start=None, end=None):
+            raise FileNotFoundError(ticker)
+
+    with pytest.raises(TypeError, match='iter_chunks'):
+        ReadOnlyStore(str(tmp_path))
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_backends_implement_the_interface(tmp_path, backend):
+    store = get_store(str(tmp_path), backend)
+
+    assert isinstance(store, PriceStore)
+    assert store.tickers() == []
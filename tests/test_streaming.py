@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_ohlcv
+from src.data_processing.process_data import preprocess_data
+from src.technical_analysis.indicators import add_technical_indicators
+from src.technical_analysis.streaming import INDICATOR_COLUMNS, StreamingIndicators
+
+
+def _random_walk(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start='2015-01-01', periods=rows, freq='B')
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows))), index=dates)
+
+
+def _batch(closes: pd.Series) -> pd.DataFrame:
+    return add_technical_indicators(pd.DataFrame({'close': closes}))[INDICATOR_COLUMNS]
+
+
+def _assert_matches_batch(streamed: pd.DataFrame, expected: pd.DataFrame):
+    # Rows the batch path keeps are exactly the fully defined streamed rows
+    complete = streamed.dropna()
+    assert complete.index.equals(expected.index)
+    for column in INDICATOR_COLUMNS:
+        assert np.allclose(complete[column], expected[column], rtol=1e-9, atol=1e-9), column
+
+
+@pytest.mark.parametrize('seed_rows', [0, 150, 2000])
+def test_seeded_then_streamed_matches_batch(seed_rows):
+    closes = _random_walk(2500)
+    engine = StreamingIndicators.from_history(closes.iloc[:seed_rows])
+
+    streamed = engine.update_many(closes.iloc[seed_rows:])
+
+    expected = _batch(closes)
+    _assert_matches_batch(streamed, expected.loc[expected.index >= closes.index[seed_rows]])
+
+
+def test_matches_pipeline_on_data_with_gaps_and_nans():
+    raw = generate_ohlcv(1500, seed=3, gap_fraction=0.05, nan_fraction=0.02)
+    raw.loc[:4, 'Close'] = np.nan
+    processed = preprocess_data(raw)
+    closes = processed['close'].copy()
+    expected = add_technical_indicators(processed)[INDICATOR_COLUMNS]
+
+    engine = StreamingIndicators.from_history(closes.iloc[:700])
+    streamed = engine.update_many(closes.iloc[700:])
+
+    _assert_matches_batch(streamed, expected.loc[expected.index >= closes.index[700]])
+
+
+def test_nan_close_repeats_previous_close():
+    closes = _random_walk(400, seed=1)
+    gappy = closes.copy()
+    gappy.iloc[[0, 1, 250, 251, 252, 399]] = np.nan
+
+    streamed = StreamingIndicators().update_many(gappy)
+
+    _assert_matches_batch(streamed, _batch(gappy.ffill().dropna()))
+
+
+def test_flat_prices_give_nan_rsi_like_batch():
+    closes = pd.concat([_random_walk(250, seed=2), pd.Series(123.0, index=pd.bdate_range('2016-01-01', periods=30))])
+
+    streamed = StreamingIndicators().update_many(closes)
+
+    assert streamed['RSI'].iloc[-1:].isna().all()
+    _assert_matches_batch(streamed, _batch(closes))
+
+
+def test_warm_up():
+    closes = _random_walk(250)
+    engine = StreamingIndicators()
+    streamed = engine.update_many(closes.iloc[:199])
+
+    assert not engine.is_warm
+    assert streamed['SMA_200'].isna().all()
+    assert not np.isnan(streamed['SMA_50'].iloc[-1])
+
+    engine.update(closes.iloc[199])
+    assert engine.is_warm
+    assert engine.latest['SMA_200'] == pytest.approx(closes.iloc[:200].mean(), rel=1e-12)
@@ -1,38 +1,53 @@
 import os
-import sys
-import pandas as pd
+import argparse
 from datetime import datetime, timedelta
 
-# Add the src directory to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+from src.dashboard.snapshot import SNAPSHOT_FILE, SnapshotManager
+from src.data_processing.pipeline import load_processed_data
+from src.data_ingestion.download_data import download_stock_data, update_stock_data
+from src.data_storage.store import DATA_DIR, get_store
+from src.technical_analysis.signals import SIGNAL_INDEX_FILE, SignalIndex
+from src.universe import MARKET_INDICES, POPULAR_STOCKS, RECOMMENDATION_STOCKS, all_tickers
 
-from data_ingestion.download_data import download_stock_data
-
-def update_all_data():
+def update_all_data(incremental=True):
     """
     Downloads the latest stock data for market indices, popular stocks, and recommendation stocks.
+
+    In incremental mode only the bars after each ticker's last stored date are
+    downloaded and appended; otherwise the last 365 days are re-downloaded.
     """
     today = datetime.now()
     # Download data for the last 365 days to ensure enough data for indicators
     start_date = (today - timedelta(days=365)).strftime('%Y-%m-%d')
     end_date = today.strftime('%Y-%m-%d')
 
-    # Market Indices
-    market_indices_tickers = ['^GSPC', '^IXIC', '^DJI']
-    print(f"Updating market indices data for {market_indices_tickers}...")
-    download_stock_data(market_indices_tickers, start_date, end_date)
-
-    # Popular Stocks (for Top Movers)
-    popular_stocks = ['AAPL', 'GOOG', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'JPM', 'V', 'PFE', 'DIS', 'INTC', 'BA', 'KO', 'PEP', 'MCD', 'NKE', 'WMT', 'HD', 'COST', 'AXP', 'IBM', 'CSCO', 'ORCL', 'ADBE', 'CRM', 'SAP', 'TM', 'SONY']
-    print(f"Updating popular stocks data for {popular_stocks}...")
-    download_stock_data(popular_stocks, start_date, end_date)
-
-    # Recommendation Stocks
-    recommendation_stocks = ['AAPL', 'GOOG', 'MSFT', 'AMZN', 'TSLA', 'NVDA']
-    print(f"Updating recommendation stocks data for {recommendation_stocks}...")
-    download_stock_data(recommendation_stocks, start_date, end_date)
+    # Market indices, popular stocks (for Top Movers) and recommendation stocks, each once
+    tickers = all_tickers()
+    print(f"Updating data for {len(tickers)} tickers: market indices {list(MARKET_INDICES)}, "
+          f"{len(POPULAR_STOCKS)} popular stocks and {len(RECOMMENDATION_STOCKS)} recommendation stocks...")
+    if incremental:
+        report = update_stock_data(tickers, start_date, end_date)
+        print(f"Appended {sum(report.rows.values())} new rows across {len(report.rows)} tickers.")
+    else:
+        report = download_stock_data(tickers, start_date, end_date)
+    print(report.summary())
+
+    # Index signals of every refreshed ticker and pre-build the dashboard pages so
+    # the web app only serves them
+    store = get_store(DATA_DIR)
+    get_data = lambda ticker: load_processed_data(store, ticker)
+    signal_index = SignalIndex(os.path.join(DATA_DIR, SIGNAL_INDEX_FILE))
+    signal_index.rebuild(tickers, get_data)
+    snapshots = SnapshotManager(os.path.join(DATA_DIR, SNAPSHOT_FILE), signal_index=signal_index)
+    snapshots.refresh(get_data)
+    print(f"Dashboard snapshot written to {snapshots.path}")
 
     print("All data updated successfully!")
 
 if __name__ == '__main__':
-    update_all_data()
+    parser = argparse.ArgumentParser(description='Update data for the web application.')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-download the full 365-day window instead of only new bars.')
+    args = parser.parse_args()
+
+    update_all_data(incremental=not args.full)